@@ -0,0 +1,34 @@
+"""
+JWT authentication backed by the cached user lookup.
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_cached_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the token's user from a short-TTL cache
+    instead of querying the users table on every API request.
+    """
+    
+    def get_user(self, validated_token):
+        """Return the user identified by the validated token."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        
+        user = get_cached_user(user_id)
+        
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        
+        return user
@@ -4,7 +4,9 @@ Custom authentication backend to support login with email or username.
 
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.contrib.auth.hashers import check_password, make_password
+from apps.core.utils import get_client_ip
+from .hashing import run_hash
 
 User = get_user_model()
 
@@ -13,6 +15,10 @@ class EmailOrUsernameBackend(ModelBackend):
     """
     Custom authentication backend that allows users to log in with either
     their email address or username.
+    
+    Password hashing runs on the bounded hashing executor, so this may raise
+    HashingSaturated when too many logins are already being verified; login
+    views and forms (see AdminLoginForm) turn it into a 429 or form error.
     """
     
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -23,32 +29,45 @@ class EmailOrUsernameBackend(ModelBackend):
             request: The HTTP request object
             username: The email or username provided by the user
             password: The password provided by the user
-            
+        
         Returns:
             User object if authentication succeeds, None otherwise
         """
+        # Token and serializer logins pass the identifier as USERNAME_FIELD
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        
         if username is None or password is None:
             return None
         
-        try:
-            # Try to find user by email or username
-            user = User.objects.get(
-                Q(email__iexact=username) | Q(username__iexact=username)
-            )
-            
-            # Check password
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
+        ip = get_client_ip(request) if request is not None else None
+        
+        # Single indexed query for email or username
+        user = User.objects.get_for_login(username)
+        
+        if user is None:
             # Run the default password hasher once to reduce the timing
             # difference between an existing and a nonexistent user
-            User().set_password(password)
+            run_hash(make_password, password, operation='dummy', ip=ip, account=username.strip().lower())
             return None
-        except User.MultipleObjectsReturned:
-            # This shouldn't happen with unique constraints, but handle it anyway
+        
+        # Check password; the setter only records that the stored hash uses
+        # an outdated hasher or work factor
+        needs_rehash = []
+        is_correct = run_hash(
+            check_password, password, user.password, needs_rehash.append,
+            operation='verify', ip=ip, account=user.pk,
+        )
+        
+        if not is_correct:
             return None
         
-        return None
+        if needs_rehash:
+            # Transparently upgrade to the preferred PASSWORD_HASHERS entry
+            user.password = run_hash(make_password, password, operation='rehash', ip=ip, account=user.pk)
+            user.save(update_fields=['password'])
+        
+        return user
     
     def get_user(self, user_id):
         """
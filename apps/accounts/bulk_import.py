@@ -0,0 +1,469 @@
+"""
+Bulk user import from CSV or JSON Lines.
+
+Rows are streamed and handled in batches. Each batch is validated, its
+passwords are hashed on a process pool, existing accounts are found with
+one query and new users and their subscriptions are written with
+``bulk_create``. Invalid rows are reported with their line number and
+skipped without aborting the rest of the import.
+
+Rows may carry a plaintext ``password``, an already hashed
+``password_hash`` (migrations from another Django install, no hashing
+cost at all) or neither, in which case the account gets an unusable
+password and signs in after a password reset.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
+from apps.plans.models import Plan
+from apps.subscriptions.models import Subscription
+from .cache import invalidate_cached_users
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl')
+EXISTING_MODES = ('skip', 'update-plan')
+
+
+class UserImportError(Exception):
+    """The import could not be started (bad file, format or plan)."""
+    pass
+
+
+class RowError(Exception):
+    """A single row is invalid; the import carries on without it."""
+    pass
+
+
+def _options():
+    """Return the USER_IMPORT settings merged with defaults."""
+    options = {
+        'BATCH_SIZE': 1000,
+        'WORKERS': 0,
+        'DEFAULT_PLAN': 'Free',
+        'SUBSCRIPTION_DAYS': 30,
+        'MAX_ERRORS': 1000,
+        'SPOOL_DIR': os.path.join(settings.BASE_DIR, 'spool', 'imports'),
+    }
+    options.update(getattr(settings, 'USER_IMPORT', {}))
+    return options
+
+
+class ImportReport:
+    """Counters and per-row errors of one import run."""
+    
+    def __init__(self, max_errors=None, on_error=None):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = []
+        self.max_errors = _options()['MAX_ERRORS'] if max_errors is None else max_errors
+        self.on_error = on_error
+        self.started = time.monotonic()
+    
+    def error(self, line, email, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'email': email, 'error': message})
+        if self.on_error:
+            self.on_error(line, email, message)
+    
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+    
+    @property
+    def per_minute(self):
+        return round(self.rows * 60 / self.elapsed) if self.elapsed else 0
+    
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'per_minute': self.per_minute,
+            'errors': self.errors,
+        }
+
+
+def detect_format(filename):
+    """Guess the format from a file name (``.jsonl``/``.ndjson`` or CSV)."""
+    extension = os.path.splitext(filename)[1].lower()
+    return 'jsonl' if extension in ('.jsonl', '.ndjson') else 'csv'
+
+
+def spool_import_file(upload):
+    """
+    Copy an uploaded import file to USER_IMPORT['SPOOL_DIR'] for a worker.
+    
+    Returns the path and the number of lines, used as a progress estimate.
+    """
+    spool_dir = _options()['SPOOL_DIR']
+    os.makedirs(spool_dir, exist_ok=True)
+    path = os.path.join(spool_dir, f"{uuid.uuid4()}{os.path.splitext(upload.name)[1].lower()}")
+    
+    lines = 0
+    with open(path, 'wb') as f:
+        for chunk in upload.chunks():
+            f.write(chunk)
+            lines += chunk.count(b'\n')
+    return path, lines
+
+
+def read_rows(stream, file_format):
+    """
+    Yield ``(line, row, error)`` for every record of a CSV or JSONL stream.
+    
+    ``stream`` may be binary or text; it is read lazily, so files of any
+    size are processed in constant memory.
+    """
+    if file_format not in FORMATS:
+        raise UserImportError(f"Unknown format: {file_format}")
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+        if not reader.fieldnames or 'email' not in [name.strip().lower() for name in reader.fieldnames]:
+            raise UserImportError("CSV header must include an 'email' column")
+        for row in reader:
+            row = {
+                (key or '').strip().lower(): (value or '').strip()
+                for key, value in row.items()
+                if not isinstance(value, list)
+            }
+            yield reader.line_num, row, None
+        return
+    
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield line, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line, None, "Expected a JSON object"
+            continue
+        yield line, {str(key).lower(): row[key] for key in row}, None
+
+
+def _init_worker():
+    # Spawned (non-forked) workers need settings for the password hashers
+    import django
+    django.setup()
+
+
+def _hash_passwords(passwords, executor):
+    if not passwords:
+        return []
+    if executor is None:
+        return [make_password(password) for password in passwords]
+    return list(executor.map(make_password, passwords, chunksize=max(1, len(passwords) // 32)))
+
+
+def _text(row, key):
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def _prepare(line, row, plans, default_plan, default_days):
+    """Validate one row and return the values needed to create its user."""
+    email = _text(row, 'email')
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise RowError(f"Invalid email address: {email!r}")
+    email = User.objects.normalize_email(email)
+    
+    username = _text(row, 'username') or None
+    if username and len(username) > 150:
+        raise RowError("Username longer than 150 characters")
+    
+    plan_name = _text(row, 'plan')
+    plan = plans.get(plan_name.lower()) if plan_name else default_plan
+    if plan is None:
+        raise RowError(f"Unknown plan: {plan_name}")
+    
+    days = _text(row, 'subscription_days')
+    try:
+        days = int(days) if days else default_days
+    except ValueError:
+        raise RowError(f"Invalid subscription_days: {days}")
+    if days <= 0:
+        raise RowError("subscription_days must be positive")
+    
+    password, password_hash = _text(row, 'password'), _text(row, 'password_hash')
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            raise RowError("Unrecognised password_hash format")
+    elif password:
+        try:
+            validate_password(password, User(email=email, username=username))
+        except ValidationError as e:
+            raise RowError(' '.join(e.messages))
+    
+    return {
+        'line': line,
+        'email': email,
+        'username': username,
+        'plan': plan,
+        'days': days,
+        'password': password,
+        'password_hash': password_hash,
+    }
+
+
+def _taken_usernames(candidates):
+    if not candidates:
+        return set()
+    return set(
+        User.objects.annotate(username_upper=Upper('username'))
+        .filter(username_upper__in=[name.upper() for name in candidates])
+        .values_list('username_upper', flat=True)
+    )
+
+
+def _assign_usernames(records, report):
+    """
+    Give every new user a unique username.
+    
+    bulk_create skips ``User.save``, which normally derives the username
+    from the email, so it is done here. A derived name that is already
+    taken gets a short random suffix; an explicit one is a row error.
+    """
+    for record in records:
+        record['explicit_username'] = bool(record['username'])
+        if not record['username']:
+            record['username'] = record['email'].split('@')[0][:140]
+    
+    taken = _taken_usernames({record['username'] for record in records})
+    accepted = []
+    for record in records:
+        key = record['username'].upper()
+        if key in taken:
+            if record['explicit_username']:
+                report.error(record['line'], record['email'], f"Username {record['username']} is taken")
+                continue
+            record['username'] = f"{record['username']}-{uuid.uuid4().hex[:6]}"
+            key = record['username'].upper()
+        taken.add(key)
+        accepted.append(record)
+    return accepted
+
+
+def _create_users(records, executor, now, report):
+    """Hash passwords and insert users plus subscriptions for a batch."""
+    hashes = iter(_hash_passwords(
+        [record['password'] for record in records if record['password'] and not record['password_hash']],
+        executor,
+    ))
+    
+    users = []
+    for record in records:
+        if record['password_hash']:
+            password = record['password_hash']
+        elif record['password']:
+            password = next(hashes)
+        else:
+            password = make_password(None)
+        users.append(User(
+            email=record['email'],
+            username=record['username'],
+            password=password,
+            plan=record['plan'],
+            created_at=now,
+        ))
+    
+    subscriptions = [
+        Subscription(user=user, plan=record['plan'], start_date=now, end_date=now + timedelta(days=record['days']))
+        for user, record in zip(users, records)
+    ]
+    
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            Subscription.objects.bulk_create(subscriptions)
+        report.created += len(users)
+        return
+    except IntegrityError:
+        # Someone registered one of these accounts meanwhile; isolate the rows
+        logger.info("Bulk insert conflicted, retrying batch row by row")
+    
+    for user, subscription, record in zip(users, subscriptions, records):
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+                subscription.save(force_insert=True)
+            report.created += 1
+        except IntegrityError:
+            report.error(record['line'], record['email'], "Email or username already exists")
+
+
+def _migrate_plans(records, existing, now, report):
+    """Move existing users to the plan given in their row."""
+    groups = defaultdict(list)
+    for record in records:
+        user_id, plan_id = existing[record['email'].upper()]
+        if plan_id == record['plan'].id:
+            report.skipped += 1
+            continue
+        groups[(record['plan'], record['days'])].append(user_id)
+    
+    if not groups:
+        return
+    
+    user_ids = [user_id for ids in groups.values() for user_id in ids]
+    with transaction.atomic():
+        subscribed = set(
+            Subscription.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True)
+        )
+        new_subscriptions = []
+        for (plan, days), ids in groups.items():
+            end_date = now + timedelta(days=days)
+            User.objects.filter(id__in=ids).update(plan=plan, updated_at=now)
+            Subscription.objects.filter(user_id__in=ids).update(
+                plan=plan, status='ACTIVE', start_date=now, end_date=end_date, updated_at=now,
+            )
+            new_subscriptions.extend(
+                Subscription(user_id=user_id, plan=plan, start_date=now, end_date=end_date)
+                for user_id in ids if user_id not in subscribed
+            )
+        Subscription.objects.bulk_create(new_subscriptions)
+        
+        # Queryset updates skip post_save, so drop the cached users here
+        transaction.on_commit(lambda: invalidate_cached_users(*user_ids))
+    
+    report.updated += len(user_ids)
+
+
+def _process_batch(batch, plans, default_plan, default_days, existing_mode, executor, dry_run, report):
+    records, seen = [], set()
+    for line, row, error in batch:
+        report.rows += 1
+        if error:
+            report.error(line, '', error)
+            continue
+        try:
+            record = _prepare(line, row, plans, default_plan, default_days)
+        except RowError as e:
+            report.error(line, _text(row, 'email'), str(e))
+            continue
+        
+        key = record['email'].upper()
+        if key in seen:
+            report.error(line, record['email'], "Duplicate email in file")
+            continue
+        seen.add(key)
+        records.append(record)
+    
+    if not records:
+        return
+    
+    # One indexed lookup (UPPER(email)) for the whole batch
+    existing = {
+        email_upper: (user_id, plan_id)
+        for email_upper, user_id, plan_id in User.objects.annotate(email_upper=Upper('email'))
+        .filter(email_upper__in=[record['email'].upper() for record in records])
+        .values_list('email_upper', 'id', 'plan_id')
+    }
+    
+    new = [record for record in records if record['email'].upper() not in existing]
+    known = [record for record in records if record['email'].upper() in existing]
+    
+    if existing_mode == 'update-plan':
+        if dry_run:
+            report.updated += len(known)
+        else:
+            _migrate_plans(known, existing, timezone.now(), report)
+    else:
+        report.skipped += len(known)
+    
+    new = _assign_usernames(new, report)
+    if dry_run:
+        report.created += len(new)
+    elif new:
+        _create_users(new, executor, timezone.now(), report)
+
+
+def import_users(rows, default_plan=None, subscription_days=None, existing='skip',
+                 batch_size=None, workers=None, pool='process', dry_run=False, report=None, progress=None):
+    """
+    Import users from an iterable of ``(line, row, error)`` tuples.
+    
+    ``existing`` decides what happens to rows whose email is already
+    registered: ``skip`` leaves them alone, ``update-plan`` moves them to
+    the row's plan and restarts their subscription. ``progress`` is called
+    with the report after every batch. Returns the ImportReport.
+    
+    Passwords are hashed on ``workers`` processes, or threads with
+    ``pool='thread'``: Celery's prefork children are daemonic and can't
+    start processes, and hashlib releases the GIL while hashing.
+    """
+    options = _options()
+    if existing not in EXISTING_MODES:
+        raise UserImportError(f"Unknown mode for existing users: {existing}")
+    
+    plans = {plan.name.lower(): plan for plan in Plan.objects.all()}
+    default_name = default_plan or options['DEFAULT_PLAN']
+    if default_name.lower() not in plans:
+        raise UserImportError(f"Plan '{default_name}' not found. Run: python manage.py loaddata initial_plans")
+    
+    report = report or ImportReport()
+    batch_size = batch_size or options['BATCH_SIZE']
+    workers = workers if workers is not None else (options['WORKERS'] or os.cpu_count() or 1)
+    
+    executor = None
+    if workers > 1 and not dry_run:
+        if pool == 'thread':
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='import-hash')
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    
+    rows = iter(rows)
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            _process_batch(
+                batch, plans, plans[default_name.lower()],
+                subscription_days or options['SUBSCRIPTION_DAYS'],
+                existing, executor, dry_run, report,
+            )
+            if progress:
+                progress(report)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    logger.info(
+        f"User import: {report.created} created, {report.updated} updated, {report.skipped} skipped, "
+        f"{report.failed} failed ({report.per_minute} rows/min)"
+    )
+    return report
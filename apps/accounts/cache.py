@@ -0,0 +1,107 @@
+"""
+Short-lived cache of authenticated users for token-based API requests.
+"""
+
+import logging
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth import get_user_model
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_PREFIX = 'auth:user'
+GENERATION_KEY = f'{USER_CACHE_PREFIX}:generation'
+
+
+def _options():
+    """Return the AUTH_USER_CACHE settings merged with defaults."""
+    options = {
+        'CACHE_ALIAS': 'default',
+        'TIMEOUT': 60,
+        'EAGER_PLAN': True,
+    }
+    options.update(getattr(settings, 'AUTH_USER_CACHE', {}))
+    return options
+
+
+def _cache():
+    return caches[_options()['CACHE_ALIAS']]
+
+
+def _generation():
+    """
+    Get the current cache generation.
+    
+    Bumping the generation invalidates every cached user at once, which is
+    used when a plan changes and the bundled plan copies become stale.
+    """
+    return _cache().get_or_set(GENERATION_KEY, 1, None)
+
+
+def user_cache_key(user_id, generation=None):
+    """Build the cache key for a user id."""
+    if generation is None:
+        generation = _generation()
+    return f'{USER_CACHE_PREFIX}:{generation}:{user_id}'
+
+
+def get_cached_user(user_id):
+    """
+    Return the user for ``user_id``, served from cache when possible.
+    
+    In eager mode the user's plan is loaded with ``select_related`` so the
+    cached copy already carries it and ``user.plan`` costs no query.
+    Returns None if the user does not exist.
+    """
+    options = _options()
+    User = get_user_model()
+    
+    try:
+        key = user_cache_key(user_id)
+        user = _cache().get(key)
+    except Exception as e:
+        # Cache outage must not take authentication down with it
+        logger.warning(f"User cache unavailable: {e}")
+        key, user = None, None
+    
+    if user is not None:
+        return user
+    
+    queryset = User.objects.all()
+    if options['EAGER_PLAN']:
+        queryset = queryset.select_related('plan')
+    
+    user = queryset.filter(pk=user_id).first()
+    
+    if user is not None and key is not None:
+        try:
+            _cache().set(key, user, options['TIMEOUT'])
+        except Exception as e:
+            logger.warning(f"Could not cache user {user_id}: {e}")
+    
+    return user
+
+
+def invalidate_cached_users(*user_ids):
+    """Drop cached entries for the given user ids."""
+    if not user_ids:
+        return
+    
+    try:
+        generation = _generation()
+        _cache().delete_many([user_cache_key(user_id, generation) for user_id in user_ids])
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached users: {e}")
+
+
+def invalidate_all_cached_users():
+    """Invalidate every cached user by bumping the cache generation."""
+    try:
+        cache = _cache()
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            # Generation key expired or was evicted; start a fresh one
+            cache.set(GENERATION_KEY, 2, None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate user cache: {e}")
@@ -0,0 +1,17 @@
+"""
+Forms for the accounts app.
+"""
+
+from django import forms
+from django.contrib.admin.forms import AdminAuthenticationForm
+from apps.core.exceptions import HashingSaturated
+
+
+class AdminLoginForm(AdminAuthenticationForm):
+    """Admin site login that reports saturated password hashing as a form error."""
+    
+    def clean(self):
+        try:
+            return super().clean()
+        except HashingSaturated as e:
+            raise forms.ValidationError(e.detail, code='throttled')
@@ -0,0 +1,157 @@
+"""
+Bounded executor for password hashing during login.
+
+Password hashing is deliberately slow, so a burst of logins can tie up every
+request worker. Hashes run on a small shared thread pool (hashlib releases
+the GIL while hashing) behind three admission checks: a process-wide queue
+bound, and per-IP and per-account concurrency limits shared through the
+cache. When any of them is full the login is rejected straight away instead
+of queueing.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from django.conf import settings
+from django.core.cache import cache
+from apps.core.exceptions import HashingSaturated
+from apps.core import metrics
+
+logger = logging.getLogger(__name__)
+
+hash_seconds = metrics.histogram(
+    'auralink_password_hash_seconds',
+    'Time spent hashing or verifying passwords',
+    labelnames=('operation',),
+)
+hash_rejected = metrics.counter(
+    'auralink_password_hash_rejected_total',
+    'Login hashes rejected because a concurrency limit was reached',
+    labelnames=('reason',),
+)
+
+_executor = None
+_slots = None
+_init_lock = threading.Lock()
+
+
+def _options():
+    """Return the LOGIN_HASHING settings merged with defaults."""
+    options = {
+        'MAX_WORKERS': 4,
+        'QUEUE_SIZE': 16,
+        'TIMEOUT': 10,
+        'PER_IP_LIMIT': 4,
+        'PER_ACCOUNT_LIMIT': 2,
+        'SLOT_TTL': 30,
+    }
+    options.update(getattr(settings, 'LOGIN_HASHING', {}))
+    return options
+
+
+def _get_executor():
+    """Create the process-wide executor lazily (after any pre-fork)."""
+    global _executor, _slots
+    
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                options = _options()
+                _slots = threading.BoundedSemaphore(options['MAX_WORKERS'] + options['QUEUE_SIZE'])
+                _executor = ThreadPoolExecutor(
+                    max_workers=options['MAX_WORKERS'],
+                    thread_name_prefix='password-hash',
+                )
+    return _executor, _slots
+
+
+def _acquire_slot(scope, value, limit, ttl):
+    """
+    Take one of ``limit`` concurrent slots for ``value``, shared via cache.
+    
+    Returns the slot's key for ``_release_slot`` (None when unlimited), or
+    raises HashingSaturated when all are taken.
+    """
+    if not value or not limit:
+        return None
+    
+    digest = hashlib.sha256(str(value).lower().encode()).hexdigest()[:32]
+    key = f'login:hash:{scope}:{digest}'
+    
+    cache.add(key, 0, ttl)
+    try:
+        current = cache.incr(key)
+    except ValueError:
+        # Key expired between add() and incr()
+        cache.add(key, 1, ttl)
+        current = 1
+    
+    if current > limit:
+        _release_slot(key)
+        hash_rejected.inc(reason=scope)
+        raise HashingSaturated()
+    return key
+
+
+def _release_slot(key):
+    if key is None:
+        return
+    try:
+        cache.decr(key)
+    except ValueError:
+        pass
+
+
+def run_hash(func, *args, operation='verify', ip=None, account=None):
+    """
+    Run a password hashing callable on the bounded executor.
+    
+    Raises HashingSaturated when the executor queue, the caller's IP or the
+    target account already has the maximum number of hashes in flight.
+    ``account`` should identify the account itself (its id), not the login
+    identifier, so switching between email and username shares one limit.
+    
+    Slots are held until the hash finishes, not until the caller stops
+    waiting for it, so the limits still hold when hashes time out.
+    """
+    options = _options()
+    executor, slots = _get_executor()
+    
+    if not slots.acquire(blocking=False):
+        hash_rejected.inc(reason='global')
+        raise HashingSaturated()
+    
+    held = []
+    
+    def release(future=None):
+        for key in held:
+            _release_slot(key)
+        slots.release()
+    
+    try:
+        held.append(_acquire_slot('ip', ip, options['PER_IP_LIMIT'], options['SLOT_TTL']))
+        held.append(_acquire_slot('account', account, options['PER_ACCOUNT_LIMIT'], options['SLOT_TTL']))
+        future = executor.submit(_timed, operation, func, *args)
+    except BaseException:
+        release()
+        raise
+    future.add_done_callback(release)
+    
+    try:
+        return future.result(timeout=options['TIMEOUT'])
+    except FutureTimeout:
+        hash_rejected.inc(reason='timeout')
+        raise HashingSaturated()
+
+
+def _timed(operation, func, *args):
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        hash_seconds.observe(elapsed, operation=operation)
+        if elapsed > 1:
+            logger.warning(f"Slow password {operation}: {elapsed:.2f}s")
@@ -0,0 +1,89 @@
+"""
+Management command to benchmark login lookup latency on a large user table.
+"""
+
+import random
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from apps.accounts.models import User
+from apps.core.benchmarks import benchmark_database, percentiles, Timer
+
+
+class Command(BaseCommand):
+    help = 'Benchmark email/username login latency against a seeded user table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000_000, help='Number of users to seed')
+        parser.add_argument('--lookups', type=int, default=2000, help='Number of timed lookups')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='bulk_create batch size')
+        parser.add_argument('--with-hash', action='store_true',
+                            help='Time full authenticate() including password hashing')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the seeded benchmark database')
+    
+    def handle(self, *args, **options):
+        with benchmark_database(keepdb=options['keepdb']):
+            self.seed(options['users'], options['batch_size'])
+            self.explain()
+            self.run(options['users'], options['lookups'], options['with_hash'])
+    
+    def seed(self, total, batch_size):
+        """Bulk insert ``total`` users sharing one precomputed password hash."""
+        existing = User.objects.count()
+        if existing >= total:
+            self.stdout.write(f'Reusing {existing} seeded users')
+            return
+        
+        password = make_password('benchmark-password')
+        self.stdout.write(f'Seeding {total - existing} users...')
+        
+        with Timer() as timer:
+            for start in range(existing, total, batch_size):
+                User.objects.bulk_create([
+                    User(
+                        email=f'user{i}@bench.example.com',
+                        username=f'user{i}',
+                        password=password,
+                    )
+                    for i in range(start, min(start + batch_size, total))
+                ])
+        
+        self.stdout.write(f'Seeded in {timer.ms / 1000:.1f}s')
+    
+    def explain(self):
+        """Print the plan of the login query to confirm index usage."""
+        queryset = User.objects.filter(
+            Q(email__iexact='USER1@BENCH.EXAMPLE.COM') | Q(username__iexact='USER1')
+        ).order_by()[:2]
+        self.stdout.write('Query plan:')
+        self.stdout.write(queryset.explain())
+    
+    def run(self, total, lookups, with_hash):
+        """Time lookups by email and by username with mixed casing."""
+        samples = {'email': [], 'username': []}
+        
+        for n in range(lookups):
+            i = random.randrange(total)
+            kind = 'email' if n % 2 == 0 else 'username'
+            identifier = f'User{i}@Bench.Example.com' if kind == 'email' else f'USER{i}'
+            
+            with Timer() as timer:
+                if with_hash:
+                    user = authenticate(username=identifier, password='benchmark-password')
+                else:
+                    user = User.objects.get_for_login(identifier)
+            
+            if user is None:
+                self.stderr.write(self.style.ERROR(f'Lookup failed for {identifier}'))
+                continue
+            samples[kind].append(timer.ms)
+        
+        self.stdout.write(f'Database: {connection.vendor}, users: {total}')
+        for kind, values in samples.items():
+            stats = percentiles(values)
+            self.stdout.write(self.style.SUCCESS(
+                f"{kind:>9}: n={len(values)} "
+                + ' '.join(f'{key}={value:.2f}ms' for key, value in stats.items())
+            ))
@@ -0,0 +1,89 @@
+"""
+Management command to bulk import users from CSV or JSON Lines.
+    
+    python manage.py import_users customers.csv --plan Premium --days 365
+    python manage.py import_users migrated.jsonl --existing update-plan --errors-out errors.csv
+
+Columns: email (required), username, password or password_hash, plan,
+subscription_days.
+"""
+
+import csv
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.accounts.bulk_import import (
+    EXISTING_MODES, FORMATS, ImportReport, UserImportError, detect_format, import_users, read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = 'Bulk import users (and their subscriptions) from a CSV or JSONL file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension')
+        parser.add_argument('--plan', help='Plan for rows without a plan column (default: USER_IMPORT DEFAULT_PLAN)')
+        parser.add_argument('--days', type=int, help='Subscription length for rows without subscription_days')
+        parser.add_argument('--existing', choices=EXISTING_MODES, default='skip',
+                            help='Skip already registered emails, or move them to the row plan')
+        parser.add_argument('--batch-size', type=int, help='Rows per bulk insert')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: CPU count)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; nothing is written')
+        parser.add_argument('--errors-out', help='Write every rejected row to this CSV file')
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path == '-' else detect_format(path))
+        
+        errors_file = writer = None
+        if options['errors_out']:
+            errors_file = open(options['errors_out'], 'w', newline='')
+            writer = csv.writer(errors_file)
+            writer.writerow(['line', 'email', 'error'])
+        
+        report = ImportReport(
+            max_errors=20,
+            on_error=(lambda line, email, message: writer.writerow([line, email, message])) if writer else None,
+        )
+        
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            import_users(
+                read_rows(stream, file_format),
+                default_plan=options['plan'],
+                subscription_days=options['days'],
+                existing=options['existing'],
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                dry_run=options['dry_run'],
+                report=report,
+                progress=self.progress,
+            )
+        except UserImportError as e:
+            raise CommandError(str(e))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+            if errors_file:
+                errors_file.close()
+        
+        self.summary(report, options['dry_run'])
+    
+    def progress(self, report):
+        self.stdout.write(
+            f'  {report.rows} rows: {report.created} created, {report.updated} updated, '
+            f'{report.skipped} skipped, {report.failed} failed ({report.per_minute}/min)'
+        )
+    
+    def summary(self, report, dry_run):
+        for error in report.errors:
+            self.stderr.write(f"  line {error['line']} {error['email']}: {error['error']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f'  ... and {report.failed - len(report.errors)} more')
+        
+        style = self.style.WARNING if report.failed else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{'Dry run: ' if dry_run else ''}{report.rows} rows in {report.elapsed:.1f}s "
+            f"({report.per_minute}/min): {report.created} created, {report.updated} plan changes, "
+            f"{report.skipped} skipped, {report.failed} failed"
+        ))
@@ -2,6 +2,7 @@
 Plan enforcement middleware for Aura Link.
 """
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.http import JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -11,22 +12,42 @@ from apps.subscriptions.models import Subscription
 class PlanEnforcementMiddleware:
     """Middleware to enforce plan limits and permissions."""
     
+    sync_capable = True
+    async_capable = True
+    
+    # Skip for auth and static endpoints
+    skip_paths = ['/auth/', '/static/', '/media/', '/health/', '/admin/']
+    
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
     
     def __call__(self, request):
-        # Skip middleware for unauthenticated users and certain paths
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.check(request) or self.get_response(request)
+    
+    async def __acall__(self, request):
+        if any(request.path.startswith(path) for path in self.skip_paths):
+            return await self.get_response(request)
+        
+        # The session user and subscription lookups are synchronous ORM calls
+        blocked = await sync_to_async(self.check)(request)
+        return blocked or await self.get_response(request)
+    
+    def check(self, request):
+        """Return a response blocking the request, or None to let it through."""
+        if any(request.path.startswith(path) for path in self.skip_paths):
+            return None
+        
+        # Skip middleware for unauthenticated users
         if not request.user.is_authenticated:
-            return self.get_response(request)
+            return None
         
         # Skip for admin users
         if request.user.is_admin:
-            return self.get_response(request)
-        
-        # Skip for auth and static endpoints
-        skip_paths = ['/auth/', '/static/', '/media/', '/health/', '/admin/']
-        if any(request.path.startswith(path) for path in skip_paths):
-            return self.get_response(request)
+            return None
         
         # Check subscription status
         try:
@@ -55,5 +76,4 @@ class PlanEnforcementMiddleware:
             # No subscription found, user can still use Free plan
             pass
         
-        response = self.get_response(request)
-        return response
+        return None
@@ -3,8 +3,11 @@ Custom User model for Aura Link.
 """
 
 import uuid
+from django.apps import apps
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, Upper
 from django.utils import timezone
 
 
@@ -30,6 +33,45 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault('is_active', True)
         
         return self.create_user(email, password, **extra_fields)
+    
+    def get_for_login(self, identifier):
+        """
+        Find a user by email or username, case-insensitively, in one query.
+        
+        Both lookups are served by the UPPER() functional unique indexes.
+        Returns None when nothing matches or the identifier is ambiguous
+        (one user's email equal to another user's username).
+        """
+        users = list(
+            self.filter(Q(email__iexact=identifier) | Q(username__iexact=identifier))
+            .order_by()[:2]
+        )
+        if len(users) != 1:
+            return None
+        return users[0]
+    
+    def with_usage(self):
+        """
+        Users with their plan and active-video usage, in a single query.
+        
+        Annotates ``video_count`` and ``storage_used`` (the per-row
+        equivalents of ``total_videos``/``total_storage_used``) through
+        correlated subqueries, so they can also be sorted on.
+        """
+        Video = apps.get_model('videos', 'Video')
+        active_videos = (
+            Video.objects.filter(owner=OuterRef('pk'), is_active=True)
+            .order_by()
+            .values('owner')
+        )
+        return self.select_related('plan').annotate(
+            video_count=Coalesce(
+                Subquery(active_videos.annotate(count=Count('id')).values('count')), 0,
+            ),
+            storage_used=Coalesce(
+                Subquery(active_videos.annotate(total=Sum('file_size')).values('total')), 0,
+            ),
+        )
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -64,6 +106,11 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        constraints = [
+            # Case-insensitive uniqueness; also indexes the iexact login lookups
+            models.UniqueConstraint(Upper('email'), name='users_email_upper_uniq'),
+            models.UniqueConstraint(Upper('username'), name='users_username_upper_uniq'),
+        ]
     
     def __str__(self):
         return self.email
@@ -98,6 +145,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         )
         return result['total'] or 0
     
+    @property
+    def reserved_upload_quota(self):
+        """(count, bytes) held by unexpired direct upload reservations."""
+        from django.db.models import Count, Sum
+        from django.utils import timezone
+        result = self.direct_uploads.filter(
+            status='RESERVED', expires_at__gt=timezone.now()
+        ).aggregate(count=Count('id'), total=Sum('file_size'))
+        return result['count'], result['total'] or 0
+    
     def can_upload_video(self, file_size):
         """Check if user can upload a video based on plan limits."""
         if not self.plan:
@@ -107,14 +164,17 @@ class User(AbstractBaseUser, PermissionsMixin):
         plan_name = self.plan.name.upper()
         constraints = settings.VIDEO_CONSTRAINTS.get(plan_name, {})
         
+        # Direct uploads in flight hold their quota until completed or expired
+        reserved_videos, reserved_bytes = self.reserved_upload_quota
+        
         # Check video count limit
         max_videos = constraints.get('max_videos')
-        if max_videos and self.total_videos >= max_videos:
+        if max_videos and self.total_videos + reserved_videos >= max_videos:
             return False, f"Maximum {max_videos} videos allowed for {plan_name} plan"
         
         # Check storage limit
         total_storage = constraints.get('total_storage', 0)
-        if self.total_storage_used + file_size > total_storage:
+        if self.total_storage_used + reserved_bytes + file_size > total_storage:
             return False, "Storage quota exceeded"
         
         return True, "OK"
@@ -0,0 +1,26 @@
+"""
+Signal handlers keeping the authenticated user cache consistent.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.plans.models import Plan
+from .cache import invalidate_cached_users, invalidate_all_cached_users
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Drop the cached copy after any user change (plan, is_active, ...) commits."""
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_users(user_id))
+
+
+@receiver(post_save, sender=Plan)
+@receiver(post_delete, sender=Plan)
+def invalidate_plan_cache(sender, instance, **kwargs):
+    """Cached users may carry a copy of the plan, so flush them all."""
+    transaction.on_commit(invalidate_all_cached_users)
@@ -8,6 +8,7 @@ from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache, cache_control
 from apps.accounts.models import User
+from apps.core.exceptions import HashingSaturated
 
 
 @cache_control(no_cache=True, must_revalidate=True, no_store=True)
@@ -31,7 +32,11 @@ def user_login_view(request):
             return render(request, 'auth/login.html')
         
         # Try to authenticate
-        user = authenticate(request, username=username, password=password)
+        try:
+            user = authenticate(request, username=username, password=password)
+        except HashingSaturated as e:
+            messages.error(request, e.detail)
+            return render(request, 'auth/login.html', status=429)
         
         if user is not None:
             # Check if user is blocked
@@ -77,7 +82,11 @@ def admin_login_view(request):
             return render(request, 'auth/admin_login.html')
         
         # Try to authenticate
-        user = authenticate(request, username=username, password=password)
+        try:
+            user = authenticate(request, username=username, password=password)
+        except HashingSaturated as e:
+            messages.error(request, e.detail)
+            return render(request, 'auth/admin_login.html', status=429)
         
         if user is not None:
             # Check if user is an admin
@@ -1,9 +1,15 @@
 from django.contrib import admin
-from .models import AdminActionLog
+from .models import AdminActionLog, BulkActionJob
 
 @admin.register(AdminActionLog)
 class AdminActionLogAdmin(admin.ModelAdmin):
     list_display = ['action_type', 'admin', 'target_model', 'target_id', 'timestamp']
     list_filter = ['action_type', 'timestamp']
     search_fields = ['admin__email', 'description']
-    readonly_fields = ['admin', 'action_type', 'target_model', 'target_id', 'description', 'ip_address', 'timestamp']
\ No newline at end of file
+    readonly_fields = ['admin', 'action_type', 'target_model', 'target_id', 'description', 'ip_address', 'timestamp']
+
+@admin.register(BulkActionJob)
+class BulkActionJobAdmin(admin.ModelAdmin):
+    list_display = ['action', 'target', 'admin', 'status', 'processed', 'total', 'affected', 'created_at']
+    list_filter = ['status', 'target']
+    readonly_fields = ['id', 'admin', 'target', 'action', 'selection', 'ip_address', 'total', 'processed', 'affected', 'cursor', 'error', 'report', 'created_at', 'started_at', 'finished_at']
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:43
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('audit', '0003_alter_adminactionlog_action_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkActionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('target', models.CharField(choices=[('videos', 'Videos'), ('users', 'Users'), ('deletion_requests', 'Deletion Requests')], max_length=20)),
+                ('action', models.CharField(max_length=20)),
+                ('selection', models.JSONField(default=dict)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('affected', models.PositiveIntegerField(default=0)),
+                ('cursor', models.CharField(blank=True, max_length=64)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('admin', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bulk_action_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'bulk_action_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_bulkactionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkactionjob',
+            name='report',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -2,6 +2,7 @@
 Audit logging for admin actions.
 """
 
+import uuid
 from django.db import models
 from django.conf import settings
 
@@ -46,4 +47,61 @@ class AdminActionLog(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.action_type} by {self.admin.email if self.admin else 'Unknown'}"
\ No newline at end of file
+        return f"{self.action_type} by {self.admin.email if self.admin else 'Unknown'}"
+
+
+class BulkActionJob(models.Model):
+    """A bulk moderation action running chunk by chunk in the background."""
+    
+    TARGET_CHOICES = (
+        ('videos', 'Videos'),
+        ('users', 'Users'),
+        ('deletion_requests', 'Deletion Requests'),
+    )
+    
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    admin = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='bulk_action_jobs'
+    )
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    action = models.CharField(max_length=20)
+    # {'ids': [...]} or {'filters': {...}}, plus optional 'notes'
+    selection = models.JSONField(default=dict)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    affected = models.PositiveIntegerField(default=0)
+    # Last primary key handled, so a restarted task resumes where it stopped
+    cursor = models.CharField(max_length=64, blank=True)
+    error = models.TextField(blank=True)
+    # Job-specific results, e.g. per-row errors of a user import
+    report = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'bulk_action_jobs'
+        ordering = ['-created_at']
+    
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == 'COMPLETED' else 0
+        return min(100, round(self.processed * 100 / self.total))
+    
+    def __str__(self):
+        return f"{self.action} {self.target} ({self.status})"
@@ -1,5 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.core'
\ No newline at end of file
+    name = 'apps.core'
+    
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .metrics import install_cache_recorder, install_query_recorder
+        connection_created.connect(install_query_recorder)
+        install_cache_recorder()
+        
+        if getattr(settings, 'PREFORK_WARMUP', False):
+            from .warmup import warm_up
+            warm_up()
@@ -0,0 +1,47 @@
+"""
+Helpers shared by the benchmark management commands.
+"""
+
+import time
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """
+    Run the block against a throwaway copy of the database.
+    
+    Uses the same test database machinery as the test runner, so seeded
+    benchmark data never touches the configured database.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Return nearest-rank percentiles of ``samples`` keyed as p50, p95, ..."""
+    if not samples:
+        return {f'p{point}': 0 for point in points}
+    
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        f'p{point}': ordered[min(last, round(point / 100 * last))]
+        for point in points
+    }
+
+
+class Timer:
+    """Context manager measuring elapsed wall time in milliseconds."""
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.ms = (time.perf_counter() - self.start) * 1000
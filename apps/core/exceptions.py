@@ -3,6 +3,7 @@ Custom exception handling.
 """
 
 from rest_framework.views import exception_handler as drf_exception_handler
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 import logging
 
@@ -37,4 +38,9 @@ class PlanLimitExceeded(Exception):
 
 class FileValidationError(Exception):
     """Exception for file validation errors."""
-    pass
\ No newline at end of file
+    pass
+
+
+class HashingSaturated(Throttled):
+    """Exception raised when too many password hashes are already in flight."""
+    default_detail = 'Too many login attempts in progress. Please try again shortly.'
@@ -0,0 +1,136 @@
+"""
+Bulk data factory for benchmarks.
+
+Builds a realistic dataset with a handful of ``bulk_create`` calls so that
+tens of thousands of rows can be seeded in seconds.
+"""
+
+import uuid
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.audit.models import AdminActionLog
+from apps.playback.models import Playlist, PlaylistItem
+from apps.plans.models import Plan
+from apps.subscriptions.models import Subscription
+from apps.videos.models import Video
+from apps.videos.deletion_requests import VideoDeletionRequest
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+BATCH_SIZE = 5000
+
+
+def ensure_plans():
+    """Load the initial plans fixture if the plans table is empty."""
+    if not Plan.objects.exists():
+        call_command('loaddata', 'initial_plans', verbosity=0)
+    return Plan.objects.get(name='Free'), Plan.objects.get(name='Premium')
+
+
+def seed_dataset(users=100, videos_per_user=5, global_videos=10,
+                 deletion_requests=20, audit_logs=200, prefix='bench'):
+    """
+    Seed users, their videos and playlists, global videos, deletion requests
+    and audit logs.
+    
+    Returns a dict with the admin user, a regular user and the created ids,
+    which the benchmark uses to fill in URL parameters.
+    """
+    free_plan, premium_plan = ensure_plans()
+    password = make_password(BENCHMARK_PASSWORD)
+    now = timezone.now()
+    
+    admin = User(
+        email=f'{prefix}-admin@bench.example.com', username=f'{prefix}-admin',
+        password=password, role='ADMIN', is_staff=True, is_superuser=True, plan=premium_plan,
+    )
+    user_objs = [admin] + [
+        User(
+            email=f'{prefix}-user{i}@bench.example.com',
+            username=f'{prefix}-user{i}',
+            password=password,
+            plan=premium_plan if i % 4 == 0 else free_plan,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(users)
+    ]
+    User.objects.bulk_create(user_objs, batch_size=BATCH_SIZE)
+    regular_users = user_objs[1:]
+    
+    Subscription.objects.bulk_create([
+        Subscription(user=user, plan=user.plan, end_date=now + timedelta(days=30))
+        for user in regular_users if user.plan_id == premium_plan.id
+    ], batch_size=BATCH_SIZE)
+    
+    video_objs = []
+    for index, user in enumerate(regular_users):
+        for n in range(videos_per_user):
+            video_objs.append(Video(
+                owner=user,
+                title=f'{user.username} video {n}',
+                file_path=f'{uuid.uuid4()}.mp4',
+                file_size=(n + 1) * 1024 * 1024,
+                duration=60 * (n + 1),
+                is_active=n % 10 != 9,
+            ))
+    global_objs = [
+        Video(
+            owner=admin, title=f'Global video {n}', file_path=f'{uuid.uuid4()}.mp4',
+            file_size=10 * 1024 * 1024, duration=300, is_global=True, uploaded_by_admin=True,
+        )
+        for n in range(global_videos)
+    ]
+    Video.objects.bulk_create(video_objs + global_objs, batch_size=BATCH_SIZE)
+    
+    statuses = ['PENDING', 'APPROVED', 'REJECTED']
+    request_objs = [
+        VideoDeletionRequest(
+            video=global_objs[n % len(global_objs)],
+            requested_by=regular_users[n % len(regular_users)],
+            status=statuses[n % len(statuses)],
+            reason='Benchmark request',
+        )
+        for n in range(deletion_requests if global_objs and regular_users else 0)
+    ]
+    VideoDeletionRequest.objects.bulk_create(request_objs, batch_size=BATCH_SIZE)
+    
+    action_types = [choice for choice, _ in AdminActionLog.ACTION_CHOICES]
+    AdminActionLog.objects.bulk_create([
+        AdminActionLog(
+            admin=admin,
+            action_type=action_types[n % len(action_types)],
+            target_model='Video',
+            target_id=str(video_objs[n % len(video_objs)].id) if video_objs else 'N/A',
+            description='Benchmark action',
+        )
+        for n in range(audit_logs)
+    ], batch_size=BATCH_SIZE)
+    
+    playlist_objs = [
+        Playlist(owner=user, title=f'{user.username} playlist')
+        for user in regular_users
+    ]
+    Playlist.objects.bulk_create(playlist_objs, batch_size=BATCH_SIZE)
+    videos_by_owner = {}
+    for video in video_objs:
+        videos_by_owner.setdefault(video.owner_id, []).append(video)
+    item_objs = [
+        PlaylistItem(playlist=playlist, video=video, position=(n + 1) * 1024.0)
+        for playlist in playlist_objs
+        for n, video in enumerate(videos_by_owner.get(playlist.owner_id, []) + global_objs)
+    ]
+    PlaylistItem.objects.bulk_create(item_objs, batch_size=BATCH_SIZE)
+    
+    return {
+        'admin': admin,
+        'user': regular_users[0] if regular_users else admin,
+        'video': video_objs[0] if video_objs else (global_objs[0] if global_objs else None),
+        'global_video': global_objs[0] if global_objs else None,
+        'deletion_request': next((r for r in request_objs if r.status == 'PENDING'), None),
+        'plan': free_plan,
+        'playlist': playlist_objs[0] if playlist_objs else None,
+        'playlist_item': next((i for i in item_objs if playlist_objs and i.playlist is playlist_objs[0]), None),
+    }
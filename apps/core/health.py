@@ -0,0 +1,190 @@
+"""
+Health probes for the database, cache, Celery workers and video storage.
+
+Probes run concurrently, and the combined result is memoised per process
+for a few seconds so that load balancer polling does not hit the backing
+services on every request.
+
+Each probe also bounds its own connect and read time, so a hung dependency
+gives up its pool thread. A probe still running from an earlier poll is not
+started again; its last result is reported instead, so one stuck dependency
+can't fill the pool and make every other probe time out.
+"""
+
+import copy
+import math
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from apps.core.utils import redis_cache_enabled
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='health-probe')
+_results = {}
+_results_lock = threading.Lock()
+# probe name -> (future of its latest run, its last reported result)
+_probe_runs = {}
+
+
+def _options():
+    """Return the HEALTH_CHECK settings merged with defaults."""
+    options = {
+        'CACHE_TTL': 5,
+        'PROBE_TIMEOUT': 2,
+        'MIN_FREE_DISK_MB': 1024,
+        'READINESS_PROBES': ['database', 'redis'],
+    }
+    options.update(getattr(settings, 'HEALTH_CHECK', {}))
+    return options
+
+
+def check_database():
+    """Run a trivial query, connecting and querying within the probe timeout."""
+    timeout = _options()['PROBE_TIMEOUT']
+    probe_connection = connection
+    if connection.vendor == 'postgresql':
+        # A connection of its own, so the connect timeout can be the probe's
+        settings_dict = copy.deepcopy(connection.settings_dict)
+        settings_dict['OPTIONS']['connect_timeout'] = max(2, math.ceil(timeout))  # libpq's minimum
+        probe_connection = connection.__class__(settings_dict, connection.alias)
+    try:
+        with probe_connection.cursor() as cursor:
+            if probe_connection.vendor == 'postgresql':
+                cursor.execute(f"SET statement_timeout = {int(timeout * 1000)}")
+            cursor.execute("SELECT 1")
+        return {}
+    finally:
+        # Probe threads are pooled; don't leave idle connections behind
+        probe_connection.close()
+
+
+def check_redis():
+    """Round-trip a value through the default cache."""
+    if redis_cache_enabled():
+        # A client with the probe's timeouts instead of the cache's shared pool
+        import redis
+        
+        timeout = _options()['PROBE_TIMEOUT']
+        location = settings.CACHES['default']['LOCATION']
+        client = redis.Redis.from_url(
+            location[0] if isinstance(location, (list, tuple)) else location,
+            socket_connect_timeout=timeout,
+            socket_timeout=timeout,
+        )
+        try:
+            client.set('health_check', 'ok', ex=10)
+            value = client.get('health_check')
+        finally:
+            client.close()
+        if value != b'ok':
+            raise RuntimeError('cache read-back mismatch')
+        return {}
+    
+    cache.set('health_check', 'ok', 10)
+    if cache.get('health_check') != 'ok':
+        raise RuntimeError('cache read-back mismatch')
+    return {}
+
+
+def check_celery():
+    """Ping Celery workers through the broker."""
+    from config import celery_app
+    
+    timeout = _options()['PROBE_TIMEOUT']
+    with celery_app.connection_for_write(connect_timeout=timeout / 2) as broker:
+        replies = celery_app.control.ping(timeout=timeout / 2, connection=broker)
+    if not replies:
+        raise RuntimeError('no workers responded')
+    return {'workers': len(replies)}
+
+
+def check_storage():
+    """Check local disk headroom and, when S3 is configured, bucket access."""
+    path = settings.MEDIA_ROOT if os.path.isdir(settings.MEDIA_ROOT) else settings.BASE_DIR
+    usage = shutil.disk_usage(path)
+    free_mb = usage.free // (1024 * 1024)
+    details = {'free_mb': free_mb}
+    
+    if free_mb < _options()['MIN_FREE_DISK_MB']:
+        raise RuntimeError(f'only {free_mb}MB free on media disk')
+    
+    if settings.STORAGE_TYPE == 's3':
+        from botocore.config import Config
+        from storages.backends.s3boto3 import S3Boto3Storage
+        
+        timeout = _options()['PROBE_TIMEOUT']
+        storage = S3Boto3Storage()
+        storage.client_config = storage.client_config.merge(
+            Config(connect_timeout=timeout, read_timeout=timeout, retries={'max_attempts': 1})
+        )
+        storage.connection.meta.client.head_bucket(Bucket=storage.bucket_name)
+        details['bucket'] = storage.bucket_name
+    
+    return details
+
+
+PROBES = {
+    'database': check_database,
+    'redis': check_redis,
+    'celery': check_celery,
+    'storage': check_storage,
+}
+
+
+def _run_probe(probe):
+    start = time.perf_counter()
+    try:
+        details = probe()
+        state = 'connected'
+    except Exception as e:
+        details = {'error': str(e)}
+        state = 'disconnected'
+    details['ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return state, details
+
+
+def run_probes(names):
+    """
+    Run the named probes concurrently and return their results.
+    
+    Each probe reports 'connected', 'disconnected' or 'timeout' plus a dict
+    of details. Results are memoised for HEALTH_CHECK['CACHE_TTL'] seconds.
+    """
+    options = _options()
+    key = tuple(sorted(names))
+    
+    with _results_lock:
+        cached = _results.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        # Probing under the lock lets concurrent pollers share one run
+        timed_out = ('timeout', {'ms': options['PROBE_TIMEOUT'] * 1000})
+        futures, results = {}, {}
+        for name in key:
+            future, last = _probe_runs.get(name, (None, None))
+            if future is not None and not future.done():
+                # Still stuck from an earlier poll: don't tie up another thread
+                results[name] = last or timed_out
+            else:
+                futures[name] = _executor.submit(_run_probe, PROBES[name])
+        deadline = time.monotonic() + options['PROBE_TIMEOUT']
+        
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeout:
+                results[name] = timed_out
+            _probe_runs[name] = (future, results[name])
+        
+        _results[key] = (time.monotonic() + options['CACHE_TTL'], results)
+        return results
+
+
+def readiness_probes():
+    """Probes that must pass for this instance to receive traffic."""
+    return _options()['READINESS_PROBES']
@@ -0,0 +1,89 @@
+"""
+Benchmark: how long do upload jobs wait in the Celery queues under mixed load?
+
+Fills the maintenance and bulk queues with slow jobs, then sends a stream
+of short interactive jobs, a share of them at the premium priority, and
+reports how long each kind waited before a worker picked it up. Needs the
+broker and workers running, e.g. one worker per queue as in the README:
+    
+    python manage.py benchmark_celery_queues
+    
+    # Baseline: everything on one queue, as before queues were split
+    python manage.py benchmark_celery_queues --single-queue
+"""
+
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.benchmarks import percentiles
+from apps.tasks.benchmark_tasks import queue_probe
+
+
+class Command(BaseCommand):
+    help = 'Measure Celery queue wait of interactive, bulk and maintenance jobs under mixed load'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--maintenance', type=int, default=8, help='Slow maintenance jobs sent first')
+        parser.add_argument('--maintenance-seconds', type=float, default=3.0, help='Duration of each maintenance job')
+        parser.add_argument('--bulk', type=int, default=4, help='Slow bulk media jobs sent first')
+        parser.add_argument('--bulk-seconds', type=float, default=5.0, help='Duration of each bulk job')
+        parser.add_argument('--interactive', type=int, default=60, help='Interactive jobs sent after the slow ones')
+        parser.add_argument('--interactive-seconds', type=float, default=0.2,
+                            help='Duration of each interactive job')
+        parser.add_argument('--interval', type=float, default=0.02, help='Seconds between interactive sends')
+        parser.add_argument('--premium-share', type=float, default=0.25,
+                            help='Share of interactive jobs sent at the premium priority')
+        parser.add_argument('--single-queue', action='store_true',
+                            help='Send every job to one queue without priorities (baseline)')
+        parser.add_argument('--timeout', type=float, default=600, help='Seconds to wait for all results')
+    
+    def handle(self, *args, **options):
+        if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+            raise CommandError('Tasks run eagerly here; use settings with a broker and start the workers')
+        
+        constraints = settings.VIDEO_CONSTRAINTS
+        priorities = {
+            'premium': constraints['PREMIUM']['task_priority'],
+            'free': constraints['FREE']['task_priority'],
+        }
+        
+        def send(kind, queue, seconds, priority=None):
+            if options['single_queue']:
+                queue, priority = settings.CELERY_TASK_DEFAULT_QUEUE, None
+            result = queue_probe.apply_async((time.time(), seconds), queue=queue, priority=priority)
+            return kind, result
+        
+        sent = []
+        for _ in range(options['maintenance']):
+            sent.append(send('maintenance', 'maintenance', options['maintenance_seconds']))
+        for _ in range(options['bulk']):
+            sent.append(send('bulk', 'media_bulk', options['bulk_seconds']))
+        
+        premium_every = round(1 / options['premium_share']) if options['premium_share'] > 0 else 0
+        for n in range(options['interactive']):
+            tier = 'premium' if premium_every and n % premium_every == 0 else 'free'
+            sent.append(send(
+                f'interactive ({tier})', 'media_interactive', options['interactive_seconds'], priorities[tier],
+            ))
+            time.sleep(options['interval'])
+        
+        self.stdout.write(f"Sent {len(sent)} jobs; waiting for workers...")
+        deadline = time.monotonic() + options['timeout']
+        waits = {}
+        for kind, result in sent:
+            try:
+                waited = result.get(timeout=max(deadline - time.monotonic(), 0.1))
+            except Exception as e:
+                raise CommandError(f"No result for a {kind} job ({e}); are workers consuming every queue?")
+            waits.setdefault(kind, []).append(waited)
+        
+        mode = 'single queue' if options['single_queue'] else 'split queues'
+        self.stdout.write(f"\nQueue wait ({mode}):")
+        self.stdout.write(f"{'jobs':<22} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for kind in sorted(waits):
+            samples = waits[kind]
+            points = percentiles(samples)
+            self.stdout.write(
+                f"{kind:<22} {len(samples):>6} {points['p50']:>9.0f} {points['p95']:>9.0f} "
+                f"{points['p99']:>9.0f} {max(samples):>9.0f}"
+            )
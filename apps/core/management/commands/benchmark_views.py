@@ -0,0 +1,258 @@
+"""
+Management command to benchmark query counts and latency of every view.
+"""
+
+import json
+import logging
+import subprocess
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment, teardown_test_environment
+)
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.urls.resolvers import RoutePattern
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core.benchmarks import benchmark_database, percentiles, Timer
+from apps.core.factories import seed_dataset
+from apps.videos.access import flush_access_counts
+
+# Views whose query count still grows with data; reported but not failed.
+# Remove entries as the N+1 patterns are fixed.
+KNOWN_QUERY_GROWTH = set()
+
+NO_ACCESS_FLUSH = {'ACCESS_FLUSH_SIZE': 10 ** 9, 'ACCESS_FLUSH_SECONDS': 10 ** 9}
+
+# URL kwargs filled from the seeded dataset
+URL_PARAMS = {
+    'video_id': lambda data: data['video'].id,
+    'user_id': lambda data: data['user'].id,
+    'request_id': lambda data: data['deletion_request'].id,
+    'item_id': lambda data: data['playlist_item'].id,
+}
+
+# Router detail routes use a generic ``pk``; pick the object by route basename
+PK_PARAMS = {
+    'video': lambda data: data['video'].id,
+    'plan': lambda data: data['plan'].id,
+    'playlist': lambda data: data['playlist'].id,
+    'upload': lambda data: 'benchmark-upload',
+}
+
+
+def iter_url_patterns(resolver=None, params=(), namespace=None):
+    """Yield (name, namespace, param names) for every named URL pattern."""
+    resolver = resolver or get_resolver()
+    
+    for pattern in resolver.url_patterns:
+        pattern_params = tuple(_pattern_params(pattern.pattern))
+        
+        if isinstance(pattern, URLResolver):
+            yield from iter_url_patterns(
+                pattern, params + pattern_params, pattern.namespace or namespace
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name, namespace, params + pattern_params
+
+
+def _pattern_params(pattern):
+    if isinstance(pattern, RoutePattern):
+        return pattern.converters.keys()
+    return pattern.regex.groupindex.keys()
+
+
+class Command(BaseCommand):
+    help = 'Seed benchmark data and measure query counts and latency for every URL'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Users at the smallest scale')
+        parser.add_argument('--videos-per-user', type=int, default=5, help='Videos per user at the smallest scale')
+        parser.add_argument('--scales', default='1,4', help='Comma-separated dataset multipliers')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per URL')
+        parser.add_argument('--output', help='Write results as a JSON baseline to this file')
+        parser.add_argument('--compare', help='Compare against a previously written JSON baseline')
+        parser.add_argument('--latency-tolerance', type=float, default=0.25,
+                            help='Allowed relative p95 latency increase when comparing')
+        parser.add_argument('--fail-on-latency', action='store_true',
+                            help='Treat latency regressions as failures, not warnings')
+    
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options['scales'].split(',')]
+        results = {}
+        
+        setup_test_environment()
+        # 4xx responses are expected (e.g. GET on POST-only endpoints);
+        # server errors still show up in the status column
+        logging.disable(logging.CRITICAL)
+        try:
+            # Buffered access counts would add a query to whichever request
+            # flushes them; hold them and write them before the DB goes away
+            with benchmark_database(), override_settings(STORAGE_TIERING=NO_ACCESS_FLUSH):
+                for index, scale in enumerate(scales):
+                    last = index == len(scales) - 1
+                    self.stdout.write(f'Scale x{scale}...')
+                    
+                    call_command('flush', interactive=False, verbosity=0)
+                    data = seed_dataset(
+                        users=options['users'] * scale,
+                        videos_per_user=options['videos_per_user'] * scale,
+                        global_videos=2 * scale,
+                        deletion_requests=10 * scale,
+                        audit_logs=50 * scale,
+                    )
+                    self.measure(data, scale, results, options['repeat'] if last else 1)
+                    flush_access_counts()
+        finally:
+            logging.disable(logging.NOTSET)
+            teardown_test_environment()
+        
+        failures = self.check_growth(results, scales)
+        self.report(results, scales)
+        
+        baseline = {
+            'commit': self.current_commit(),
+            'created_at': timezone.now().isoformat(),
+            'scales': scales,
+            'views': results,
+        }
+        
+        if options['compare']:
+            failures += self.compare(
+                baseline, options['compare'],
+                options['latency_tolerance'], options['fail_on_latency'],
+            )
+        
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(baseline, fh, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['output']}")
+        
+        if failures:
+            raise CommandError('\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('All views within query budget'))
+    
+    def targets(self, data):
+        """Yield (name, path, role) for every URL that can be resolved with seeded data."""
+        seen = set()
+        
+        for name, namespace, params in iter_url_patterns():
+            # Skip the Django admin site except its index, and format-suffix duplicates
+            if namespace == 'admin' and name != 'index':
+                continue
+            if 'format' in params:
+                continue
+            
+            full_name = f'{namespace}:{name}' if namespace else name
+            if full_name in seen:
+                continue
+            
+            kwargs = {}
+            for param in params:
+                if param == 'pk':
+                    getter = PK_PARAMS.get(name.split('-')[0])
+                else:
+                    getter = URL_PARAMS.get(param)
+                value = getter(data) if getter else None
+                if value is None:
+                    break
+                kwargs[param] = value
+            else:
+                seen.add(full_name)
+                path = reverse(full_name, kwargs=kwargs)
+                role = 'admin' if path.startswith(('/admin-portal/', '/admin/')) else 'user'
+                yield full_name, path, role
+                continue
+            
+            self.stdout.write(self.style.WARNING(f'  skipped {full_name}: no data for {params}'))
+    
+    def measure(self, data, scale, results, repeat):
+        """Request every target inside a rolled-back transaction and record queries/latency."""
+        for name, path, role in self.targets(data):
+            user = data['admin'] if role == 'admin' else data['user']
+            client = Client()
+            client.force_login(user)
+            extra = {}
+            if path.startswith('/api/'):
+                extra['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(user)}'
+            
+            timings = []
+            # One untimed warm-up so caches and lazy imports don't count
+            for run in range(repeat + 1):
+                # The query log is a bounded deque; once full, captures read as empty
+                reset_queries()
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries, Timer() as timer:
+                        response = client.get(path, secure=True, **extra)
+                    transaction.set_rollback(True)
+                if run:
+                    timings.append(timer.ms)
+            
+            entry = results.setdefault(name, {'path': path, 'role': role, 'queries': {}})
+            entry['status'] = response.status_code
+            entry['queries'][str(scale)] = len(queries)
+            entry['latency_ms'] = {key: round(value, 3) for key, value in percentiles(timings).items()}
+    
+    def check_growth(self, results, scales):
+        """Fail views whose query count changes between dataset scales."""
+        failures = []
+        for name, entry in sorted(results.items()):
+            counts = [entry['queries'].get(str(scale)) for scale in scales]
+            if len(set(counts)) <= 1:
+                continue
+            message = f'{name}: query count grows with data {counts}'
+            if name in KNOWN_QUERY_GROWTH:
+                self.stdout.write(self.style.WARNING(f'  known: {message}'))
+            else:
+                failures.append(message)
+        return failures
+    
+    def compare(self, baseline, path, tolerance, fail_on_latency):
+        """Compare against a stored baseline; returns failure messages."""
+        with open(path) as fh:
+            previous = json.load(fh)
+        
+        failures = []
+        top_scale = str(baseline['scales'][-1])
+        self.stdout.write(f"Comparing against {path} (commit {previous.get('commit', 'unknown')})")
+        
+        for name, entry in sorted(baseline['views'].items()):
+            old = previous.get('views', {}).get(name)
+            if not old:
+                continue
+            
+            old_queries = old['queries'].get(top_scale)
+            new_queries = entry['queries'].get(top_scale)
+            if old_queries is not None and new_queries > old_queries:
+                failures.append(f'{name}: queries increased {old_queries} -> {new_queries}')
+            
+            old_p95, new_p95 = old['latency_ms']['p95'], entry['latency_ms']['p95']
+            if old_p95 and new_p95 > old_p95 * (1 + tolerance):
+                message = f'{name}: p95 latency {old_p95:.1f}ms -> {new_p95:.1f}ms'
+                if fail_on_latency:
+                    failures.append(message)
+                else:
+                    self.stdout.write(self.style.WARNING(f'  {message}'))
+        return failures
+    
+    def report(self, results, scales):
+        header = f"{'view':<40} {'status':>6} " + ' '.join(f'{"q@x" + str(s):>7}' for s in scales)
+        self.stdout.write(header + f" {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, entry in sorted(results.items()):
+            counts = ' '.join(f"{entry['queries'].get(str(s), '-'):>7}" for s in scales)
+            latency = entry['latency_ms']
+            self.stdout.write(
+                f"{name:<40} {entry['status']:>6} {counts} "
+                f"{latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f}"
+            )
+    
+    def current_commit(self):
+        try:
+            return subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+            ).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
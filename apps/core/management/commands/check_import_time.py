@@ -0,0 +1,73 @@
+"""
+Management command enforcing an import-time budget for Django startup.
+"""
+
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.warmup import HEAVY_MODULES
+
+STARTUP_SCRIPT = (
+    'import django; django.setup(); '
+    'from django.conf import settings; '
+    'import importlib; importlib.import_module(settings.ROOT_URLCONF)'
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure Django setup + URLconf import time with python -X importtime'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=int, default=None,
+                            help='Fail above this many milliseconds (default: IMPORT_TIME_BUDGET_MS)')
+        parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    
+    def handle(self, *args, **options):
+        budget = options['budget_ms'] or getattr(settings, 'IMPORT_TIME_BUDGET_MS', 2000)
+        
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'config.settings.development'
+        ))
+        # Measure what a fresh worker pays, without pre-fork warm-up
+        env['PREFORK_WARMUP'] = 'False'
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            env=env, capture_output=True, text=True, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+        
+        imports = self.parse(result.stderr)
+        total_ms = sum(self_us for self_us, _, _ in imports) / 1000
+        
+        self.stdout.write('Slowest imports (cumulative):')
+        top_level = [entry for entry in imports if entry[2] == entry[2].lstrip()]
+        for self_us, cumulative_us, name in sorted(top_level, key=lambda e: -e[1])[:options['top']]:
+            self.stdout.write(f'  {cumulative_us / 1000:8.1f}ms  {name.strip()}')
+        
+        failures = []
+        loaded = {name.strip() for _, _, name in imports}
+        eager = [name for name in HEAVY_MODULES if name in loaded]
+        if eager:
+            failures.append(f"Heavy modules imported at startup: {', '.join(eager)}")
+        
+        if total_ms > budget:
+            failures.append(f'Startup imports took {total_ms:.0f}ms, budget is {budget}ms')
+        
+        if failures:
+            raise CommandError('\n'.join(failures))
+        
+        self.stdout.write(self.style.SUCCESS(f'Startup imports took {total_ms:.0f}ms (budget {budget}ms)'))
+    
+    def parse(self, stderr):
+        """Parse ``-X importtime`` output into (self_us, cumulative_us, name) tuples."""
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            # Nested imports keep their two-space indentation per level
+            imports.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+        return imports
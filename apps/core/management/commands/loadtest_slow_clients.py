@@ -0,0 +1,219 @@
+"""
+Load test: how many slow clients can a worker carry under WSGI vs ASGI?
+
+Opens many connections that trickle a request body (or read a response)
+very slowly while a probe polls a cheap endpoint. Under gunicorn sync
+workers each slow client pins a worker and the probe starts timing out;
+under uvicorn they only hold sockets.
+    
+    # Spawn gunicorn (sync) and uvicorn with the same worker count
+    python manage.py loadtest_slow_clients --spawn --workers 2 --clients 50
+    
+    # Or point it at servers that are already running
+    python manage.py loadtest_slow_clients --target wsgi=http://127.0.0.1:8000 \\
+        --target asgi=http://127.0.0.1:8001
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.benchmarks import percentiles
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+class Command(BaseCommand):
+    help = 'Compare concurrent slow clients per worker under WSGI and ASGI'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--target', action='append', default=[],
+                            help='name=base_url of a running server (repeatable)')
+        parser.add_argument('--spawn', action='store_true',
+                            help='Start gunicorn (WSGI) and uvicorn (ASGI) servers for the test')
+        parser.add_argument('--workers', type=int, default=2, help='Worker processes for --spawn')
+        parser.add_argument('--clients', type=int, default=50, help='Concurrent slow clients')
+        parser.add_argument('--duration', type=float, default=15.0, help='Seconds each slow client stays open')
+        parser.add_argument('--mode', choices=['upload', 'download'], default='upload',
+                            help='Trickle a request body, or read a response slowly')
+        parser.add_argument('--path', default='/auth/web/login/',
+                            help='Path the slow clients hit (upload mode needs a view that reads the body)')
+        parser.add_argument('--header', action='append', default=[],
+                            help='Extra "Name: value" header for slow clients, e.g. Authorization')
+        parser.add_argument('--trickle-bytes', type=int, default=256,
+                            help='Bytes sent/read per interval by each slow client')
+        parser.add_argument('--trickle-interval', type=float, default=0.5)
+        parser.add_argument('--probe-path', default='/health/live/')
+        parser.add_argument('--probe-interval', type=float, default=0.2)
+        parser.add_argument('--probe-timeout', type=float, default=2.0)
+    
+    def handle(self, *args, **options):
+        targets = []
+        for target in options['target']:
+            name, sep, url = target.partition('=')
+            if not sep:
+                raise CommandError(f'--target must look like name=http://host:port, got {target!r}')
+            targets.append((name, url.rstrip('/')))
+        
+        processes = []
+        try:
+            if options['spawn']:
+                targets.extend(self.spawn_servers(options['workers'], processes))
+            if not targets:
+                raise CommandError('Give at least one --target or use --spawn')
+            
+            results = [
+                (name, asyncio.run(self.run_target(url, options)))
+                for name, url in targets
+            ]
+        finally:
+            for process in processes:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        
+        self.report(results, options)
+    
+    def spawn_servers(self, workers, processes):
+        """Start one WSGI and one ASGI server with ``workers`` processes each."""
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        commands = {
+            'wsgi (gunicorn sync)': lambda port: [
+                sys.executable, '-m', 'gunicorn', 'config.wsgi:application',
+                '--workers', str(workers), '--bind', f'127.0.0.1:{port}', '--timeout', '300',
+            ],
+            'asgi (uvicorn)': lambda port: [
+                sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+                '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port),
+            ],
+        }
+        
+        targets = []
+        for name, command in commands.items():
+            port = _free_port()
+            processes.append(subprocess.Popen(
+                command(port), cwd=settings.BASE_DIR, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            ))
+            if not _wait_for_port(port):
+                raise CommandError(f'{name} did not start on port {port}')
+            targets.append((name, f'http://127.0.0.1:{port}'))
+        return targets
+    
+    async def run_target(self, base_url, options):
+        parts = urlsplit(base_url)
+        host, port = parts.hostname, parts.port or 80
+        stop = asyncio.Event()
+        connected = [0]
+        
+        clients = [
+            asyncio.create_task(self.slow_client(host, port, options, stop, connected))
+            for _ in range(options['clients'])
+        ]
+        # Let the slow clients occupy the server before probing
+        await asyncio.sleep(1)
+        
+        latencies, failures = [], 0
+        deadline = time.monotonic() + options['duration']
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self.probe(host, port, options['probe_path']), options['probe_timeout'])
+                latencies.append((time.perf_counter() - start) * 1000)
+            except (asyncio.TimeoutError, OSError, ValueError):
+                failures += 1
+            await asyncio.sleep(options['probe_interval'])
+        
+        stop.set()
+        await asyncio.gather(*clients, return_exceptions=True)
+        
+        return {
+            'connected': connected[0],
+            'probes': len(latencies) + failures,
+            'ok': len(latencies),
+            'failed': failures,
+            **percentiles(latencies),
+        }
+    
+    async def probe(self, host, port, path):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line.startswith(b'HTTP/1.') or status_line.split()[1][:1] not in (b'2', b'3'):
+                raise ValueError(status_line)
+            await reader.read()
+        finally:
+            writer.close()
+    
+    async def slow_client(self, host, port, options, stop, connected):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            return
+        connected[0] += 1
+        
+        headers = ''.join(f'{header}\r\n' for header in options['header'])
+        chunk = options['trickle_bytes']
+        try:
+            if options['mode'] == 'upload':
+                # Declare a body far larger than will ever be sent
+                writer.write((
+                    f"POST {options['path']} HTTP/1.1\r\nHost: {host}\r\n{headers}"
+                    f"Content-Type: application/x-www-form-urlencoded\r\n"
+                    f"Content-Length: {1024 * 1024 * 1024}\r\n\r\n"
+                ).encode())
+                while not stop.is_set():
+                    writer.write(b'a' * chunk)
+                    await writer.drain()
+                    await asyncio.sleep(options['trickle_interval'])
+            else:
+                writer.write(f"GET {options['path']} HTTP/1.1\r\nHost: {host}\r\n{headers}\r\n".encode())
+                await writer.drain()
+                while not stop.is_set():
+                    if not await reader.read(chunk):
+                        break
+                    await asyncio.sleep(options['trickle_interval'])
+        except OSError:
+            pass
+        finally:
+            writer.close()
+    
+    def report(self, results, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['clients']} slow {options['mode']} clients on {options['path']}, "
+            f"probing {options['probe_path']} for {options['duration']:.0f}s"
+        ))
+        self.stdout.write(
+            f"{'target':<24} {'conn':>5} {'probes':>7} {'ok':>5} {'failed':>7} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for name, result in results:
+            line = (
+                f"{name:<24} {result['connected']:>5} {result['probes']:>7} {result['ok']:>5} "
+                f"{result['failed']:>7} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result['failed'] else line)
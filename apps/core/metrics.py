@@ -0,0 +1,256 @@
+"""
+Minimal in-process metrics registry with Prometheus text exposition.
+
+Values are kept per process; each worker exposes its own series, which is
+what the Prometheus scraper expects when it is pointed at every worker.
+"""
+
+import functools
+import heapq
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+_current_request = ContextVar('auralink_request_stats', default=None)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing counter."""
+    
+    kind = 'counter'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] += amount
+    
+    def render(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in items
+        ]
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds (seconds by convention)."""
+    
+    kind = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = {}
+        self._sums = defaultdict(float)
+        self._lock = threading.Lock()
+    
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-1] += 1
+            self._sums[key] += value
+    
+    def render(self):
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        
+        lines = []
+        for key, counts, total in items:
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _format_labels(self.labelnames, key, ('le', '+Inf'))
+            lines.append(f'{self.name}_bucket{labels} {counts[-1]}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {counts[-1]}')
+        return lines
+
+
+def _get_or_create(cls, name, *args, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, *args, **kwargs)
+        return metric
+
+
+def counter(name, documentation, labelnames=()):
+    """Return the registered counter ``name``, creating it on first use."""
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """Return the registered histogram ``name``, creating it on first use."""
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+
+def render_metrics():
+    """Render every registered metric in the Prometheus text format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class RequestStats:
+    """Per-request counters collected by PerformanceMiddleware."""
+    
+    def __init__(self, top_sql=5):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.top_sql = top_sql
+        self._slowest = []
+    
+    def record_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.query_count += 1
+            self.db_seconds += elapsed
+            if self.top_sql:
+                entry = (elapsed, self.query_count, sql)
+                if len(self._slowest) < self.top_sql:
+                    heapq.heappush(self._slowest, entry)
+                else:
+                    heapq.heappushpop(self._slowest, entry)
+    
+    @property
+    def slowest_queries(self):
+        """Slowest queries of the request as (seconds, sql), slowest first."""
+        return [(elapsed, sql) for elapsed, _, sql in sorted(self._slowest, reverse=True)]
+
+
+def start_request(stats):
+    """Make ``stats`` the current request's collector; returns a reset token."""
+    return _current_request.set(stats)
+
+
+def end_request(token):
+    _current_request.reset(token)
+
+
+def record_current_query(execute, sql, params, many, context):
+    """
+    Execute wrapper reporting to the current request's stats, if any.
+    
+    Installed on every connection rather than per request: under ASGI the
+    ORM runs on worker threads with their own connections, but the
+    request's context (and so its stats) is carried over to them.
+    """
+    stats = _current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats.record_query(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``record_current_query``."""
+    if record_current_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_current_query)
+
+
+def record_cache_access(hit):
+    """Count a cache hit or miss against the current request, if tracked."""
+    stats = _current_request.get()
+    if stats is None:
+        return
+    if hit:
+        stats.cache_hits += 1
+    else:
+        stats.cache_misses += 1
+
+
+_MISSING = object()
+
+
+def _recording_get(get):
+    @functools.wraps(get)
+    def wrapper(self, key, default=None, *args, **kwargs):
+        value = get(self, key, _MISSING, *args, **kwargs)
+        record_cache_access(value is not _MISSING)
+        return default if value is _MISSING else value
+    wrapper._records_cache_access = True
+    return wrapper
+
+
+def _recording_get_many(get_many):
+    @functools.wraps(get_many)
+    def wrapper(self, keys, *args, **kwargs):
+        keys = list(keys)
+        found = get_many(self, keys, *args, **kwargs)
+        stats = _current_request.get()
+        if stats is not None:
+            stats.cache_hits += len(found)
+            stats.cache_misses += len(keys) - len(found)
+        return found
+    wrapper._records_cache_access = True
+    return wrapper
+
+
+def install_cache_recorder():
+    """
+    Count hits and misses of every configured cache against the current request.
+    
+    Django has no hook for cache calls like ``execute_wrappers``, so the
+    backend classes' ``get`` (which ``get_or_set`` goes through) and their
+    own ``get_many`` are wrapped once at startup.
+    """
+    from django.conf import settings
+    from django.core.cache.backends.base import BaseCache
+    from django.utils.module_loading import import_string
+    
+    for options in settings.CACHES.values():
+        backend = import_string(options['BACKEND'])
+        if not getattr(backend.get, '_records_cache_access', False):
+            backend.get = _recording_get(backend.get)
+        # The base get_many calls get() per key, which already counts
+        if backend.get_many is not BaseCache.get_many and not getattr(backend.get_many, '_records_cache_access', False):
+            backend.get_many = _recording_get_many(backend.get_many)
@@ -0,0 +1,138 @@
+"""
+Request performance instrumentation middleware.
+"""
+
+import logging
+import random
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from apps.core import metrics
+
+logger = logging.getLogger(__name__)
+
+request_duration = metrics.histogram(
+    'auralink_request_duration_seconds',
+    'Wall time spent handling a request',
+    labelnames=('view', 'method', 'status'),
+)
+request_db_seconds = metrics.histogram(
+    'auralink_request_db_seconds',
+    'Total database time per request',
+    labelnames=('view',),
+)
+request_db_queries = metrics.histogram(
+    'auralink_request_db_queries',
+    'Number of database queries per request',
+    labelnames=('view',),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+cache_requests = metrics.counter(
+    'auralink_cache_requests_total',
+    'Cache lookups made while handling requests',
+    labelnames=('view', 'result'),
+)
+
+
+def _options():
+    """Return the PERFORMANCE_MONITORING settings merged with defaults."""
+    options = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 1.0,
+        'SERVER_TIMING': False,
+        'SLOW_REQUEST_MS': 1000,
+        'SLOW_REQUEST_TOP_SQL': 5,
+    }
+    options.update(getattr(settings, 'PERFORMANCE_MONITORING', {}))
+    return options
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, DB query count/time and cache hits per view.
+    
+    Results go to the Prometheus histograms served on /metrics, optionally to
+    a Server-Timing response header, and to the slow-request log together
+    with the slowest SQL statements of the request. Works under both WSGI
+    and ASGI.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.options = _options()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def _sampled(self):
+        options = self.options
+        return options['ENABLED'] and random.random() < options['SAMPLE_RATE']
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        
+        stats = metrics.RequestStats(top_sql=self.options['SLOW_REQUEST_TOP_SQL'])
+        token = metrics.start_request(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        
+        return self.record(request, response, stats, time.perf_counter() - start)
+    
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        
+        stats = metrics.RequestStats(top_sql=self.options['SLOW_REQUEST_TOP_SQL'])
+        token = metrics.start_request(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        
+        return self.record(request, response, stats, time.perf_counter() - start)
+    
+    def record(self, request, response, stats, elapsed):
+        """Publish the collected stats for a finished request."""
+        options = self.options
+        
+        match = request.resolver_match
+        view_name = (match.view_name or match._func_path) if match else 'unresolved'
+        
+        request_duration.observe(
+            elapsed, view=view_name, method=request.method,
+            status=f'{response.status_code // 100}xx',
+        )
+        request_db_seconds.observe(stats.db_seconds, view=view_name)
+        request_db_queries.observe(stats.query_count, view=view_name)
+        if stats.cache_hits:
+            cache_requests.inc(stats.cache_hits, view=view_name, result='hit')
+        if stats.cache_misses:
+            cache_requests.inc(stats.cache_misses, view=view_name, result='miss')
+        
+        if options['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'app;dur={elapsed * 1000:.1f}',
+                f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.query_count} queries"',
+                f'cache;desc="{stats.cache_hits} hits, {stats.cache_misses} misses"',
+            ])
+        
+        if elapsed * 1000 >= options['SLOW_REQUEST_MS']:
+            top_sql = '\n'.join(
+                f'  {seconds * 1000:.1f}ms {sql[:500]}' for seconds, sql in stats.slowest_queries
+            )
+            logger.warning(
+                f"Slow request {request.method} {request.path} ({view_name}): "
+                f"{elapsed * 1000:.0f}ms, {stats.query_count} queries, "
+                f"{stats.db_seconds * 1000:.0f}ms in DB\n{top_sql}"
+            )
+        
+        return response
@@ -0,0 +1,258 @@
+"""
+Per-user push events, delivered as server-sent events.
+
+``publish()`` appends an event to the user's Redis stream once the current
+transaction commits. ``GET /api/v1/events/`` tails that stream: every
+event carries its stream id, so a client reconnecting with
+``Last-Event-ID`` receives what it missed while disconnected, which plain
+pub/sub can't replay. Streams are capped at ``MAX_EVENTS`` entries and
+expire when idle.
+
+Without Redis the events are kept in the Django cache and connections poll
+it, which is enough for development with a single process.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from apps.core import metrics
+from apps.core.utils import redis_cache_enabled
+
+logger = logging.getLogger(__name__)
+
+EVENT_ID_PATTERN = re.compile(r'^\d+-\d+$')
+
+# SSE comment line; keeps proxies from closing an idle connection
+HEARTBEAT = ': ping\n\n'
+
+push_events_total = metrics.counter(
+    'auralink_push_events_total',
+    'Push events by type and outcome (published, failed).',
+    labelnames=('event', 'outcome'),
+)
+
+
+def _options():
+    """Return the PUSH_EVENTS settings merged with defaults."""
+    options = {
+        'CHANNEL': 'auto',
+        'KEY_PREFIX': 'push',
+        'MAX_EVENTS': 100,
+        'TTL_SECONDS': 24 * 3600,
+        'HEARTBEAT_SECONDS': 15,
+        'MAX_CONNECTION_SECONDS': 3600,
+        'RETRY_MS': 3000,
+        'POLL_SECONDS': 1,
+    }
+    options.update(getattr(settings, 'PUSH_EVENTS', {}))
+    return options
+
+
+def _id_key(event_id):
+    milliseconds, sequence = event_id.split('-')
+    return int(milliseconds), int(sequence)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class RedisStreamChannel:
+    """One capped Redis stream per user."""
+    
+    kind = 'redis'
+    
+    def __init__(self, options):
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+        self.prefix = options['KEY_PREFIX']
+        self.max_events = options['MAX_EVENTS']
+        self.ttl = options['TTL_SECONDS']
+    
+    def key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+    
+    def publish(self, user_id, event, data):
+        key = self.key(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(key, {'event': event, 'data': data}, maxlen=self.max_events, approximate=True)
+        pipe.expire(key, self.ttl)
+        return _decode(pipe.execute()[0])
+    
+    def last_id(self, user_id):
+        entries = self.redis.xrevrange(self.key(user_id), count=1)
+        return _decode(entries[0][0]) if entries else '0-0'
+    
+    def _entries(self, result):
+        entries = []
+        for _, stream_entries in result or []:
+            for event_id, fields in stream_entries:
+                fields = {_decode(name): _decode(value) for name, value in fields.items()}
+                entries.append((_decode(event_id), fields['event'], fields['data']))
+        return entries
+    
+    def read(self, user_id, after, timeout):
+        """Return events after ``after``, waiting up to ``timeout`` seconds for one."""
+        return self._entries(self.redis.xread({self.key(user_id): after}, block=int(timeout * 1000)))
+    
+    async def aread(self, client, user_id, after, timeout):
+        return self._entries(await client.xread({self.key(user_id): after}, block=int(timeout * 1000)))
+    
+    def async_client(self):
+        """A connection of its own for one SSE response (XREAD blocks it)."""
+        import redis.asyncio
+        location = settings.CACHES['default']['LOCATION']
+        return redis.asyncio.from_url(location[0] if isinstance(location, (list, tuple)) else location)
+
+
+class CacheChannel:
+    """Fallback for deployments without Redis: a capped list per user, polled."""
+    
+    kind = 'cache'
+    
+    def __init__(self, options):
+        self.prefix = options['KEY_PREFIX']
+        self.max_events = options['MAX_EVENTS']
+        self.ttl = options['TTL_SECONDS']
+        self.poll_seconds = options['POLL_SECONDS']
+        self._lock = threading.Lock()
+    
+    def key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+    
+    def publish(self, user_id, event, data):
+        key = self.key(user_id)
+        with self._lock:
+            entries = cache.get(key) or []
+            milliseconds = int(time.time() * 1000)
+            sequence = 0
+            if entries:
+                last_ms, last_seq = _id_key(entries[-1][0])
+                if last_ms >= milliseconds:
+                    milliseconds, sequence = last_ms, last_seq + 1
+            event_id = f'{milliseconds}-{sequence}'
+            entries = (entries + [(event_id, event, data)])[-self.max_events:]
+            cache.set(key, entries, self.ttl)
+        return event_id
+    
+    def last_id(self, user_id):
+        entries = cache.get(self.key(user_id)) or []
+        return entries[-1][0] if entries else '0-0'
+    
+    def _after(self, user_id, after):
+        after = _id_key(after)
+        return [entry for entry in cache.get(self.key(user_id)) or [] if _id_key(entry[0]) > after]
+    
+    def read(self, user_id, after, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            entries = self._after(user_id, after)
+            if entries or time.monotonic() >= deadline:
+                return entries
+            time.sleep(self.poll_seconds)
+    
+    async def aread(self, client, user_id, after, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            entries = await sync_to_async(self._after)(user_id, after)
+            if entries or time.monotonic() >= deadline:
+                return entries
+            await asyncio.sleep(self.poll_seconds)
+    
+    def async_client(self):
+        return None
+
+
+_channel = None
+_channel_lock = threading.Lock()
+
+
+def get_channel():
+    """Return this process's push channel."""
+    global _channel
+    if _channel is None:
+        with _channel_lock:
+            if _channel is None:
+                options = _options()
+                kind = options['CHANNEL']
+                if kind == 'auto':
+                    kind = 'redis' if redis_cache_enabled() else 'cache'
+                _channel = (RedisStreamChannel if kind == 'redis' else CacheChannel)(options)
+    return _channel
+
+
+def _send(user_id, event, data):
+    try:
+        get_channel().publish(str(user_id), event, data)
+    except Exception as e:
+        # Push is best effort: clients also pick changes up from the changefeed
+        push_events_total.inc(event=event, outcome='failed')
+        logger.warning(f"Failed to push {event} to user {user_id}: {e}")
+        return
+    push_events_total.inc(event=event, outcome='published')
+
+
+def publish(user_id, event, data=None):
+    """Push ``event`` with JSON-serializable ``data`` to ``user_id`` once the transaction commits."""
+    payload = json.dumps(data or {}, cls=DjangoJSONEncoder)
+    transaction.on_commit(lambda: _send(user_id, event, payload))
+
+
+def format_event(event_id, event, data):
+    return f'id: {event_id}\nevent: {event}\ndata: {data}\n\n'
+
+
+def start_id(channel, user_id, last_event_id):
+    """Where a new connection starts: after ``Last-Event-ID``, else after the newest event."""
+    if last_event_id and EVENT_ID_PATTERN.match(last_event_id):
+        return last_event_id
+    return channel.last_id(user_id)
+
+
+def iter_events(channel, user_id, after):
+    """
+    Yield SSE frames for ``user_id`` (WSGI; holds a worker for the connection).
+    
+    A heartbeat comment is sent whenever no event arrived for
+    ``HEARTBEAT_SECONDS``; the stream ends after ``MAX_CONNECTION_SECONDS``
+    and the client reconnects with ``Last-Event-ID``.
+    """
+    options = _options()
+    deadline = time.monotonic() + options['MAX_CONNECTION_SECONDS']
+    yield f"retry: {options['RETRY_MS']}\n\n"
+    
+    while time.monotonic() < deadline:
+        entries = channel.read(user_id, after, options['HEARTBEAT_SECONDS'])
+        if not entries:
+            yield HEARTBEAT
+        for event_id, event, data in entries:
+            after = event_id
+            yield format_event(event_id, event, data)
+
+
+async def aiter_events(channel, user_id, after):
+    """Asynchronous counterpart of ``iter_events`` for ASGI."""
+    options = _options()
+    deadline = time.monotonic() + options['MAX_CONNECTION_SECONDS']
+    client = channel.async_client()
+    try:
+        yield f"retry: {options['RETRY_MS']}\n\n"
+        
+        while time.monotonic() < deadline:
+            entries = await channel.aread(client, user_id, after, options['HEARTBEAT_SECONDS'])
+            if not entries:
+                yield HEARTBEAT
+            for event_id, event, data in entries:
+                after = event_id
+                yield format_event(event_id, event, data)
+    finally:
+        if client is not None:
+            await client.aclose()
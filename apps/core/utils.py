@@ -2,22 +2,44 @@
 Shared utility functions.
 """
 
-import magic
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 
 
+def redis_cache_enabled(alias='default'):
+    """Return True if the cache ``alias`` is Redis, so raw Redis commands can be used."""
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    return backend.startswith('django_redis')
+
+
 def get_client_ip(request):
-    """Extract client IP address from request."""
-    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
+    """
+    Extract client IP address from request.
+    
+    X-Forwarded-For is read from the right, through the entries appended by
+    TRUSTED_PROXIES; the first other address is the client. Entries left of
+    it were sent by the client and could be anything.
+    """
+    ip = request.META.get('REMOTE_ADDR')
+    if ip not in settings.TRUSTED_PROXIES:
+        return ip
+    
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    for hop in reversed(x_forwarded_for.split(',')):
+        hop = hop.strip()
+        if not hop:
+            continue
+        ip = hop
+        if hop not in settings.TRUSTED_PROXIES:
+            break
     return ip
 
 
 def validate_file_type(file: UploadedFile, allowed_types: list):
     """Validate file type using magic numbers."""
+    # Imported on first use to keep worker startup light
+    import magic
+    
     try:
         file_type = magic.from_buffer(file.read(2048), mime=True)
         file.seek(0)  # Reset file pointer
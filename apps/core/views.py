@@ -2,45 +2,99 @@
 Core views for health checks and error pages.
 """
 
-from django.http import JsonResponse
+import hmac
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, HttpResponse, HttpResponseNotFound, StreamingHttpResponse
 from django.shortcuts import render
-from django.db import connection
-from django.core.cache import cache
-import redis as redis_client
-
-
-def health_check(request):
-    """Health check endpoint."""
-    
-    status = {
-        'status': 'healthy',
-        'database': 'unknown',
-        'redis': 'unknown',
-        'celery': 'unknown',
-        'storage': 'unknown',
-    }
-    
-    # Check database
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        status['database'] = 'connected'
-    except Exception:
-        status['status'] = 'unhealthy'
-        status['database'] = 'disconnected'
-    
-    # Check Redis
-    try:
-        cache.set('health_check', 'ok', 10)
-        if cache.get('health_check') == 'ok':
-            status['redis'] = 'connected'
-    except Exception:
+from apps.core.health import PROBES, run_probes, readiness_probes
+from apps.core.push import aiter_events, get_channel, iter_events, start_id
+from apps.core.utils import get_client_ip
+from apps.videos.async_views import get_request_user
+
+
+async def health_check(request):
+    """Full health report of the database, Redis, Celery and storage."""
+    
+    # Probes block on their own pool; keep the event loop free meanwhile
+    results = await sync_to_async(run_probes, thread_sensitive=False)(PROBES.keys())
+    
+    status = {'status': 'healthy'}
+    for name, (state, details) in results.items():
+        status[name] = state
+    status['details'] = {name: details for name, (state, details) in results.items()}
+    
+    if any(results[name][0] != 'connected' for name in readiness_probes()):
         status['status'] = 'unhealthy'
-        status['redis'] = 'disconnected'
+    elif any(state != 'connected' for state, details in results.values()):
+        status['status'] = 'degraded'
     
     return JsonResponse(status)
 
 
+async def liveness_check(request):
+    """Liveness probe: the process is up and serving requests."""
+    return JsonResponse({'status': 'alive'})
+
+
+async def readiness_check(request):
+    """Readiness probe: returns 503 while a required dependency is down."""
+    results = await sync_to_async(run_probes, thread_sensitive=False)(readiness_probes())
+    ready = all(state == 'connected' for state, details in results.values())
+    
+    return JsonResponse({
+        'status': 'ready' if ready else 'unavailable',
+        **{name: state for name, (state, details) in results.items()},
+    }, status=200 if ready else 503)
+
+
+async def event_stream(request):
+    """
+    Server-sent events for the caller (JWT or session).
+    
+    Reconnecting clients send ``Last-Event-ID`` (or ``?last_event_id=``
+    where the client can't set headers) to receive what they missed.
+    """
+    user = await get_request_user(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+    
+    channel = get_channel()
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    after = await sync_to_async(start_id)(channel, str(user.id), last_event_id)
+    
+    if isinstance(request, ASGIRequest):
+        content = aiter_events(channel, str(user.id), after)
+    else:
+        content = iter_events(channel, str(user.id), after)
+    
+    response = StreamingHttpResponse(content, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint.
+    
+    With METRICS_TOKEN set, scrapers must send it as a bearer token;
+    otherwise only the client addresses in METRICS_ALLOWED_IPS get in.
+    """
+    if settings.METRICS_TOKEN:
+        authorization = request.META.get('HTTP_AUTHORIZATION', '')
+        allowed = hmac.compare_digest(authorization.encode(), f'Bearer {settings.METRICS_TOKEN}'.encode())
+    else:
+        allowed = get_client_ip(request) in settings.METRICS_ALLOWED_IPS
+    if not allowed:
+        return HttpResponseNotFound()
+    
+    from apps.core.metrics import render_metrics
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def custom_403(request, exception=None):
     """Custom 403 error page."""
     return render(request, 'errors/403.html', status=403)
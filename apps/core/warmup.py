@@ -0,0 +1,32 @@
+"""
+Optional pre-fork warm-up of lazily imported dependencies.
+
+Heavy optional libraries (ffmpeg, libmagic, boto3) are imported on first use
+so that workers start quickly. When the master process loads the app before
+forking (gunicorn ``--preload``, Celery prefork), importing them once up
+front instead lets every child share the loaded modules copy-on-write.
+"""
+
+import importlib
+import logging
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Modules deferred to first use elsewhere in the code base
+HEAVY_MODULES = [
+    'ffmpeg',
+    'magic',
+    'storages.backends.s3boto3',
+]
+
+
+def warm_up():
+    """Import the URLconf and heavy optional modules ahead of forking."""
+    importlib.import_module(settings.ROOT_URLCONF)
+    
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logger.info(f"Warm-up skipped {name}: {e}")
@@ -0,0 +1,326 @@
+"""
+Bulk moderation of videos, users and deletion requests.
+
+An action is applied to a selection (explicit ids or a whitelisted filter)
+chunk by chunk: each chunk locks the rows it will change, flips them with
+one UPDATE and writes its audit entries with one ``bulk_create``. Small
+selections run inline; larger ones become a BulkActionJob processed by a
+Celery task that records its progress after every chunk.
+"""
+
+import logging
+import time
+import uuid
+from functools import partial
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from apps.accounts.cache import invalidate_cached_users
+from apps.accounts.models import User
+from apps.core.push import publish
+from apps.audit.models import AdminActionLog, BulkActionJob
+from apps.videos.changefeed import record_changes
+from apps.videos.deletion_requests import VideoDeletionRequest
+from apps.videos.models import Video
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+class BulkActionError(Exception):
+    """A bulk action request was invalid."""
+    pass
+
+
+def moderation_options():
+    """Return the BULK_MODERATION settings merged with defaults."""
+    options = {
+        'CHUNK_SIZE': 1000,
+        'SYNC_LIMIT': 1000,
+        'TASK_SECONDS': 60,
+    }
+    options.update(getattr(settings, 'BULK_MODERATION', {}))
+    return options
+
+
+def _flag(value):
+    return str(value).lower() in TRUE_VALUES
+
+
+# Filters mirror the search boxes of the admin listings
+FILTERS = {
+    'videos': {
+        'q': lambda value: models.Q(title__icontains=value) | models.Q(owner__email__icontains=value),
+        'owner': lambda value: models.Q(owner_id=value),
+        'storage_type': lambda value: models.Q(storage_type=value),
+        'is_active': lambda value: models.Q(is_active=_flag(value)),
+    },
+    'users': {
+        'q': lambda value: models.Q(email__icontains=value) | models.Q(username__icontains=value),
+        'plan': lambda value: models.Q(plan__name__iexact=value),
+        'is_active': lambda value: models.Q(is_active=_flag(value)),
+    },
+    'deletion_requests': {
+        'status': lambda value: models.Q() if value == 'ALL' else models.Q(status=value),
+        'requester': lambda value: models.Q(requested_by_id=value),
+    },
+}
+
+MODELS = {
+    'videos': Video,
+    'users': User,
+    'deletion_requests': VideoDeletionRequest,
+}
+
+
+def select(target, ids=None, filters=None):
+    """
+    Build the queryset an action applies to.
+    
+    Exactly one of ``ids`` or ``filters`` must be given; an empty filter
+    dict selects every row of the target.
+    """
+    if target not in MODELS:
+        raise BulkActionError(f"Unknown target: {target}")
+    if (ids is None) == (filters is None):
+        raise BulkActionError("Select either a list of ids or a filter")
+    
+    queryset = MODELS[target].objects.all()
+    
+    if ids is not None:
+        try:
+            ids = [uuid.UUID(str(value)) for value in ids]
+        except ValueError:
+            raise BulkActionError("Invalid id in selection")
+        if not ids:
+            raise BulkActionError("Nothing selected")
+        return queryset.filter(pk__in=ids)
+    
+    unknown = set(filters) - set(FILTERS[target])
+    if unknown:
+        raise BulkActionError(f"Unknown filter: {', '.join(sorted(unknown))}")
+    for name, value in filters.items():
+        queryset = queryset.filter(FILTERS[target][name](value))
+    return queryset
+
+
+def _log_entries(admin, ip_address, action_type, target_model, rows):
+    """Audit entries for (target_id, description) pairs."""
+    return [
+        AdminActionLog(
+            admin=admin,
+            action_type=action_type,
+            target_model=target_model,
+            target_id=str(target_id),
+            description=description,
+            ip_address=ip_address,
+        )
+        for target_id, description in rows
+    ]
+
+
+def _set_video_status(queryset, admin, ip_address, active, notes=''):
+    status = "activated" if active else "deactivated"
+    rows = list(
+        queryset.select_for_update().exclude(is_active=active).values_list('id', 'title', 'owner_id')
+    )
+    if not rows:
+        return 0
+    
+    video_ids = [video_id for video_id, _, _ in rows]
+    # Restoring a deleted video undoes the deletion
+    Video.objects.filter(id__in=video_ids).update(is_active=active, **({'deleted_at': None} if active else {}))
+    record_changes(video_ids)
+    AdminActionLog.objects.bulk_create(_log_entries(
+        admin, ip_address,
+        "VIDEO_ACTIVATED" if active else "VIDEO_DISABLED",
+        "Video",
+        [(video_id, f'Video "{title}" {status} (bulk)') for video_id, title, _ in rows],
+    ))
+    for video_id, title, owner_id in rows:
+        publish(owner_id, 'video.enabled' if active else 'video.disabled', {'video_id': video_id, 'title': title})
+    return len(rows)
+
+
+def _set_user_status(queryset, admin, ip_address, active, notes=''):
+    status = "activated" if active else "blocked"
+    queryset = queryset.select_for_update().exclude(is_active=active)
+    if admin is not None:
+        # Admins can't block themselves
+        queryset = queryset.exclude(id=admin.id)
+    rows = list(queryset.values_list('id', 'email'))
+    if not rows:
+        return 0
+    
+    user_ids = [user_id for user_id, _ in rows]
+    User.objects.filter(id__in=user_ids).update(is_active=active)
+    AdminActionLog.objects.bulk_create(_log_entries(
+        admin, ip_address,
+        "FEATURE_TOGGLED" if active else "USER_BLOCKED",
+        "User",
+        [(user_id, f'User "{email}" {status} (bulk)') for user_id, email in rows],
+    ))
+    
+    # Queryset updates skip post_save, so drop the cached users here
+    transaction.on_commit(lambda: invalidate_cached_users(*user_ids))
+    return len(rows)
+
+
+def _resolve_deletion_requests(queryset, admin, ip_address, approve, notes=''):
+    rows = list(
+        queryset.select_for_update(of=('self',))
+        .filter(status='PENDING')
+        .values_list('id', 'video_id', 'video__title', 'requested_by__email', 'requested_by_id')
+    )
+    if not rows:
+        return 0
+    
+    VideoDeletionRequest.objects.filter(id__in=[row[0] for row in rows]).update(
+        status='APPROVED' if approve else 'REJECTED',
+        resolved_by=admin,
+        resolved_at=timezone.now(),
+        admin_notes=notes,
+    )
+    
+    if approve:
+        # Approved videos are soft-deleted, as in the single approval view
+        video_ids = [row[1] for row in rows]
+        Video.objects.filter(id__in=video_ids).update(is_active=False, deleted_at=timezone.now())
+        record_changes(video_ids)
+        action_type, verb = "DELETION_APPROVED", "Approved"
+    else:
+        action_type, verb = "DELETION_REJECTED", "Rejected"
+    
+    AdminActionLog.objects.bulk_create(_log_entries(
+        admin, ip_address, action_type, "Video",
+        [
+            (video_id, f"{verb} deletion of '{title}' requested by {email} (bulk)")
+            for _, video_id, title, email, _ in rows
+        ],
+    ))
+    
+    event = 'deletion_request.approved' if approve else 'deletion_request.rejected'
+    for request_id, video_id, title, _, requester_id in rows:
+        publish(requester_id, event, {
+            'request_id': request_id,
+            'video_id': video_id,
+            'title': title,
+            'admin_notes': notes,
+        })
+    return len(rows)
+
+
+ACTIONS = {
+    'videos': {
+        'activate': partial(_set_video_status, active=True),
+        'deactivate': partial(_set_video_status, active=False),
+    },
+    'users': {
+        'activate': partial(_set_user_status, active=True),
+        'block': partial(_set_user_status, active=False),
+    },
+    'deletion_requests': {
+        'approve': partial(_resolve_deletion_requests, approve=True),
+        'reject': partial(_resolve_deletion_requests, approve=False),
+    },
+}
+
+
+def _action(target, action):
+    try:
+        return ACTIONS[target][action]
+    except KeyError:
+        raise BulkActionError(f"Unknown action '{action}' for {target}")
+
+
+def apply_chunk(target, action, pks, admin, ip_address=None, notes=''):
+    """Apply an action to one chunk of primary keys. Returns rows changed."""
+    with transaction.atomic():
+        return _action(target, action)(
+            MODELS[target].objects.filter(pk__in=pks), admin, ip_address, notes=notes,
+        )
+
+
+def _next_chunk(queryset, cursor, size):
+    if cursor:
+        queryset = queryset.filter(pk__gt=cursor)
+    return list(queryset.order_by('pk').values_list('pk', flat=True)[:size])
+
+
+def start_bulk_action(admin, target, action, ids=None, filters=None, notes='', ip_address=None):
+    """
+    Apply ``action`` to a selection of ``target`` rows.
+    
+    Returns ``(affected, None)`` when the selection was small enough to
+    handle inline, or ``(None, job)`` when a background job was queued.
+    """
+    _action(target, action)
+    queryset = select(target, ids, filters)
+    options = moderation_options()
+    
+    total = queryset.count()
+    if total <= options['SYNC_LIMIT']:
+        affected, cursor = 0, None
+        while True:
+            pks = _next_chunk(queryset, cursor, options['CHUNK_SIZE'])
+            if not pks:
+                break
+            affected += apply_chunk(target, action, pks, admin, ip_address, notes)
+            cursor = pks[-1]
+        return affected, None
+    
+    selection = {'ids': [str(pk) for pk in ids]} if ids is not None else {'filters': filters}
+    if notes:
+        selection['notes'] = notes
+    
+    from apps.tasks.moderation_tasks import run_bulk_action
+    
+    with transaction.atomic():
+        job = BulkActionJob.objects.create(
+            admin=admin,
+            target=target,
+            action=action,
+            selection=selection,
+            ip_address=ip_address,
+            total=total,
+        )
+        transaction.on_commit(lambda: run_bulk_action.delay(str(job.id)))
+    return None, job
+
+
+def run_job(job, time_budget=None):
+    """
+    Process chunks of a job until it is done or ``time_budget`` seconds pass.
+    
+    Returns True when the job has finished.
+    """
+    options = moderation_options()
+    deadline = time.monotonic() + (time_budget or options['TASK_SECONDS'])
+    
+    if job.status == 'PENDING':
+        job.status = 'RUNNING'
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+    
+    selection = job.selection
+    queryset = select(job.target, selection.get('ids'), selection.get('filters'))
+    
+    while time.monotonic() < deadline:
+        pks = _next_chunk(queryset, job.cursor, options['CHUNK_SIZE'])
+        if not pks:
+            job.status = 'COMPLETED'
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'finished_at'])
+            logger.info(f"Bulk job {job.id} finished: {job.affected} of {job.processed} rows changed")
+            return True
+        
+        affected = apply_chunk(
+            job.target, job.action, pks, job.admin, job.ip_address, selection.get('notes', ''),
+        )
+        job.cursor = str(pks[-1])
+        job.processed += len(pks)
+        job.affected += affected
+        job.save(update_fields=['cursor', 'processed', 'affected'])
+    
+    return False
@@ -2,10 +2,12 @@ from django.urls import path
 from . import views
 from . import views_admin
 from . import views_admin_cloud
+from . import views_admin_bulk
 
 urlpatterns = [
     path('', views.admin_dashboard, name='admin_dashboard'),
     path('users/', views_admin.admin_users, name='admin_users'),
+    path('users/import/', views_admin_bulk.admin_import_users, name='admin_import_users'),
     path('users/<uuid:user_id>/toggle/', views_admin.admin_user_toggle_status, name='admin_user_toggle_status'),
     path('users/<uuid:user_id>/change-plan/', views_admin.admin_user_change_plan, name='admin_user_change_plan'),
     path('users/<uuid:user_id>/videos/', views_admin_cloud.admin_manage_user_videos, name='admin_manage_user_videos'),
@@ -15,7 +17,10 @@ urlpatterns = [
     path('videos/<uuid:video_id>/toggle/', views_admin.admin_video_toggle, name='admin_video_toggle'),
     path('videos/upload/global/', views_admin.admin_upload_video_global, name='admin_upload_video_global'),
     path('users/<uuid:user_id>/upload/', views_admin.admin_upload_video_user, name='admin_upload_video_user'),
+    path('uploads/', views_admin.admin_uploads, name='admin_uploads'),
     path('deletion-requests/', views_admin.admin_deletion_requests, name='admin_deletion_requests'),
     path('deletion-requests/<uuid:request_id>/approve/', views_admin.admin_approve_deletion, name='admin_approve_deletion'),
     path('deletion-requests/<uuid:request_id>/reject/', views_admin.admin_reject_deletion, name='admin_reject_deletion'),
+    path('bulk/jobs/<uuid:job_id>/', views_admin_bulk.admin_bulk_job_status, name='admin_bulk_job_status'),
+    path('bulk/<str:target>/', views_admin_bulk.admin_bulk_action, name='admin_bulk_action'),
 ]
\ No newline at end of file
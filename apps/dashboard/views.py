@@ -3,11 +3,18 @@ Dashboard views for web interface.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from django.contrib import messages
 from django.db import models
+from django.utils import timezone
 from apps.videos.models import Video
+from apps.videos.access import record_access
+from apps.playback.models import Playlist
+from apps.playback.playlists import PlaylistError, playable_neighbours
+from apps.playback.resume import resume_positions
 from apps.accounts.models import User
 from apps.audit.models import AdminActionLog
 from apps.plans.models import Plan
@@ -29,10 +36,9 @@ def landing_page(request):
 def user_dashboard(request):
     """User dashboard view."""
     # Show user's videos AND global videos
-    videos = Video.objects.filter(
-        models.Q(owner=request.user) | models.Q(is_global=True),
-        is_active=True
-    ).distinct().order_by('-created_at')
+    videos = Video.objects.playable().filter(
+        models.Q(owner=request.user) | models.Q(is_global=True)
+    ).select_related('owner').distinct().order_by('-created_at')
     
     context = {
         'videos': videos,
@@ -68,29 +74,50 @@ def video_player(request, video_id):
     # Allow admins to view any video
     # Users can view their own videos OR global videos
     if request.user.is_admin:
-        video = get_object_or_404(Video, id=video_id)
-        next_video = None # Admins don't have a playlist context usually
+        video = get_object_or_404(Video, id=video_id, upload_status='READY')
     else:
         # User playlist context
-        queryset = Video.objects.filter(
-            models.Q(owner=request.user) | models.Q(is_global=True),
-            is_active=True
-        ).order_by('-created_at')
+        queryset = Video.objects.playable().filter(
+            models.Q(owner=request.user) | models.Q(is_global=True)
+        ).select_related('owner').order_by('-created_at')
         
         # Get accessible video
         video = queryset.filter(id=video_id).first()
         
         if not video:
-            from django.http import Http404
             raise Http404("Video not found")
-            
+    
+    record_access(video.id, viewer=request.user.id)
+    
     import json
     
     # Prepare context
     playlist_json = []
-    next_video = None
+    playlist = None
+    previous_url = next_url = None
+    is_loop_all = request.GET.get('loop_all') == 'true'
     
-    if request.GET.get('loop_all') == 'true':
+    if request.GET.get('playlist'):
+        # Stored playlist: neighbours come from its cached order
+        try:
+            playlist = Playlist.objects.filter(owner=request.user, id=uuid.UUID(request.GET['playlist'])).first()
+        except ValueError:
+            playlist = None
+        if playlist is None:
+            raise Http404("Playlist not found")
+        try:
+            previous_video_id, next_video_id, first_video_id = playable_neighbours(playlist, video.id, request.user)
+        except PlaylistError:
+            raise Http404("Video is not in this playlist")
+        
+        if is_loop_all and next_video_id is None:
+            next_video_id = first_video_id
+        query = f"?playlist={playlist.id}{'&loop_all=true' if is_loop_all else ''}"
+        if previous_video_id:
+            previous_url = reverse('video_player', args=[previous_video_id]) + query
+        if next_video_id:
+            next_url = reverse('video_player', args=[next_video_id]) + query
+    elif is_loop_all:
         # Serialize accessible videos for JS playlist
         for v in queryset:
             playlist_json.append({
@@ -100,15 +127,15 @@ def video_player(request, video_id):
                 'format': v.format,
                 'is_admin': v.is_global or v.owner.is_admin
             })
-    else:
-        # Standard Next Video Logic for UI hint (optional)
-        next_video = queryset.filter(created_at__lt=video.created_at).first()
-
+    
     context = {
         'video': video,
-        'next_video': next_video,
-        'is_loop_all': request.GET.get('loop_all') == 'true',
-        'playlist_json': json.dumps(playlist_json)
+        'playlist': playlist,
+        'previous_url': previous_url,
+        'next_url': next_url,
+        'is_loop_all': is_loop_all,
+        'playlist_json': json.dumps(playlist_json),
+        'resume_at': json.dumps(resume_positions(request.user, [video.id]).get(str(video.id))),
     }
     return render(request, 'dashboard/video_player.html', context)
 
@@ -117,11 +144,12 @@ def video_player(request, video_id):
 @login_required
 def manage_videos(request):
     """Manage user videos."""
-    # Show user's videos AND global videos (same as dashboard)
+    # Show user's videos AND global videos (same as dashboard), plus the
+    # user's own uploads still transferring to cloud storage
     videos = Video.objects.filter(
-        models.Q(owner=request.user) | models.Q(is_global=True),
+        models.Q(owner=request.user) | models.Q(is_global=True, upload_status='READY'),
         is_active=True
-    ).distinct().order_by('-created_at')
+    ).select_related('owner').distinct().order_by('-created_at')
     
     return render(request, 'dashboard/manage_videos.html', {
         'videos': videos
@@ -144,10 +172,11 @@ def delete_video(request, video_id):
     
     if request.method == 'POST':
         video.is_active = False  # Soft delete
+        video.deleted_at = timezone.now()
         video.save()
         messages.success(request, 'Video deleted successfully.')
         return redirect('manage_videos')
-        
+    
     return redirect('manage_videos')
 
 
@@ -207,7 +236,7 @@ def request_video_deletion(request, video_id):
             
             messages.success(request, 'Deletion request submitted successfully. An admin will review it.')
             return redirect('manage_videos')
-            
+        
         except Exception as e:
             messages.error(request, f'Error submitting request: {str(e)}')
     
@@ -220,7 +249,7 @@ def upgrade_page(request):
     if request.user.plan.name == 'Premium':
         messages.info(request, "You are already a Premium member!")
         return redirect('user_dashboard')
-        
+    
     return render(request, 'dashboard/upgrade.html')
 
 
@@ -230,10 +259,10 @@ def process_payment(request):
     """Simulate payment processing."""
     if request.method != 'POST':
         return redirect('upgrade_page')
-        
+    
     if request.user.plan.name == 'Premium':
         return redirect('user_dashboard')
-        
+    
     try:
         # 1. Get Premium Plan
         premium_plan = Plan.objects.get(name='Premium')
@@ -259,7 +288,7 @@ def process_payment(request):
         
         messages.success(request, "Welcome to Premium! You now have 50GB storage and Cloud uploads.")
         return redirect('user_dashboard')
-        
+    
     except Plan.DoesNotExist:
         messages.error(request, "Premium plan configuration missing. Please contact support.")
         return redirect('user_dashboard')
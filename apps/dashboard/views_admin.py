@@ -6,36 +6,66 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from django.contrib import messages
+from django.core.paginator import Paginator
+from apps.core.pagination import keyset_paginate
+from apps.core.push import publish
 from apps.accounts.models import User
 from apps.videos.models import Video
 from apps.plans.models import Plan
 from apps.plans.models import Plan
 from apps.audit.models import AdminActionLog
-from apps.videos.storage import VideoStorage
 from apps.videos.validators import validate_video_upload
-from apps.tasks.video_tasks import process_video_metadata
+from apps.videos.uploads import save_uploaded_video, start_processing
+from apps.videos.upload_progress import in_flight_uploads
 import uuid, os
+import time
+from datetime import datetime, timezone as dt_timezone
 from django.db import transaction, models
 
+# ?sort= values for the user listing; prefix with "-" for descending
+USER_SORTS = {
+    'created': 'created_at',
+    'email': 'email',
+    'plan': 'plan__name',
+    'videos': 'video_count',
+    'storage': 'storage_used',
+}
+
+USERS_PER_PAGE = 50
+
+
 @never_cache
 @login_required
 def admin_users(request):
-    """List all users."""
+    """List all users with their plan and usage (one query per page)."""
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
+    users = User.objects.with_usage()
+    
     query = request.GET.get('q')
     if query:
-        users = User.objects.filter(
+        users = users.filter(
             models.Q(email__icontains=query) | 
             models.Q(username__icontains=query)
-        ).order_by('-created_at')
-    else:
-        users = User.objects.all().order_by('-created_at')
+        )
+    
+    sort = request.GET.get('sort', '-created')
+    if sort.lstrip('-') not in USER_SORTS:
+        sort = '-created'
+    descending = sort.startswith('-')
+    field = USER_SORTS[sort.lstrip('-')]
+    # id breaks ties so pages don't overlap
+    users = users.order_by(f"{'-' if descending else ''}{field}", 'id')
+    
+    page = Paginator(users, USERS_PER_PAGE).get_page(request.GET.get('page'))
     
     context = {
-        'users': users,
+        'users': page,
+        'page_obj': page,
+        'sort': sort,
+        'query': query or '',
         'page_title': 'User Management'
     }
     return render(request, 'dashboard/admin/users.html', context)
@@ -47,15 +77,15 @@ def admin_videos(request):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     query = request.GET.get('q')
     if query:
         videos = Video.objects.filter(
             models.Q(title__icontains=query) | 
             models.Q(owner__email__icontains=query)
-        ).order_by('-created_at')
+        ).select_related('owner').order_by('-created_at')
     else:
-        videos = Video.objects.all().order_by('-created_at')
+        videos = Video.objects.select_related('owner').order_by('-created_at')
     
     context = {
         'videos': videos,
@@ -70,10 +100,17 @@ def admin_video_toggle(request, video_id):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     video = get_object_or_404(Video, id=video_id)
     video.is_active = not video.is_active
+    if video.is_active:
+        # Restoring a deleted video undoes the deletion
+        video.deleted_at = None
     video.save()
+    publish(video.owner_id, 'video.enabled' if video.is_active else 'video.disabled', {
+        'video_id': video.id,
+        'title': video.title,
+    })
     
     status = "activated" if video.is_active else "deactivated"
     messages.success(request, f'Video "{video.title}" has been {status}.')
@@ -97,14 +134,14 @@ def admin_user_toggle_status(request, user_id):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     user = get_object_or_404(User, id=user_id)
     
     # Prevent admin from blocking themselves
     if user.id == request.user.id:
         messages.error(request, "You cannot block your own account.")
         return redirect('admin_users')
-        
+    
     user.is_active = not user.is_active
     user.save()
     
@@ -129,7 +166,7 @@ def admin_user_change_plan(request, user_id):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     if request.method == 'POST':
         user = get_object_or_404(User, id=user_id)
         plan_name = request.POST.get('plan_name')
@@ -151,12 +188,12 @@ def admin_user_change_plan(request, user_id):
                 target_id=str(user.id),
                 description=f"Changed from {old_plan_name} to {new_plan.name}"
             )
-            
+        
         except Plan.DoesNotExist:
             messages.error(request, f'Plan "{plan_name}" not found.')
         except Exception as e:
             messages.error(request, f'Error updating plan: {str(e)}')
-            
+    
     return redirect('admin_users')
 
 
@@ -167,7 +204,7 @@ def admin_upload_video_global(request):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     if request.method == 'POST':
         title = request.POST.get('title')
         video_file = request.FILES.get('video_file')
@@ -180,27 +217,20 @@ def admin_upload_video_global(request):
                 
                 filename = f"{uuid.uuid4()}.{file_ext}"
                 
-                if storage_type == 'CLOUD':
-                    file_url = VideoStorage.save_video(video_file, filename, 's3')
-                    cloud_url = file_url
-                    file_path = ''
-                else:
-                    file_path = VideoStorage.save_video(video_file, filename, 'local')
-                    cloud_url = ''
+                stored = save_uploaded_video(video_file, filename, storage_type)
                 
                 video = Video.objects.create(
                     owner=request.user,
                     title=title,
                     storage_type=storage_type,
-                    file_path=file_path,
-                    cloud_url=cloud_url,
+                    **stored,
                     file_size=video_file.size,
                     format=file_ext,
                     is_global=True,
                     uploaded_by_admin=True
                 )
                 
-                process_video_metadata.delay(str(video.id))
+                start_processing(video, filename)
                 
                 messages.success(request, 'Global video uploaded successfully.')
                 
@@ -212,10 +242,10 @@ def admin_upload_video_global(request):
                     description=f"Uploaded global video: {title}"
                 )
                 return redirect('admin_videos')
-                
+        
         except Exception as e:
             messages.error(request, f'Error uploading video: {str(e)}')
-            
+    
     return render(request, 'dashboard/admin/add_video_global.html')
 
 
@@ -226,9 +256,9 @@ def admin_upload_video_user(request, user_id):
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
-        
+    
     target_user = get_object_or_404(User, id=user_id)
-        
+    
     if request.method == 'POST':
         title = request.POST.get('title')
         video_file = request.FILES.get('video_file')
@@ -241,27 +271,20 @@ def admin_upload_video_user(request, user_id):
                 
                 filename = f"{uuid.uuid4()}.{file_ext}"
                 
-                if storage_type == 'CLOUD':
-                    file_url = VideoStorage.save_video(video_file, filename, 's3')
-                    cloud_url = file_url
-                    file_path = ''
-                else:
-                    file_path = VideoStorage.save_video(video_file, filename, 'local')
-                    cloud_url = ''
+                stored = save_uploaded_video(video_file, filename, storage_type)
                 
                 video = Video.objects.create(
                     owner=target_user,
                     title=title,
                     storage_type=storage_type,
-                    file_path=file_path,
-                    cloud_url=cloud_url,
+                    **stored,
                     file_size=video_file.size,
                     format=file_ext,
                     is_global=False,
                     uploaded_by_admin=True
                 )
                 
-                process_video_metadata.delay(str(video.id))
+                start_processing(video, filename)
                 
                 messages.success(request, f'Video uploaded for {target_user.email}.')
                 
@@ -273,17 +296,34 @@ def admin_upload_video_user(request, user_id):
                     description=f"Uploaded video for {target_user.email}: {title}"
                 )
                 return redirect('admin_users')
-                
+        
         except Exception as e:
             messages.error(request, f'Error uploading video: {str(e)}')
-            
+    
     return render(request, 'dashboard/admin/add_video_user.html', {'target_user': target_user})
 
 
+# Review queue orderings; each ends with the primary key for a total order
+DELETION_REQUEST_ORDERINGS = {
+    'newest': ('-requested_at', '-id'),
+    'oldest': ('requested_at', 'id'),
+}
+
+DELETION_REQUEST_STATUSES = ('PENDING', 'APPROVED', 'REJECTED', 'ALL')
+
+DELETION_REQUESTS_PER_PAGE = 50
+
+
 @never_cache
 @login_required
 def admin_deletion_requests(request):
-    """List all video deletion requests."""
+    """
+    Review queue of video deletion requests.
+    
+    Pages with keyset pagination over the (status, requested_at) index.
+    ``group=requester`` lists requesters with their request counts instead,
+    and ``requester=<id>`` narrows the queue to one of them for bulk triage.
+    """
     if not request.user.is_admin:
         messages.error(request, "You do not have permission to access the admin panel.")
         return redirect('user_dashboard')
@@ -291,17 +331,65 @@ def admin_deletion_requests(request):
     from apps.videos.deletion_requests import VideoDeletionRequest
     
     status_filter = request.GET.get('status', 'PENDING')
+    if status_filter not in DELETION_REQUEST_STATUSES:
+        status_filter = 'PENDING'
     
-    if status_filter == 'ALL':
-        requests = VideoDeletionRequest.objects.all()
-    else:
-        requests = VideoDeletionRequest.objects.filter(status=status_filter)
+    order = request.GET.get('order', 'newest')
+    if order not in DELETION_REQUEST_ORDERINGS:
+        order = 'newest'
+    
+    requests = VideoDeletionRequest.objects.all()
+    if status_filter != 'ALL':
+        requests = requests.filter(status=status_filter)
+    
+    # Badge counts for every status in one GROUP BY
+    status_counts = dict(
+        VideoDeletionRequest.objects.order_by()
+        .values_list('status')
+        .annotate(count=models.Count('id'))
+    )
+    status_counts['ALL'] = sum(status_counts.values())
     
     context = {
-        'deletion_requests': requests,
         'status_filter': status_filter,
+        'status_counts': status_counts,
+        'order': order,
+        'group': request.GET.get('group', ''),
         'page_title': 'Video Deletion Requests'
     }
+    
+    if context['group'] == 'requester':
+        context['requesters'] = (
+            requests.order_by()
+            .values('requested_by', 'requested_by__email', 'requested_by__username')
+            .annotate(count=models.Count('id'), oldest=models.Min('requested_at'))
+            .order_by('-count', 'oldest')[:200]
+        )
+        return render(request, 'dashboard/admin/deletion_requests.html', context)
+    
+    requester = request.GET.get('requester', '')
+    if requester:
+        try:
+            requests = requests.filter(requested_by_id=uuid.UUID(requester))
+        except ValueError:
+            requester = ''
+        else:
+            context['requester'] = User.objects.filter(id=requester).first()
+    
+    cursor = request.GET.get('cursor', '')
+    page = keyset_paginate(
+        requests.select_related('video', 'requested_by', 'resolved_by'),
+        DELETION_REQUEST_ORDERINGS[order],
+        cursor=cursor,
+        per_page=DELETION_REQUESTS_PER_PAGE,
+    )
+    
+    context.update({
+        'deletion_requests': page,
+        'page': page,
+        'cursor': cursor,
+        'requester_id': requester,
+    })
     return render(request, 'dashboard/admin/deletion_requests.html', context)
 
 
@@ -336,8 +424,16 @@ def admin_approve_deletion(request, request_id):
             
             # Delete the video (soft delete)
             video.is_active = False
+            video.deleted_at = timezone.now()
             video.save()
             
+            publish(deletion_request.requested_by_id, 'deletion_request.approved', {
+                'request_id': deletion_request.id,
+                'video_id': video.id,
+                'title': video_title,
+                'admin_notes': deletion_request.admin_notes,
+            })
+            
             # Log action
             AdminActionLog.objects.create(
                 admin=request.user,
@@ -348,7 +444,7 @@ def admin_approve_deletion(request, request_id):
             )
             
             messages.success(request, f'Deletion request approved. Video "{video_title}" has been deleted.')
-            
+    
     except Exception as e:
         messages.error(request, f'Error approving deletion: {str(e)}')
     
@@ -382,6 +478,13 @@ def admin_reject_deletion(request, request_id):
             deletion_request.admin_notes = admin_notes
             deletion_request.save()
             
+            publish(deletion_request.requested_by_id, 'deletion_request.rejected', {
+                'request_id': deletion_request.id,
+                'video_id': deletion_request.video_id,
+                'title': deletion_request.video.title,
+                'admin_notes': admin_notes,
+            })
+            
             # Log action
             AdminActionLog.objects.create(
                 admin=request.user,
@@ -392,9 +495,33 @@ def admin_reject_deletion(request, request_id):
             )
             
             messages.success(request, f'Deletion request rejected.')
-            
+        
         except Exception as e:
             messages.error(request, f'Error rejecting deletion: {str(e)}')
     
     return redirect('admin_deletion_requests')
 
+
+@never_cache
+@login_required
+def admin_uploads(request):
+    """Uploads still arriving on any node, with throughput, ETA and stalls."""
+    if not request.user.is_admin:
+        messages.error(request, "You do not have permission to access the admin panel.")
+        return redirect('user_dashboard')
+    
+    uploads = in_flight_uploads()
+    emails = dict(
+        User.objects.filter(id__in={upload['user_id'] for upload in uploads}).values_list('id', 'email')
+    ) if uploads else {}
+    now = time.time()
+    for upload in uploads:
+        upload['email'] = emails.get(uuid.UUID(upload['user_id']), upload['user_id'])
+        upload['started'] = datetime.fromtimestamp(upload['started_at'], tz=dt_timezone.utc)
+        upload['idle_seconds'] = int(now - upload['updated_at'])
+    
+    context = {
+        'uploads': uploads,
+        'stalled_count': sum(upload['stalled'] for upload in uploads),
+    }
+    return render(request, 'dashboard/admin/uploads.html', context)
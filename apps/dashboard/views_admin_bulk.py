@@ -0,0 +1,188 @@
+"""
+Admin bulk moderation views.
+"""
+
+import json
+from django.shortcuts import redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import never_cache
+from django.contrib import messages
+from django.http import JsonResponse
+from django.urls import reverse
+from django.db import transaction
+from apps.accounts.bulk_import import EXISTING_MODES, detect_format, spool_import_file
+from apps.audit.models import BulkActionJob
+from apps.plans.models import Plan
+from apps.core.utils import get_client_ip
+from .moderation import BulkActionError, FILTERS, start_bulk_action
+
+LISTING_URLS = {
+    'videos': 'admin_videos',
+    'users': 'admin_users',
+    'deletion_requests': 'admin_deletion_requests',
+}
+
+
+def _job_data(job):
+    return {
+        'id': str(job.id),
+        'target': job.target,
+        'action': job.action,
+        'status': job.status,
+        'total': job.total,
+        'processed': job.processed,
+        'affected': job.affected,
+        'percent': job.percent,
+        'error': job.error,
+        'errors': job.report.get('errors', [])[:50],
+        'failed': job.report.get('failed', 0),
+    }
+
+
+def _parse_form(request, target):
+    """
+    Read a bulk selection from a form post.
+    
+    Checked rows arrive as ``ids``; with ``select_all`` the listing's
+    current search filters are used instead.
+    """
+    if request.POST.get('select_all'):
+        filters = {
+            name: request.POST[name]
+            for name in FILTERS.get(target, {})
+            if request.POST.get(name)
+        }
+        return None, filters
+    return request.POST.getlist('ids'), None
+
+
+@never_cache
+@login_required
+def admin_bulk_action(request, target):
+    """
+    Apply a moderation action to many videos, users or deletion requests.
+    
+    Accepts a form post from the admin listings, or a JSON body
+    ``{"action", "ids" | "filters", "notes"}`` answered with JSON.
+    """
+    wants_json = request.content_type == 'application/json'
+    
+    if not request.user.is_admin:
+        if wants_json:
+            return JsonResponse({'error': 'Admin access required'}, status=403)
+        messages.error(request, "You do not have permission to access the admin panel.")
+        return redirect('user_dashboard')
+    
+    listing = LISTING_URLS.get(target, 'admin_dashboard')
+    if request.method != 'POST':
+        return redirect(listing)
+    
+    try:
+        if wants_json:
+            try:
+                payload = json.loads(request.body or b'{}')
+            except ValueError:
+                raise BulkActionError("Invalid JSON body")
+            action = payload.get('action', '')
+            ids, filters = payload.get('ids'), payload.get('filters')
+            notes = payload.get('notes', '')
+        else:
+            action = request.POST.get('action', '')
+            ids, filters = _parse_form(request, target)
+            notes = request.POST.get('admin_notes', '')
+        
+        affected, job = start_bulk_action(
+            request.user, target, action,
+            ids=ids, filters=filters, notes=notes,
+            ip_address=get_client_ip(request),
+        )
+    except BulkActionError as e:
+        if wants_json:
+            return JsonResponse({'error': str(e)}, status=400)
+        messages.error(request, str(e))
+        return redirect(listing)
+    
+    if wants_json:
+        if job is not None:
+            return JsonResponse({
+                'job': _job_data(job),
+                'status_url': reverse('admin_bulk_job_status', args=[job.id]),
+            }, status=202)
+        return JsonResponse({'affected': affected})
+    
+    if job is not None:
+        messages.info(request, f'Bulk {action} of {job.total} {target.replace("_", " ")} is running in the background.')
+        return redirect(f"{reverse(listing)}?job={job.id}")
+    
+    messages.success(request, f'Bulk {action}: {affected} {target.replace("_", " ")} updated.')
+    return redirect(listing)
+
+
+@never_cache
+@login_required
+def admin_bulk_job_status(request, job_id):
+    """Progress of a background bulk action job."""
+    if not request.user.is_admin:
+        return JsonResponse({'error': 'Admin access required'}, status=403)
+    
+    job = get_object_or_404(BulkActionJob, id=job_id)
+    return JsonResponse(_job_data(job))
+
+
+@never_cache
+@login_required
+def admin_import_users(request):
+    """Queue a CSV/JSONL user import; progress is shown on the users page."""
+    if not request.user.is_admin:
+        messages.error(request, "You do not have permission to access the admin panel.")
+        return redirect('user_dashboard')
+    
+    if request.method != 'POST':
+        return redirect('admin_users')
+    
+    upload = request.FILES.get('import_file')
+    plan_name = request.POST.get('plan') or None
+    existing = request.POST.get('existing', 'skip')
+    
+    if upload is None:
+        messages.error(request, 'Choose a CSV or JSONL file to import.')
+        return redirect('admin_users')
+    if existing not in EXISTING_MODES:
+        messages.error(request, f'Unknown mode for existing users: {existing}')
+        return redirect('admin_users')
+    if plan_name and not Plan.objects.filter(name__iexact=plan_name).exists():
+        messages.error(request, f'Plan "{plan_name}" not found.')
+        return redirect('admin_users')
+    
+    try:
+        days = int(request.POST['days']) if request.POST.get('days') else None
+    except ValueError:
+        messages.error(request, 'Subscription days must be a number.')
+        return redirect('admin_users')
+    
+    file_format = detect_format(upload.name)
+    path, lines = spool_import_file(upload)
+    
+    from apps.tasks.moderation_tasks import run_user_import
+    
+    with transaction.atomic():
+        job = BulkActionJob.objects.create(
+            admin=request.user,
+            target='users',
+            action='import',
+            selection={
+                'path': path,
+                'filename': upload.name,
+                'format': file_format,
+                'plan': plan_name,
+                'days': days,
+                'existing': existing,
+            },
+            ip_address=get_client_ip(request),
+            # Rough row count for the progress bar (CSV header excluded)
+            total=max(lines - 1, 0) if file_format == 'csv' else lines,
+        )
+        transaction.on_commit(lambda: run_user_import.delay(str(job.id)))
+    
+    messages.info(request, f'Importing users from {upload.name} in the background.')
+    return redirect(f"{reverse('admin_users')}?job={job.id}")
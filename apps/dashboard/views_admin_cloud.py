@@ -7,8 +7,10 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from django.contrib import messages
 from apps.accounts.models import User
+from apps.core.push import publish
 from apps.videos.models import Video
 from apps.audit.models import AdminActionLog
+from apps.videos.outbox import enqueue_video_file_deletion
 from django.db import transaction
 
 
@@ -58,7 +60,14 @@ def admin_toggle_user_video(request, user_id, video_id):
     
     # Toggle status
     video.is_active = not video.is_active
+    if video.is_active:
+        # Restoring a deleted video undoes the deletion
+        video.deleted_at = None
     video.save()
+    publish(video.owner_id, 'video.enabled' if video.is_active else 'video.disabled', {
+        'video_id': video.id,
+        'title': video.title,
+    })
     
     # Log action
     action_type = "VIDEO_ACTIVATED" if video.is_active else "VIDEO_ARCHIVED"
@@ -94,11 +103,8 @@ def admin_delete_user_video(request, user_id, video_id):
     
     try:
         with transaction.atomic():
-            # Delete from cloud storage if needed
-            if video.cloud_url:
-                # Here you would add cloud storage deletion logic
-                # For now, we'll just soft delete
-                pass
+            # Queue the file for deletion; the outbox row commits with the delete
+            enqueue_video_file_deletion(video)
             
             # Permanently delete the video record
             video.delete()
@@ -113,7 +119,7 @@ def admin_delete_user_video(request, user_id, video_id):
             )
             
             messages.success(request, f'Video "{video_title}" has been permanently deleted.')
-            
+    
     except Exception as e:
         messages.error(request, f'Error deleting video: {str(e)}')
     
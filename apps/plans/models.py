@@ -3,7 +3,6 @@ Plan model for subscription tiers.
 """
 
 from django.db import models
-from django.contrib.postgres.fields import JSONField
 
 
 class Plan(models.Model):
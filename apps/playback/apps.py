@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+class PlaybackConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.playback'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,440 @@
+"""
+Playback event ingestion.
+
+Players post batches of events. A request only validates its batch and
+appends it to a buffer: a Redis stream when the cache is Redis, so any
+worker can drain it, otherwise a per-process ring buffer. The drain task
+writes buffered events to the append-only table in large batches, with COPY
+on PostgreSQL and bulk_create elsewhere.
+
+Delivery from the Redis stream is at least once: a drainer that dies after
+writing but before acknowledging leaves its entries to be claimed again.
+"""
+
+import atexit
+import csv
+import io
+import json
+import logging
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection
+from apps.core import metrics
+from apps.core.utils import redis_cache_enabled
+from apps.videos.access import record_access
+from .models import PlaybackEvent
+from .resume import record_positions
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = {
+    'start': 'START',
+    'progress': 'PROGRESS',
+    'complete': 'COMPLETE',
+    'stall': 'STALL',
+}
+
+CLIENT_TYPES = {
+    'web': 'WEB',
+    'tv': 'TV',
+    'mobile': 'MOBILE',
+}
+
+# Buffered rows are plain lists in this column order
+COLUMNS = (
+    'occurred_at', 'received_at', 'video_id', 'user_id', 'session_id',
+    'client', 'event_type', 'position', 'stall_ms',
+)
+
+MAX_POSITION = 7 * 24 * 3600
+MAX_STALL_MS = 3600 * 1000
+
+events_total = metrics.counter(
+    'auralink_playback_events_total',
+    'Playback events by outcome',
+    labelnames=('outcome',),
+)
+
+
+class PlaybackEventError(Exception):
+    """Raised when a batch of playback events is malformed as a whole."""
+
+
+def event_options():
+    """Return the PLAYBACK_EVENTS settings merged with defaults."""
+    options = {
+        'BUFFER': 'auto',
+        'STREAM_KEY': 'playback:events',
+        'STREAM_MAX_LENGTH': 200000,
+        'CONSUMER_GROUP': 'playback-drain',
+        'CLAIM_IDLE_SECONDS': 300,
+        'MEMORY_MAX_BATCHES': 20000,
+        'FLUSH_BATCHES': 200,
+        'FLUSH_SECONDS': 10,
+        'MAX_EVENTS_PER_REQUEST': 200,
+        'MAX_EVENT_AGE_SECONDS': 7 * 24 * 3600,
+        'MAX_CLOCK_SKEW_SECONDS': 300,
+        'DRAIN_BATCH': 500,
+        'DRAIN_SECONDS': 50,
+        'RETENTION_DAYS': 180,
+        'PARTITION_MONTHS_AHEAD': 2,
+    }
+    options.update(getattr(settings, 'PLAYBACK_EVENTS', {}))
+    return options
+
+
+def _number(event, name, maximum, integer=False):
+    """Return the optional numeric field ``name`` of an event, or None."""
+    value = event.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f'{name} must be a number')
+    if not 0 <= value <= maximum:
+        raise ValueError(f'{name} is out of range')
+    return int(value) if integer else float(value)
+
+
+def _parse_event(event, common, earliest, latest, received_at):
+    if not isinstance(event, dict):
+        raise ValueError('event must be an object')
+    
+    event_type = EVENT_TYPES.get(event.get('type'))
+    if event_type is None:
+        raise ValueError(f"unknown event type {event.get('type')!r}")
+    
+    try:
+        video_id = str(uuid.UUID(str(event['video'])))
+    except (KeyError, ValueError):
+        raise ValueError('video must be a video id')
+    
+    occurred_at = event.get('ts')
+    if occurred_at is None:
+        occurred_at = received_at
+    else:
+        if isinstance(occurred_at, bool) or not isinstance(occurred_at, (int, float)):
+            raise ValueError('ts must be a timestamp in milliseconds')
+        occurred_at = occurred_at / 1000
+        if not earliest <= occurred_at <= latest:
+            raise ValueError('ts is too far from the server clock')
+    
+    position = _number(event, 'position', MAX_POSITION)
+    stall_ms = _number(event, 'stall_ms', MAX_STALL_MS, integer=True) if event_type == 'STALL' else None
+    
+    return [occurred_at, received_at, video_id, *common, event_type, position, stall_ms]
+
+
+def validate_events(payload, user_id, now=None):
+    """
+    Validate a batch posted by a player.
+    
+    Returns ``(rows, rejected)``: buffer rows for the valid events and
+    ``{"index", "error"}`` for each invalid one. Raises PlaybackEventError
+    when the batch itself is unusable.
+    """
+    options = event_options()
+    
+    if not isinstance(payload, dict):
+        raise PlaybackEventError('Expected a JSON object')
+    
+    events = payload.get('events')
+    if not isinstance(events, list) or not events:
+        raise PlaybackEventError("'events' must be a non-empty list")
+    if len(events) > options['MAX_EVENTS_PER_REQUEST']:
+        raise PlaybackEventError(f"At most {options['MAX_EVENTS_PER_REQUEST']} events per request")
+    
+    session = payload.get('session')
+    if not isinstance(session, str) or not 0 < len(session) <= 64:
+        raise PlaybackEventError("'session' must be a string of at most 64 characters")
+    
+    client = CLIENT_TYPES.get(str(payload.get('client', 'web')).lower())
+    if client is None:
+        raise PlaybackEventError(f"'client' must be one of {', '.join(CLIENT_TYPES)}")
+    
+    received_at = time.time() if now is None else now
+    earliest = received_at - options['MAX_EVENT_AGE_SECONDS']
+    latest = received_at + options['MAX_CLOCK_SKEW_SECONDS']
+    common = (str(user_id) if user_id else None, session, client)
+    
+    rows, rejected = [], []
+    for index, event in enumerate(events):
+        try:
+            rows.append(_parse_event(event, common, earliest, latest, received_at))
+        except ValueError as e:
+            rejected.append({'index': index, 'error': str(e)})
+    return rows, rejected
+
+
+class MemoryBuffer:
+    """
+    Per-process ring buffer of event batches.
+    
+    When full the oldest batches are dropped, so a database outage can't
+    exhaust memory. Rows taken from it are gone even if the write fails.
+    """
+    
+    kind = 'memory'
+    
+    def __init__(self, options):
+        self.max_batches = options['MEMORY_MAX_BATCHES']
+        self.flush_batches = options['FLUSH_BATCHES']
+        self.flush_seconds = options['FLUSH_SECONDS']
+        self._batches = deque()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+    
+    def push(self, rows):
+        """Buffer one batch; return True when the caller should drain."""
+        dropped = 0
+        with self._lock:
+            self._batches.append(rows)
+            while len(self._batches) > self.max_batches:
+                dropped += len(self._batches.popleft())
+            due = (
+                len(self._batches) >= self.flush_batches
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if dropped:
+            events_total.inc(dropped, outcome='dropped')
+            logger.warning(f"Playback event buffer full; dropped {dropped} events")
+        return due
+    
+    def take(self, count):
+        """Remove up to ``count`` batches; return (token, rows) or None."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._batches:
+                return None
+            rows = []
+            for _ in range(min(count, len(self._batches))):
+                rows.extend(self._batches.popleft())
+        return None, rows
+    
+    def ack(self, token):
+        pass
+    
+    def __len__(self):
+        return len(self._batches)
+
+
+class RedisStreamBuffer:
+    """
+    Redis stream shared by every process, one entry per posted batch.
+    
+    Drainers read through a consumer group, so several can run at once, and
+    delete entries only after the rows are written.
+    """
+    
+    kind = 'redis'
+    
+    def __init__(self, options):
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+        self.key = options['STREAM_KEY']
+        self.group = options['CONSUMER_GROUP']
+        self.max_length = options['STREAM_MAX_LENGTH']
+        self.claim_idle_ms = options['CLAIM_IDLE_SECONDS'] * 1000
+        self.consumer = f'{socket.gethostname()}-{os.getpid()}'
+        self._group_ready = False
+    
+    def push(self, rows):
+        self.redis.xadd(
+            self.key,
+            {'rows': json.dumps(rows, separators=(',', ':'))},
+            maxlen=self.max_length,
+            approximate=True,
+        )
+        return False
+    
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        from redis.exceptions import ResponseError
+        try:
+            self.redis.xgroup_create(self.key, self.group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        self._group_ready = True
+    
+    def take(self, count):
+        self._ensure_group()
+        
+        # Entries left unacknowledged by a drainer that died are claimed first
+        entries = self.redis.xautoclaim(
+            self.key, self.group, self.consumer,
+            min_idle_time=self.claim_idle_ms, start_id='0-0', count=count,
+        )[1]
+        if not entries:
+            response = self.redis.xreadgroup(self.group, self.consumer, {self.key: '>'}, count=count)
+            entries = response[0][1] if response else []
+        if not entries:
+            return None
+        
+        ids, rows = [], []
+        for entry_id, fields in entries:
+            ids.append(entry_id)
+            try:
+                rows.extend(json.loads(fields[b'rows']))
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Skipping malformed playback stream entry {entry_id}")
+        return ids, rows
+    
+    def ack(self, ids):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xack(self.key, self.group, *ids)
+        pipe.xdel(self.key, *ids)
+        pipe.execute()
+    
+    def __len__(self):
+        return self.redis.xlen(self.key)
+
+
+BUFFERS = {
+    'memory': MemoryBuffer,
+    'redis': RedisStreamBuffer,
+}
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def make_buffer(kind=None):
+    """Build the buffer named by PLAYBACK_EVENTS BUFFER (or ``kind``)."""
+    options = event_options()
+    kind = kind or options['BUFFER']
+    if kind == 'auto':
+        kind = 'redis' if redis_cache_enabled() else 'memory'
+    if kind not in BUFFERS:
+        raise PlaybackEventError(f"Unknown playback event buffer: {kind}")
+    return BUFFERS[kind](options)
+
+
+def get_buffer():
+    """Return this process's shared event buffer."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = make_buffer()
+    return _buffer
+
+
+def ingest(payload, user_id, buffer=None):
+    """
+    Validate and buffer one posted batch; return ``(accepted, rejected)``.
+    
+    The viewer's resume positions are updated from the batch as well, and
+    START events count as accesses for storage tiering. A memory buffer that is full or old enough is drained by the request that
+    notices, as the Celery worker can't reach another process's memory.
+    """
+    rows, rejected = validate_events(payload, user_id)
+    if rejected:
+        events_total.inc(len(rejected), outcome='rejected')
+    if not rows:
+        return 0, rejected
+    
+    if user_id:
+        record_positions(user_id, rows)
+    for _, _, video_id, row_user_id, session_id, _, event_type, _, _ in rows:
+        if event_type == 'START':
+            record_access(video_id, viewer=row_user_id or session_id)
+    
+    buffer = buffer or get_buffer()
+    if buffer.push(rows):
+        drain(buffer=buffer, time_budget=0)
+    events_total.inc(len(rows), outcome='accepted')
+    return len(rows), rejected
+
+
+def drain(buffer=None, time_budget=None):
+    """
+    Write buffered events to the database; return the number written.
+    
+    Keeps taking ``DRAIN_BATCH`` batches at a time until the buffer is
+    empty or ``time_budget`` seconds have passed (at least one round runs).
+    """
+    options = event_options()
+    buffer = buffer or get_buffer()
+    if time_budget is None:
+        time_budget = options['DRAIN_SECONDS']
+    deadline = time.monotonic() + time_budget
+    written = 0
+    
+    while True:
+        taken = buffer.take(options['DRAIN_BATCH'])
+        if taken is None:
+            break
+        token, rows = taken
+        try:
+            write_events(rows)
+        except Exception as e:
+            # Stream entries stay pending and are claimed again later
+            logger.error(f"Failed to write {len(rows)} playback events ({buffer.kind} buffer): {e}")
+            if buffer.kind == 'memory':
+                events_total.inc(len(rows), outcome='dropped')
+            break
+        buffer.ack(token)
+        written += len(rows)
+        events_total.inc(len(rows), outcome='written')
+        if time.monotonic() >= deadline:
+            break
+    return written
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+
+
+def write_events(rows):
+    """Append buffered rows to the playback event table."""
+    if not rows:
+        return
+    if connection.vendor == 'postgresql' and _copy(rows):
+        return
+    PlaybackEvent.objects.bulk_create(
+        [
+            PlaybackEvent(**dict(zip(COLUMNS, (_timestamp(row[0]), _timestamp(row[1]), *row[2:]))))
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+def _copy(rows):
+    """Load rows with COPY; return False if the driver doesn't support it."""
+    data = io.StringIO()
+    writer = csv.writer(data)
+    for row in rows:
+        # An unquoted empty CSV field is loaded as NULL
+        writer.writerow((
+            _timestamp(row[0]).isoformat(),
+            _timestamp(row[1]).isoformat(),
+            *('' if value is None else value for value in row[2:]),
+        ))
+    data.seek(0)
+    
+    with connection.cursor() as cursor:
+        copy_expert = getattr(cursor.cursor, 'copy_expert', None)
+        if copy_expert is None:
+            return False
+        copy_expert(
+            f"COPY {PlaybackEvent._meta.db_table} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            data,
+        )
+    return True
+
+
+def _flush_at_exit():
+    if _buffer is not None and _buffer.kind == 'memory':
+        drain(buffer=_buffer)
+
+
+atexit.register(_flush_at_exit)
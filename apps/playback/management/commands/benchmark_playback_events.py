@@ -0,0 +1,115 @@
+"""
+Management command to benchmark playback event ingestion throughput.
+
+Times the full request path (auth, JSON parsing, validation, buffering),
+then the drain into the event table, against a throwaway database.
+"""
+
+import json
+import time
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.accounts.models import User
+from apps.core.benchmarks import benchmark_database, percentiles, Timer
+from apps.playback.events import BUFFERS, drain, get_buffer
+from apps.playback.models import PlaybackEvent
+from apps.playback.views import PlaybackEventView
+
+
+class Command(BaseCommand):
+    help = 'Benchmark playback event ingestion and drain throughput'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Number of posted batches')
+        parser.add_argument('--batch', type=int, default=50, help='Events per batch')
+        parser.add_argument('--buffer', choices=BUFFERS, help='Buffer to use (default: PLAYBACK_EVENTS BUFFER)')
+        parser.add_argument('--keepdb', action='store_true', help='Keep the benchmark database')
+    
+    def handle(self, *args, **options):
+        # Flushing is left to the timed drain, and a Redis buffer gets its own stream
+        playback = {
+            **getattr(settings, 'PLAYBACK_EVENTS', {}),
+            'STREAM_KEY': 'playback:events:benchmark',
+            'MEMORY_MAX_BATCHES': options['requests'],
+            'FLUSH_BATCHES': 10 ** 9,
+            'FLUSH_SECONDS': 10 ** 9,
+            'DRAIN_SECONDS': 10 ** 9,
+        }
+        if options['buffer']:
+            playback['BUFFER'] = options['buffer']
+        
+        with benchmark_database(keepdb=options['keepdb']), override_settings(PLAYBACK_EVENTS=playback):
+            user = User.objects.create(email='player@bench.example.com', username='player')
+            buffer = get_buffer()
+            try:
+                self.ingest(user, buffer, options['requests'], options['batch'])
+                self.drain(options['requests'] * options['batch'])
+            finally:
+                if buffer.kind == 'redis':
+                    buffer.redis.delete(buffer.key)
+    
+    def payload(self, video_ids, size, n):
+        now = time.time() * 1000
+        events = []
+        for i in range(size):
+            event_type = 'progress'
+            if i == 0:
+                event_type = 'start'
+            elif i == size - 1:
+                event_type = 'complete'
+            elif i % 10 == 5:
+                event_type = 'stall'
+            events.append({
+                'type': event_type,
+                'video': video_ids[(n + i) % len(video_ids)],
+                'position': i * 10.0,
+                'stall_ms': 250 if event_type == 'stall' else None,
+                'ts': now - (size - i) * 1000,
+            })
+        return json.dumps({'session': f'bench-{n}', 'client': 'tv', 'events': events})
+    
+    def ingest(self, user, buffer, requests, size):
+        """Post ``requests`` batches through the view, unthrottled."""
+        factory = APIRequestFactory()
+        view = PlaybackEventView.as_view(throttle_classes=())
+        video_ids = [str(uuid.uuid4()) for _ in range(100)]
+        bodies = [self.payload(video_ids, size, n) for n in range(requests)]
+        
+        samples = []
+        started = time.perf_counter()
+        for body in bodies:
+            request = factory.post('/api/v1/playback/events/', body, content_type='application/json')
+            force_authenticate(request, user=user)
+            with Timer() as timer:
+                response = view(request)
+            if response.status_code != 202:
+                self.stderr.write(self.style.ERROR(f'Request failed: {response.status_code} {response.data}'))
+                return
+            samples.append(timer.ms)
+        elapsed = time.perf_counter() - started
+        
+        stats = percentiles(samples)
+        self.stdout.write(
+            f'Ingest ({buffer.kind} buffer): {requests} requests x {size} events in {elapsed:.2f}s: '
+            f'{requests / elapsed:,.0f} req/s, {requests * size / elapsed:,.0f} events/s '
+            f"(per request p50 {stats['p50']:.2f}ms p95 {stats['p95']:.2f}ms p99 {stats['p99']:.2f}ms)"
+        )
+    
+    def drain(self, expected):
+        """Write everything buffered and check it all arrived."""
+        method = 'COPY' if connection.vendor == 'postgresql' else 'bulk_create'
+        with Timer() as timer:
+            written = drain()
+        seconds = timer.ms / 1000
+        
+        self.stdout.write(
+            f'Drain ({method}): {written} events in {seconds:.2f}s: {written / seconds:,.0f} events/s'
+        )
+        
+        stored = PlaybackEvent.objects.count()
+        style = self.style.SUCCESS if stored == expected else self.style.ERROR
+        self.stdout.write(style(f'{stored} of {expected} events stored'))
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:53
+
+from django.db import migrations, models
+
+
+# The table Django creates can't be converted in place, so on PostgreSQL it
+# is recreated as a partitioned table with the same columns and index. The
+# primary key has to include the partition key.
+PARTITIONED_TABLE = [
+    'DROP TABLE playback_events',
+    """
+    CREATE TABLE playback_events (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        occurred_at timestamp with time zone NOT NULL,
+        received_at timestamp with time zone NOT NULL,
+        video_id uuid NOT NULL,
+        user_id uuid NULL,
+        session_id varchar(64) NOT NULL,
+        client varchar(10) NOT NULL,
+        event_type varchar(10) NOT NULL,
+        position double precision NULL,
+        stall_ms integer NULL,
+        PRIMARY KEY (id, occurred_at)
+    ) PARTITION BY RANGE (occurred_at)
+    """,
+    'CREATE INDEX playback_video_time_idx ON playback_events (video_id, occurred_at)',
+    'CREATE TABLE playback_events_default PARTITION OF playback_events DEFAULT',
+]
+
+
+def partition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in PARTITIONED_TABLE:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaybackEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('occurred_at', models.DateTimeField()),
+                ('received_at', models.DateTimeField()),
+                ('video_id', models.UUIDField()),
+                ('user_id', models.UUIDField(null=True)),
+                ('session_id', models.CharField(max_length=64)),
+                ('client', models.CharField(choices=[('WEB', 'Web'), ('TV', 'TV'), ('MOBILE', 'Mobile')], max_length=10)),
+                ('event_type', models.CharField(choices=[('START', 'Start'), ('PROGRESS', 'Progress'), ('COMPLETE', 'Complete'), ('STALL', 'Stall')], max_length=10)),
+                ('position', models.FloatField(null=True)),
+                ('stall_ms', models.IntegerField(null=True)),
+            ],
+            options={
+                'db_table': 'playback_events',
+                'indexes': [models.Index(fields=['video_id', 'occurred_at'], name='playback_video_time_idx')],
+            },
+        ),
+        # Monthly partitions are created by the maintain_playback_partitions task
+        migrations.RunPython(partition_table, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0008_directupload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('playback', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.FloatField()),
+                ('updated_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='watch_progress', to=settings.AUTH_USER_MODEL)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='watch_progress', to='videos.video')),
+            ],
+            options={
+                'db_table': 'watch_progress',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='watchprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'video'), name='unique_watch_progress'),
+        ),
+    ]
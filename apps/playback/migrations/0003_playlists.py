@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0008_directupload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('playback', '0002_watchprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Playlist',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playlists', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'playlists',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlaylistItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('position', models.FloatField()),
+                ('added_at', models.DateTimeField(auto_now_add=True)),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='playback.playlist')),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playlist_items', to='videos.video')),
+            ],
+            options={
+                'db_table': 'playlist_items',
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['playlist', 'position'], name='playlist_it_playlis_55432e_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='playlistitem',
+            constraint=models.UniqueConstraint(fields=('playlist', 'video'), name='unique_playlist_video'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['owner', '-created_at'], name='playlists_owner_i_f0f6c3_idx'),
+        ),
+    ]
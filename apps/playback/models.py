@@ -0,0 +1,146 @@
+"""
+Playback analytics, resume position and playlist models.
+"""
+
+import uuid
+from django.conf import settings
+from django.db import models
+
+
+class PlaybackEvent(models.Model):
+    """
+    One event reported by a player (append-only).
+    
+    Rows are written in bulk by the drain task and never updated. Video and
+    user are plain ids rather than foreign keys so inserts skip constraint
+    checks and events outlive the rows they describe. On PostgreSQL the
+    table is range-partitioned by month on ``occurred_at`` (see
+    ``apps.playback.partitions``).
+    """
+    
+    EVENT_TYPES = (
+        ('START', 'Start'),
+        ('PROGRESS', 'Progress'),
+        ('COMPLETE', 'Complete'),
+        ('STALL', 'Stall'),
+    )
+    
+    CLIENT_TYPES = (
+        ('WEB', 'Web'),
+        ('TV', 'TV'),
+        ('MOBILE', 'Mobile'),
+    )
+    
+    id = models.BigAutoField(primary_key=True)
+    occurred_at = models.DateTimeField()
+    received_at = models.DateTimeField()
+    video_id = models.UUIDField()
+    user_id = models.UUIDField(null=True)
+    session_id = models.CharField(max_length=64)
+    client = models.CharField(max_length=10, choices=CLIENT_TYPES)
+    event_type = models.CharField(max_length=10, choices=EVENT_TYPES)
+    position = models.FloatField(null=True)  # seconds into the video
+    stall_ms = models.IntegerField(null=True)  # rebuffering time, STALL only
+    
+    class Meta:
+        db_table = 'playback_events'
+        indexes = [
+            models.Index(fields=['video_id', 'occurred_at'], name='playback_video_time_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} {self.video_id} @ {self.position}"
+
+
+class WatchProgress(models.Model):
+    """
+    Where a user last was in a video.
+    
+    A write-behind copy of the hot store in ``apps.playback.resume``; rows
+    are upserted in batches, never on each heartbeat.
+    """
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='watch_progress'
+    )
+    video = models.ForeignKey(
+        'videos.Video',
+        on_delete=models.CASCADE,
+        related_name='watch_progress'
+    )
+    position = models.FloatField()  # seconds; 0 once the video was watched to the end
+    updated_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'watch_progress'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'video'], name='unique_watch_progress'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} @ {self.position}s in {self.video_id}"
+
+
+class Playlist(models.Model):
+    """A user's ordered list of videos."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='playlists'
+    )
+    title = models.CharField(max_length=255)
+    # Bumped by every change to the items; keys the cached order
+    version = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'playlists'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} ({self.owner_id})"
+
+
+class PlaylistItem(models.Model):
+    """
+    A video's place in a playlist.
+    
+    ``position`` is a fractional sort key: an item inserted or moved
+    between two others takes the midpoint of their positions, so a reorder
+    writes a single row.
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    playlist = models.ForeignKey(
+        Playlist,
+        on_delete=models.CASCADE,
+        related_name='items'
+    )
+    video = models.ForeignKey(
+        'videos.Video',
+        on_delete=models.CASCADE,
+        related_name='playlist_items'
+    )
+    position = models.FloatField()
+    added_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'playlist_items'
+        ordering = ['position']
+        constraints = [
+            models.UniqueConstraint(fields=['playlist', 'video'], name='unique_playlist_video'),
+        ]
+        indexes = [
+            models.Index(fields=['playlist', 'position']),
+        ]
+    
+    def __str__(self):
+        return f"{self.video_id} @ {self.position} in {self.playlist_id}"
@@ -0,0 +1,137 @@
+"""
+Monthly partitions of the playback event table.
+
+On PostgreSQL ``playback_events`` is range-partitioned on ``occurred_at``,
+one partition per month plus a DEFAULT partition for rows outside them.
+Expiring old events drops whole partitions instead of running DELETEs
+that bloat the table. Other databases keep a plain table and fall back to
+deleting rows.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import PlaybackEvent
+
+logger = logging.getLogger(__name__)
+
+TABLE = PlaybackEvent._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def is_partitioned():
+    return connection.vendor == 'postgresql'
+
+
+def _month(value):
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def _next_month(month):
+    return _month(month + timedelta(days=32))
+
+
+def partition_name(month):
+    return f'{TABLE}_{month:%Y%m}'
+
+
+def _month_of(name):
+    """Return the month a partition covers, or None for the default one."""
+    try:
+        return datetime.strptime(name[len(TABLE) + 1:], '%Y%m').replace(tzinfo=dt_timezone.utc)
+    except ValueError:
+        return None
+
+
+def list_partitions():
+    """Return the names of the existing partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [TABLE],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _create_partition(month):
+    """
+    Create the partition for ``month``.
+    
+    Rows the DEFAULT partition already holds for that month are moved into
+    it; PostgreSQL refuses to create the partition while they are there.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), _next_month(month).isoformat()
+    
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}')
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE occurred_at >= %s AND occurred_at < %s RETURNING *) '
+            f'INSERT INTO {name} SELECT * FROM moved',
+            [start, end],
+        )
+        moved = cursor.rowcount
+        cursor.execute(f'ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    
+    if moved:
+        logger.info(f"Moved {moved} playback events from the default partition into {name}")
+    return name
+
+
+def ensure_partitions(months_ahead, lookback_days, now=None):
+    """
+    Create missing monthly partitions; return the names created.
+    
+    Covers every month a newly posted event may fall in, from
+    ``lookback_days`` ago to ``months_ahead`` months from now.
+    """
+    if not is_partitioned():
+        return []
+    
+    now = now or timezone.now()
+    existing = set(list_partitions())
+    month = _month(now - timedelta(days=lookback_days))
+    last = _month(now)
+    for _ in range(months_ahead):
+        last = _next_month(last)
+    
+    created = []
+    while month <= last:
+        if partition_name(month) not in existing:
+            created.append(_create_partition(month))
+        month = _next_month(month)
+    return created
+
+
+def purge_expired(retention_days, now=None):
+    """
+    Remove events older than ``retention_days``.
+    
+    On PostgreSQL only partitions entirely before the cutoff are dropped,
+    so up to a month beyond the retention period is kept, and the number of
+    partitions dropped is returned. Elsewhere rows are deleted and counted.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    
+    if not is_partitioned():
+        deleted, _ = PlaybackEvent.objects.filter(occurred_at__lt=cutoff).delete()
+        return deleted
+    
+    dropped = []
+    for name in list_partitions():
+        month = _month_of(name)
+        if month is not None and _next_month(month) <= cutoff:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE {name}')
+            dropped.append(name)
+            logger.info(f"Dropped expired playback event partition {name}")
+    return len(dropped)
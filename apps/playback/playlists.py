@@ -0,0 +1,249 @@
+"""
+Playlist ordering and navigation.
+
+Items are ordered by a fractional position, so adding or moving an item
+writes one row: it takes the midpoint between its new neighbours. When
+repeated inserts at the same spot exhaust the float precision, the whole
+playlist is renumbered once.
+
+The order and each item's previous/next links are computed once per
+playlist version and cached, so players step through a playlist and fetch
+windows around the current item without sorting it again.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Max, Min
+from django.utils import timezone
+from apps.videos.models import Video
+from .models import Playlist, PlaylistItem
+
+# Distance between positions after a renumber, and for appended items
+GAP = 1024.0
+
+
+class PlaylistError(Exception):
+    """Raised when a playlist change can't be applied."""
+
+
+def _options():
+    """Return the PLAYLISTS settings merged with defaults."""
+    options = {
+        'MAX_ITEMS': 5000,
+        'WINDOW_BEFORE': 5,
+        'WINDOW_AFTER': 20,
+        'MAX_WINDOW': 100,
+        'CACHE_TIMEOUT': 24 * 3600,
+    }
+    options.update(getattr(settings, 'PLAYLISTS', {}))
+    return options
+
+
+def _links(video_ids):
+    """Map each video id to (index, previous video id, next video id)."""
+    last = len(video_ids) - 1
+    return {
+        video_id: (
+            index,
+            video_ids[index - 1] if index > 0 else None,
+            video_ids[index + 1] if index < last else None,
+        )
+        for index, video_id in enumerate(video_ids)
+    }
+
+
+class Navigation:
+    """
+    The order of a playlist's videos with precomputed neighbours.
+    
+    ``links`` comes from the cache along with the order; it's only computed
+    when the order has just been read from the database.
+    """
+    
+    def __init__(self, video_ids, links=None):
+        self.video_ids = video_ids
+        self.links = _links(video_ids) if links is None else links
+    
+    def __len__(self):
+        return len(self.video_ids)
+    
+    @property
+    def first(self):
+        return self.video_ids[0] if self.video_ids else None
+    
+    def neighbours(self, video_id):
+        """Return (previous, next) video ids around ``video_id``."""
+        _, previous, following = self.links.get(str(video_id), (None, None, None))
+        return previous, following
+    
+    def window(self, video_id=None, before=None, after=None):
+        """
+        Return ``(start, index, video_ids)`` for a slice around ``video_id``.
+        
+        ``start`` is the index of the first id in the slice and ``index``
+        that of ``video_id``.
+        
+        Starts at the first video when ``video_id`` is not given; raises
+        PlaylistError if it isn't in the playlist.
+        """
+        options = _options()
+        before = options['WINDOW_BEFORE'] if before is None else before
+        after = options['WINDOW_AFTER'] if after is None else after
+        before = max(0, min(before, options['MAX_WINDOW']))
+        after = max(0, min(after, options['MAX_WINDOW']))
+        
+        if video_id is None:
+            index = 0
+        elif str(video_id) in self.links:
+            index = self.links[str(video_id)][0]
+        else:
+            raise PlaylistError('Video is not in this playlist')
+        
+        start = max(0, index - before)
+        return start, index, self.video_ids[start:index + after + 1]
+
+
+def navigation(playlist):
+    """Return the cached Navigation for the current version of ``playlist``."""
+    key = f'playlist-nav:{playlist.id}:{playlist.version}'
+    cached = cache.get(key)
+    if cached is not None:
+        video_ids, links = cached
+        return Navigation(video_ids, links)
+    
+    nav = Navigation([
+        str(video_id) for video_id in
+        playlist.items.order_by('position', 'id').values_list('video_id', flat=True)
+    ])
+    cache.set(key, (nav.video_ids, nav.links), _options()['CACHE_TIMEOUT'])
+    return nav
+
+
+def playable_videos(user, video_ids):
+    """Return the ids among ``video_ids`` that ``user`` can play right now."""
+    return {
+        str(video_id) for video_id in
+        Video.objects.visible_to(user).playable().filter(id__in=video_ids).values_list('id', flat=True)
+    }
+
+
+def playable_neighbours(playlist, video_id, user, reach=5):
+    """
+    Return (previous, next, first) video ids for a player showing ``video_id``.
+    
+    Deactivated or no longer visible videos are skipped, looking up to
+    ``reach`` items each way.
+    """
+    nav = navigation(playlist)
+    start, index, video_ids = nav.window(video_id, reach, reach)
+    playable = playable_videos(user, video_ids)
+    current = index - start
+    
+    previous = next((v for v in reversed(video_ids[:current]) if v in playable), None)
+    following = next((v for v in video_ids[current + 1:] if v in playable), None)
+    return previous, following, nav.first
+
+
+def _touch(playlist):
+    """Bump the version so readers stop using the cached order."""
+    Playlist.objects.filter(id=playlist.id).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+def _renumber(playlist):
+    items = list(playlist.items.order_by('position', 'id').only('id', 'position'))
+    for index, item in enumerate(items, 1):
+        item.position = index * GAP
+    PlaylistItem.objects.bulk_update(items, ['position'], batch_size=1000)
+
+
+def _bounds(playlist, item=None, after=None, before=None):
+    """
+    Return the positions the new place lies between (either may be None).
+    
+    ``after`` or ``before`` is a neighbouring item id; with neither the
+    place is the end of the playlist. ``item`` is left out when moving it.
+    """
+    others = playlist.items.all()
+    if item is not None:
+        others = others.exclude(id=item.id)
+    
+    if after is not None or before is not None:
+        anchor = others.filter(id=after if after is not None else before).first()
+        if anchor is None:
+            raise PlaylistError('Neighbouring item not found in this playlist')
+        if after is not None:
+            upper = others.filter(position__gt=anchor.position).aggregate(value=Min('position'))['value']
+            return anchor.position, upper
+        lower = others.filter(position__lt=anchor.position).aggregate(value=Max('position'))['value']
+        return lower, anchor.position
+    
+    return others.aggregate(value=Max('position'))['value'], None
+
+
+def _position(playlist, item=None, after=None, before=None):
+    lower, upper = _bounds(playlist, item, after, before)
+    if lower is None and upper is None:
+        return GAP
+    if upper is None:
+        return lower + GAP
+    if lower is None:
+        return upper - GAP
+    
+    middle = (lower + upper) / 2
+    if lower < middle < upper:
+        return middle
+    
+    # No float left between the neighbours: spread everything out again
+    _renumber(playlist)
+    return _position(playlist, item, after, before)
+
+
+def _lock(playlist):
+    """Lock the playlist row so concurrent edits can't pick the same position."""
+    return Playlist.objects.select_for_update().get(id=playlist.id)
+
+
+def add_item(playlist, video, after=None, before=None):
+    """Add ``video`` after/before another item, or at the end."""
+    with transaction.atomic():
+        playlist = _lock(playlist)
+        if playlist.items.filter(video=video).exists():
+            raise PlaylistError('Video is already in this playlist')
+        if playlist.items.count() >= _options()['MAX_ITEMS']:
+            raise PlaylistError(f"A playlist can hold at most {_options()['MAX_ITEMS']} videos")
+        
+        item = PlaylistItem.objects.create(
+            playlist=playlist,
+            video=video,
+            position=_position(playlist, after=after, before=before),
+        )
+        _touch(playlist)
+    return item
+
+
+def move_item(playlist, item_id, after=None, before=None):
+    """Move an item directly after or before another one."""
+    if after is None and before is None:
+        raise PlaylistError("Give 'after' or 'before'")
+    
+    with transaction.atomic():
+        playlist = _lock(playlist)
+        item = playlist.items.filter(id=item_id).first()
+        if item is None:
+            raise PlaylistError('Item not found in this playlist')
+        
+        item.position = _position(playlist, item=item, after=after, before=before)
+        item.save(update_fields=['position'])
+        _touch(playlist)
+    return item
+
+
+def remove_item(playlist, item_id):
+    """Remove an item; its neighbours become adjacent."""
+    with transaction.atomic():
+        playlist = _lock(playlist)
+        deleted, _ = playlist.items.filter(id=item_id).delete()
+        if not deleted:
+            raise PlaylistError('Item not found in this playlist')
+        _touch(playlist)
@@ -0,0 +1,351 @@
+"""
+Resume positions.
+
+Each progress heartbeat updates the viewer's position in a hot store, a
+Redis hash per user keyed by video id, and marks it dirty; a heartbeat older
+than the stored position (delayed or retried) is ignored. The flush task
+upserts dirty positions into WatchProgress in batches, so heartbeats never
+write to the database. A page of videos reads its positions with one HMGET;
+a user's hash that expired is refilled from the table on the next read.
+
+Without Redis the Django cache holds one dict per user and the dirty set
+lives in the process, flushed by the request that finds it due.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.core.utils import redis_cache_enabled
+from apps.videos.models import Video
+from .models import WatchProgress
+
+logger = logging.getLogger(__name__)
+
+# Hash field set once a user's hash has been filled from WatchProgress
+LOADED = '_loaded'
+
+# Events whose position is where the viewer is now
+POSITION_EVENTS = ('START', 'PROGRESS', 'STALL', 'COMPLETE')
+
+# Set each ``video, value`` pair in ARGV[3:] unless the stored position is
+# newer (a late or retried heartbeat batch), and mark the ones set dirty.
+# KEYS: the user's hash, the dirty set; ARGV: TTL, user id, pairs...
+RECORD_SCRIPT = """
+local recorded = 0
+for i = 3, #ARGV, 2 do
+    local current = redis.call('HGET', KEYS[1], ARGV[i])
+    if not current or tonumber(string.match(current, ':(.*)$')) <= tonumber(string.match(ARGV[i + 1], ':(.*)$')) then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+        redis.call('SADD', KEYS[2], ARGV[2] .. ':' .. ARGV[i])
+        recorded = recorded + 1
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return recorded
+"""
+
+
+def _options():
+    """Return the WATCH_PROGRESS settings merged with defaults."""
+    options = {
+        'STORE': 'auto',
+        'KEY_PREFIX': 'watch',
+        'TTL_SECONDS': 30 * 24 * 3600,
+        'LOAD_LIMIT': 2000,
+        'FLUSH_BATCH': 2000,
+        'FLUSH_SIZE': 500,
+        'FLUSH_SECONDS': 30,
+    }
+    options.update(getattr(settings, 'WATCH_PROGRESS', {}))
+    return options
+
+
+def _encode(position, timestamp):
+    return f'{position:.3f}:{timestamp:.3f}'
+
+
+def _decode(value):
+    if isinstance(value, bytes):
+        value = value.decode()
+    position, timestamp = value.split(':')
+    return float(position), float(timestamp)
+
+
+class RedisProgressStore:
+    """One hash per user plus a set of dirty ``user:video`` members."""
+    
+    kind = 'redis'
+    
+    def __init__(self, options):
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+        self.prefix = options['KEY_PREFIX']
+        self.ttl = options['TTL_SECONDS']
+        self.dirty_key = f'{self.prefix}:dirty'
+        self._record = self.redis.register_script(RECORD_SCRIPT)
+    
+    def _key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+    
+    def record(self, user_id, positions):
+        """
+        Store ``{video_id: (position, timestamp)}``; return True if a flush is due.
+        
+        Positions older than the stored ones are dropped, in one atomic script.
+        """
+        args = [self.ttl, user_id]
+        for video, value in positions.items():
+            args.extend((video, _encode(*value)))
+        self._record(keys=[self._key(user_id), self.dirty_key], args=args)
+        return False
+    
+    def fetch(self, user_id, video_ids):
+        """Return ``(loaded, {video_id: (position, timestamp)})`` in one round trip."""
+        values = self.redis.hmget(self._key(user_id), [LOADED, *video_ids])
+        found = {
+            video: _decode(value)
+            for video, value in zip(video_ids, values[1:])
+            if value is not None
+        }
+        return values[0] is not None, found
+    
+    def load(self, user_id, positions):
+        """Fill a user's hash from the table without overwriting newer positions."""
+        key = self._key(user_id)
+        pipe = self.redis.pipeline(transaction=False)
+        for video, value in positions.items():
+            pipe.hsetnx(key, video, _encode(*value))
+        pipe.hset(key, LOADED, 1)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+    
+    def take_dirty(self, count):
+        """Pop up to ``count`` dirty positions as (user_id, video_id, position, timestamp)."""
+        members = [
+            member.decode() if isinstance(member, bytes) else member
+            for member in self.redis.spop(self.dirty_key, count) or []
+        ]
+        if not members:
+            return []
+        
+        pairs = [member.split(':', 1) for member in members]
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, video in pairs:
+            pipe.hget(self._key(user_id), video)
+        
+        return [
+            (user_id, video, *_decode(value))
+            for (user_id, video), value in zip(pairs, pipe.execute())
+            if value is not None
+        ]
+    
+    def mark_dirty(self, rows):
+        if rows:
+            self.redis.sadd(self.dirty_key, *[f'{user_id}:{video}' for user_id, video, *_ in rows])
+
+
+class CacheProgressStore:
+    """
+    Fallback for deployments without Redis.
+    
+    Positions live in the Django cache, one dict per user; the dirty set is
+    per process, like the video access counts in ``apps.videos.access``.
+    """
+    
+    kind = 'cache'
+    
+    def __init__(self, options):
+        self.prefix = options['KEY_PREFIX']
+        self.ttl = options['TTL_SECONDS']
+        self.flush_size = options['FLUSH_SIZE']
+        self.flush_seconds = options['FLUSH_SECONDS']
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+    
+    def _key(self, user_id):
+        return f'{self.prefix}:{user_id}'
+    
+    def record(self, user_id, positions):
+        key = self._key(user_id)
+        with self._lock:
+            entry = cache.get(key) or {}
+            # Drop positions older than the stored ones (a late or retried batch)
+            newer = {
+                video: value for video, value in positions.items()
+                if video not in entry or entry[video][1] <= value[1]
+            }
+            entry.update(newer)
+            cache.set(key, entry, self.ttl)
+            self._dirty.update((str(user_id), video) for video in newer)
+            return (
+                len(self._dirty) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+    
+    def fetch(self, user_id, video_ids):
+        entry = cache.get(self._key(user_id))
+        if entry is None:
+            return False, {}
+        return entry.get(LOADED, False), {video: entry[video] for video in video_ids if video in entry}
+    
+    def load(self, user_id, positions):
+        key = self._key(user_id)
+        with self._lock:
+            entry = {**positions, **(cache.get(key) or {}), LOADED: True}
+            cache.set(key, entry, self.ttl)
+    
+    def take_dirty(self, count):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            pairs = [self._dirty.pop() for _ in range(min(count, len(self._dirty)))]
+        
+        entries = cache.get_many({self._key(user_id) for user_id, _ in pairs})
+        rows = []
+        for user_id, video in pairs:
+            value = entries.get(self._key(user_id), {}).get(video)
+            if value is not None:
+                rows.append((user_id, video, *value))
+        return rows
+    
+    def mark_dirty(self, rows):
+        with self._lock:
+            self._dirty.update((user_id, video) for user_id, video, *_ in rows)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's resume position store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                options = _options()
+                kind = options['STORE']
+                if kind == 'auto':
+                    kind = 'redis' if redis_cache_enabled() else 'cache'
+                _store = (RedisProgressStore if kind == 'redis' else CacheProgressStore)(options)
+    return _store
+
+
+def record_positions(user_id, rows):
+    """
+    Update the hot store from a batch of buffered playback event rows.
+    
+    Only the latest position per video is kept; a completed video resumes
+    from the start.
+    """
+    latest = {}
+    for occurred_at, _, video, _, _, _, event_type, position, _ in rows:
+        if event_type not in POSITION_EVENTS or (position is None and event_type != 'COMPLETE'):
+            continue
+        if video not in latest or occurred_at >= latest[video][1]:
+            latest[video] = (0.0 if event_type == 'COMPLETE' else position, occurred_at)
+    
+    if not latest:
+        return
+    
+    store = get_store()
+    if store.record(user_id, latest):
+        flush_positions(store)
+
+
+def resume_positions(user, video_ids):
+    """
+    Return ``{video_id: seconds}`` for the videos ``user`` can resume.
+    
+    One hot store read; the table is only queried when the user's hash has
+    expired, and then refills it.
+    """
+    if not video_ids or user is None or not user.is_authenticated:
+        return {}
+    
+    video_ids = [str(video_id) for video_id in video_ids]
+    store = get_store()
+    loaded, found = store.fetch(user.id, video_ids)
+    
+    if not loaded:
+        saved = {
+            str(video_id): (position, updated_at.timestamp())
+            for video_id, position, updated_at in WatchProgress.objects
+            .filter(user_id=user.id)
+            .order_by('-updated_at')
+            .values_list('video_id', 'position', 'updated_at')[:_options()['LOAD_LIMIT']]
+        }
+        store.load(user.id, saved)
+        found = {**{video: saved[video] for video in video_ids if video in saved}, **found}
+    
+    return {video: position for video, (position, _) in found.items() if position > 0}
+
+
+def flush_positions(store=None, max_batches=1):
+    """
+    Upsert dirty hot store positions into WatchProgress; return the number written.
+    
+    Works through up to ``max_batches`` batches of ``FLUSH_BATCH`` positions.
+    """
+    store = store or get_store()
+    batch_size = _options()['FLUSH_BATCH']
+    written = 0
+    
+    for _ in range(max_batches):
+        rows = store.take_dirty(batch_size)
+        if not rows:
+            break
+        
+        try:
+            written += _upsert(rows)
+        except Exception as e:
+            store.mark_dirty(rows)
+            logger.error(f"Failed to flush {len(rows)} resume positions: {e}")
+            break
+        
+        if len(rows) < batch_size:
+            break
+    return written
+
+
+def _upsert(rows):
+    # Users or videos deleted since the heartbeat would fail the whole upsert
+    users = {
+        str(user_id) for user_id in
+        get_user_model().objects.filter(id__in={user for user, *_ in rows}).values_list('id', flat=True)
+    }
+    videos = {
+        str(video_id) for video_id in
+        Video.objects.filter(id__in={video for _, video, *_ in rows}).values_list('id', flat=True)
+    }
+    progress = [
+        WatchProgress(
+            user_id=user_id,
+            video_id=video,
+            position=position,
+            updated_at=datetime.fromtimestamp(timestamp, tz=dt_timezone.utc),
+        )
+        for user_id, video, position, timestamp in rows
+        if user_id in users and video in videos
+    ]
+    WatchProgress.objects.bulk_create(
+        progress,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['user', 'video'],
+        update_fields=['position', 'updated_at'],
+    )
+    return len(progress)
+
+
+def _flush_at_exit():
+    if _store is not None and _store.kind == 'cache':
+        flush_positions(_store, max_batches=100)
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,46 @@
+"""
+Playlist serializers.
+"""
+
+from rest_framework import serializers
+from apps.videos.serializers import VideoSerializer
+from .models import Playlist, PlaylistItem
+
+
+class PlaylistSerializer(serializers.ModelSerializer):
+    """Serializer for Playlist model."""
+    
+    item_count = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Playlist
+        fields = ['id', 'title', 'item_count', 'version', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'version', 'created_at', 'updated_at']
+    
+    def get_item_count(self, obj):
+        # Annotated by the list/detail queryset
+        return getattr(obj, 'item_count', None)
+
+
+class PlaylistItemSerializer(serializers.ModelSerializer):
+    """Serializer for PlaylistItem model."""
+    
+    video = VideoSerializer(read_only=True)
+    
+    class Meta:
+        model = PlaylistItem
+        fields = ['id', 'video', 'added_at']
+        read_only_fields = fields
+
+
+class PlaylistPlacementSerializer(serializers.Serializer):
+    """Where to add or move an item: right after or before another item."""
+    
+    video = serializers.UUIDField(required=False)
+    after = serializers.UUIDField(required=False)
+    before = serializers.UUIDField(required=False)
+    
+    def validate(self, attrs):
+        if 'after' in attrs and 'before' in attrs:
+            raise serializers.ValidationError("Give either 'after' or 'before', not both")
+        return attrs
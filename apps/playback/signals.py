@@ -0,0 +1,15 @@
+"""
+Signal handlers keeping cached playlist order consistent.
+"""
+
+from django.db.models import F
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from apps.videos.models import Video
+from .models import Playlist
+
+
+@receiver(pre_delete, sender=Video)
+def invalidate_playlists(sender, instance, **kwargs):
+    """Items removed by the cascade don't bump their playlist's version; do it here."""
+    Playlist.objects.filter(items__video=instance).update(version=F('version') + 1)
@@ -0,0 +1,10 @@
+from django.urls import path
+from rest_framework.routers import DefaultRouter
+from .views import PlaybackEventView, PlaylistViewSet
+
+router = DefaultRouter()
+router.register(r'playlists', PlaylistViewSet, basename='playlist')
+
+urlpatterns = [
+    path('events/', PlaybackEventView.as_view(), name='playback-events'),
+] + router.urls
\ No newline at end of file
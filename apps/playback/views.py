@@ -0,0 +1,188 @@
+"""
+Playback event and playlist API views.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+from apps.accounts.permissions import IsActiveUser
+from apps.videos.models import Video
+from apps.videos.serializers import VideoSerializer
+from .events import PlaybackEventError, ingest
+from .models import Playlist
+from .playlists import PlaylistError, add_item, move_item, navigation, remove_item
+from .resume import resume_positions
+from .serializers import PlaylistItemSerializer, PlaylistPlacementSerializer, PlaylistSerializer
+
+
+class PlaybackEventView(APIView):
+    """
+    Accept a batch of events from a web, TV or mobile player.
+    
+    Body: ``{"session", "client", "events": [{"type", "video", "position",
+    "stall_ms", "ts"}]}`` where ``type`` is start, progress, complete or
+    stall and ``ts`` is the client time in milliseconds. Valid events are
+    buffered and written later; invalid ones are listed in the response.
+    """
+    
+    permission_classes = [IsActiveUser]
+    parser_classes = [JSONParser]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'playback'
+    
+    def post(self, request):
+        try:
+            accepted, rejected = ingest(request.data, request.user.id)
+        except PlaybackEventError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({'accepted': accepted, 'rejected': rejected}, status=status.HTTP_202_ACCEPTED)
+
+
+def _int_param(request, name):
+    value = request.query_params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError(f"'{name}' must be an integer")
+
+
+class PlaylistViewSet(viewsets.ModelViewSet):
+    """
+    The user's playlists.
+    
+    Items are read through ``window``, a slice around the current video,
+    rather than as one full list.
+    """
+    
+    serializer_class = PlaylistSerializer
+    permission_classes = [IsActiveUser]
+    
+    def get_queryset(self):
+        queryset = Playlist.objects.filter(owner=self.request.user)
+        if self.action in ('list', 'retrieve'):
+            # Meta.ordering isn't applied to aggregating queries
+            queryset = queryset.annotate(item_count=Count('items')).order_by('-created_at')
+        return queryset
+    
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+    
+    @action(detail=True, methods=['get'])
+    def window(self, request, pk=None):
+        """
+        Items around ``?video=`` (default: the first), ``before``/``after`` each way.
+        
+        ``previous``/``next`` come from the cached order; videos the user
+        can no longer play are listed with ``video: null``.
+        """
+        playlist = self.get_object()
+        nav = navigation(playlist)
+        
+        try:
+            start, index, video_ids = nav.window(
+                request.query_params.get('video'),
+                _int_param(request, 'before'),
+                _int_param(request, 'after'),
+            )
+        except PlaylistError as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        
+        current = nav.video_ids[index] if video_ids else None
+        previous, following = nav.neighbours(current)
+        
+        items = {
+            str(item.video_id): item
+            for item in playlist.items.filter(video_id__in=video_ids).select_related('video', 'video__owner')
+        }
+        # Same rule as Video.objects.visible_to().playable(), applied to the rows already loaded
+        playable = {
+            video_id for video_id, item in items.items()
+            if item.video.is_active and item.video.upload_status == 'READY' and (
+                request.user.is_admin or item.video.is_global or item.video.owner_id == request.user.id
+            )
+        }
+        context = {
+            **self.get_serializer_context(),
+            'resume_positions': resume_positions(request.user, list(playable)),
+        }
+        videos = {
+            video['id']: video
+            for video in VideoSerializer([items[video_id].video for video_id in playable], many=True, context=context).data
+        }
+        
+        return Response({
+            'playlist': {'id': str(playlist.id), 'title': playlist.title, 'version': playlist.version},
+            'count': len(nav),
+            'index': index,
+            'current': current,
+            'previous': previous,
+            'next': following,
+            'has_more_before': start > 0,
+            'has_more_after': start + len(video_ids) < len(nav),
+            'items': [
+                {
+                    'index': start + offset,
+                    'id': str(items[video_id].id),
+                    'video': videos.get(video_id),
+                }
+                for offset, video_id in enumerate(video_ids)
+                if video_id in items
+            ],
+        })
+    
+    @action(detail=True, methods=['post'], url_path='items')
+    def add_item(self, request, pk=None):
+        """Add a video at the end, or right ``after``/``before`` an item."""
+        playlist = self.get_object()
+        placement = PlaylistPlacementSerializer(data=request.data)
+        placement.is_valid(raise_exception=True)
+        data = placement.validated_data
+        
+        video = Video.objects.visible_to(request.user).filter(id=data.get('video'), is_active=True).first()
+        if video is None:
+            return Response({'error': 'Video not found'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            item = add_item(playlist, video, after=data.get('after'), before=data.get('before'))
+        except PlaylistError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(PlaylistItemSerializer(item).data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'], url_path=r'items/(?P<item_id>[0-9a-f-]+)/move')
+    def move_item(self, request, pk=None, item_id=None):
+        """Move an item right ``after`` or ``before`` another one."""
+        playlist = self.get_object()
+        placement = PlaylistPlacementSerializer(data=request.data)
+        placement.is_valid(raise_exception=True)
+        data = placement.validated_data
+        
+        try:
+            move_item(playlist, item_id, after=data.get('after'), before=data.get('before'))
+        except PlaylistError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DjangoValidationError:
+            return Response({'error': 'Invalid item id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['delete'], url_path=r'items/(?P<item_id>[0-9a-f-]+)')
+    def remove_item(self, request, pk=None, item_id=None):
+        """Remove an item from the playlist."""
+        playlist = self.get_object()
+        
+        try:
+            remove_item(playlist, item_id)
+        except (PlaylistError, DjangoValidationError):
+            return Response({'error': 'Item not found in this playlist'}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(status=status.HTTP_204_NO_CONTENT)
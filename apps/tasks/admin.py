@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+from .celery import app
+from .models import TaskDeadLetter
+
+@admin.register(TaskDeadLetter)
+class TaskDeadLetterAdmin(admin.ModelAdmin):
+    list_display = ['task_name', 'idempotency_key', 'attempts', 'created_at', 'replayed_at']
+    list_filter = ['task_name', 'created_at']
+    search_fields = ['idempotency_key', 'task_id', 'error']
+    readonly_fields = ['task_name', 'task_id', 'idempotency_key', 'args', 'error', 'attempts', 'created_at', 'replayed_at']
+    actions = ['replay']
+    
+    @admin.action(description='Replay selected tasks')
+    def replay(self, request, queryset):
+        letters = list(queryset.filter(replayed_at__isnull=True))
+        for letter in letters:
+            app.send_task(letter.task_name, args=letter.args)
+        TaskDeadLetter.objects.filter(id__in=[letter.id for letter in letters]).update(replayed_at=timezone.now())
+        self.message_user(request, f"Replayed {len(letters)} tasks")
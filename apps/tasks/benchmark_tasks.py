@@ -0,0 +1,16 @@
+"""
+Probe task used by the benchmark_celery_queues command.
+"""
+
+import time
+from celery import shared_task
+
+
+@shared_task
+def queue_probe(sent_at, seconds=0):
+    """Return how long the probe waited in its queue (ms), then work for ``seconds``."""
+    
+    waited_ms = (time.time() - sent_at) * 1000
+    if seconds:
+        time.sleep(seconds)
+    return waited_ms
@@ -20,4 +20,28 @@ def cleanup_audit_logs():
         timestamp__lt=cutoff_date
     ).delete()
     
-    return f"Deleted {deleted_count} old audit logs"
\ No newline at end of file
+    return f"Deleted {deleted_count} old audit logs"
+
+
+@shared_task
+def collect_orphaned_video_files(dry_run=None):
+    """Delete video files that no Video row references any more."""
+    from apps.videos.gc import collect_orphans
+    
+    storage_types = ['local', 's3'] if settings.STORAGE_TYPE == 's3' else ['local']
+    reports = [collect_orphans(storage_type, dry_run=dry_run) for storage_type in storage_types]
+    
+    return ', '.join(
+        f"{r['storage']}: {r['orphans']} orphans ({r['orphan_bytes']} bytes), "
+        f"{r['deleted']} deleted, {r['errors']} errors"
+        for r in reports
+    )
+
+
+@shared_task
+def purge_video_changes():
+    """Drop changefeed entries older than the retention window."""
+    from apps.videos.changefeed import purge_changes
+    
+    deleted = purge_changes()
+    return f"Purged {deleted} video changes"
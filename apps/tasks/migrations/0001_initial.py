@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDeadLetter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=200)),
+                ('task_id', models.CharField(blank=True, max_length=255)),
+                ('idempotency_key', models.CharField(blank=True, max_length=255)),
+                ('args', models.JSONField(blank=True, default=list)),
+                ('error', models.TextField()),
+                ('attempts', models.PositiveIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('replayed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'task_dead_letters',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['task_name', '-created_at'], name='task_dead_l_task_na_e4787c_idx')],
+            },
+        ),
+    ]
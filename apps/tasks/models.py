@@ -0,0 +1,29 @@
+"""
+Records of background tasks that failed for good.
+"""
+
+from django.db import models
+
+
+class TaskDeadLetter(models.Model):
+    """A task run given up on, kept for an operator to inspect or replay."""
+    
+    task_name = models.CharField(max_length=200)
+    task_id = models.CharField(max_length=255, blank=True)
+    idempotency_key = models.CharField(max_length=255, blank=True)
+    args = models.JSONField(default=list, blank=True)
+    error = models.TextField()
+    attempts = models.PositiveIntegerField(default=1)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    replayed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'task_dead_letters'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['task_name', '-created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_name} ({self.idempotency_key or self.task_id})"
@@ -0,0 +1,111 @@
+"""
+Background tasks for bulk moderation and user imports in the admin portal.
+"""
+
+import logging
+import os
+from celery import shared_task
+from django.core.cache import cache
+from django.utils import timezone
+from apps.accounts.bulk_import import ImportReport, import_users, read_rows
+from apps.audit.models import AdminActionLog, BulkActionJob
+from apps.dashboard.moderation import moderation_options, run_job
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_bulk_action(job_id):
+    """Process a bulk action job for a while, then re-queue itself until done."""
+    
+    job = BulkActionJob.objects.select_related('admin').filter(id=job_id).first()
+    if job is None or job.status in ('COMPLETED', 'FAILED'):
+        return f"Nothing to do for job {job_id}"
+    
+    # Guard against a duplicate delivery working the same job twice
+    lock_key = f'bulk-action:{job_id}'
+    if not cache.add(lock_key, 1, moderation_options()['TASK_SECONDS'] * 2):
+        return f"Job {job_id} is already running"
+    
+    try:
+        finished = run_job(job)
+    except Exception as e:
+        logger.error(f"Bulk job {job_id} failed: {e}")
+        BulkActionJob.objects.filter(id=job_id).update(
+            status='FAILED', error=str(e)[:2000], finished_at=timezone.now(),
+        )
+        return f"Job {job_id} failed"
+    finally:
+        cache.delete(lock_key)
+    
+    if not finished:
+        run_bulk_action.delay(job_id)
+    
+    return f"Job {job_id}: {job.processed}/{job.total} processed, {job.affected} changed"
+
+
+@shared_task
+def run_user_import(job_id):
+    """Import a spooled user file, recording progress and row errors on the job."""
+    
+    job = BulkActionJob.objects.select_related('admin').filter(id=job_id, status='PENDING').first()
+    if job is None:
+        return f"Nothing to do for job {job_id}"
+    
+    job.status = 'RUNNING'
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+    
+    selection = job.selection
+    
+    def progress(report):
+        BulkActionJob.objects.filter(id=job.id).update(
+            processed=report.rows,
+            affected=report.created + report.updated,
+        )
+    
+    report = ImportReport()
+    try:
+        with open(selection['path'], 'rb') as stream:
+            import_users(
+                read_rows(stream, selection['format']),
+                default_plan=selection.get('plan'),
+                subscription_days=selection.get('days'),
+                existing=selection.get('existing', 'skip'),
+                pool='thread',
+                report=report,
+                progress=progress,
+            )
+    except Exception as e:
+        logger.error(f"User import {job_id} failed: {e}")
+        BulkActionJob.objects.filter(id=job.id).update(
+            status='FAILED', error=str(e)[:2000], report=report.as_dict(), finished_at=timezone.now(),
+        )
+        return f"Import {job_id} failed"
+    finally:
+        try:
+            os.unlink(selection['path'])
+        except OSError:
+            pass
+    
+    BulkActionJob.objects.filter(id=job.id).update(
+        status='COMPLETED',
+        processed=report.rows,
+        affected=report.created + report.updated,
+        report=report.as_dict(),
+        finished_at=timezone.now(),
+    )
+    
+    AdminActionLog.objects.create(
+        admin=job.admin,
+        action_type="USER_CREATED",
+        target_model="User",
+        target_id=str(job.id),
+        description=(
+            f"Bulk import of {selection.get('filename', 'file')}: {report.created} created, "
+            f"{report.updated} plan changes, {report.skipped} skipped, {report.failed} failed"
+        ),
+        ip_address=job.ip_address,
+    )
+    
+    return f"Import {job_id}: {report.created} created, {report.updated} updated, {report.failed} failed"
@@ -0,0 +1,46 @@
+"""
+Background tasks for playback event storage and resume positions.
+"""
+
+import logging
+from celery import shared_task
+from apps.playback.events import drain, event_options
+from apps.playback.partitions import ensure_partitions, is_partitioned, purge_expired
+from apps.playback.resume import flush_positions
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def drain_playback_events():
+    """Write buffered playback events to the database."""
+    
+    written = drain()
+    if written:
+        logger.info(f"Wrote {written} playback events")
+    return f"Wrote {written} playback events"
+
+
+@shared_task
+def flush_resume_positions():
+    """Upsert resume positions changed since the last run into WatchProgress."""
+    
+    written = flush_positions(max_batches=50)
+    return f"Saved {written} resume positions"
+
+
+@shared_task
+def maintain_playback_partitions():
+    """Create upcoming monthly partitions and remove expired events."""
+    
+    options = event_options()
+    created = ensure_partitions(
+        options['PARTITION_MONTHS_AHEAD'],
+        lookback_days=options['MAX_EVENT_AGE_SECONDS'] / 86400,
+    )
+    removed = purge_expired(options['RETENTION_DAYS'])
+    
+    for name in created:
+        logger.info(f"Created playback event partition {name}")
+    unit = 'partitions' if is_partitioned() else 'events'
+    return f"Created {len(created)} partitions, removed {removed} expired {unit}"
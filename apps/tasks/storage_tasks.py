@@ -0,0 +1,132 @@
+"""
+Background tasks for video storage maintenance.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from apps.videos.models import StorageDeletion
+from apps.videos.storage import VideoStorage
+from apps.videos.direct_uploads import expire_direct_uploads
+from apps.videos.tiering import run_tiering
+
+STORAGE_BACKENDS = {
+    'LOCAL': 'local',
+    'CLOUD': 's3',
+}
+
+
+def _options():
+    """Return the STORAGE_DELETION settings merged with defaults."""
+    options = {
+        'BATCH_SIZE': 5000,
+        'MAX_ATTEMPTS': 8,
+        'BACKOFF_SECONDS': 30,
+        'MAX_BACKOFF_SECONDS': 6 * 3600,
+        'LEASE_SECONDS': 600,
+        'RETENTION_DAYS': 30,
+    }
+    options.update(getattr(settings, 'STORAGE_DELETION', {}))
+    return options
+
+
+def _claim(options):
+    """Lease a batch of due rows so concurrent workers don't pick them up."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            StorageDeletion.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:options['BATCH_SIZE']]
+        )
+        StorageDeletion.objects.filter(id__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=options['LEASE_SECONDS']),
+            attempts=F('attempts') + 1,
+        )
+    return list(StorageDeletion.objects.filter(id__in=ids))
+
+
+@shared_task
+def process_storage_deletions():
+    """Drain the storage deletion outbox in batches, retrying with backoff."""
+    
+    options = _options()
+    rows = _claim(options)
+    if not rows:
+        return "No pending deletions"
+    
+    by_backend = defaultdict(list)
+    for row in rows:
+        by_backend[row.storage_type].append(row)
+    
+    now = timezone.now()
+    done_ids, failed = [], []
+    
+    for storage_type, backend_rows in by_backend.items():
+        keys = [row.key for row in backend_rows]
+        try:
+            deleted, errors = VideoStorage.delete_many(keys, STORAGE_BACKENDS[storage_type])
+        except Exception as e:
+            # Backend unavailable or misconfigured; retry the whole group later
+            deleted, errors = [], {key: str(e) for key in keys}
+        
+        deleted = set(deleted)
+        
+        for row in backend_rows:
+            if row.key in deleted:
+                done_ids.append(row.id)
+            else:
+                row.last_error = errors.get(row.key, 'unknown error')[:2000]
+                if row.attempts >= options['MAX_ATTEMPTS']:
+                    row.status = 'FAILED'
+                else:
+                    delay = min(
+                        options['BACKOFF_SECONDS'] * 2 ** (row.attempts - 1),
+                        options['MAX_BACKOFF_SECONDS'],
+                    )
+                    row.next_attempt_at = now + timedelta(seconds=delay)
+                failed.append(row)
+    
+    StorageDeletion.objects.filter(id__in=done_ids).update(
+        status='DONE', completed_at=now, last_error='',
+    )
+    StorageDeletion.objects.bulk_update(failed, ['status', 'last_error', 'next_attempt_at'])
+    
+    # A full batch means there is probably more waiting
+    if len(rows) >= options['BATCH_SIZE']:
+        process_storage_deletions.delay()
+    
+    StorageDeletion.objects.filter(
+        status='DONE', completed_at__lt=now - timedelta(days=options['RETENTION_DAYS'])
+    ).delete()
+    
+    return f"Deleted: {len(done_ids)}, Failed: {len(failed)}"
+
+
+@shared_task
+def run_storage_tiering():
+    """Move cold local videos to cloud storage (and hot ones back)."""
+    if not getattr(settings, 'STORAGE_TIERING', {}).get('ENABLED') or settings.STORAGE_TYPE != 's3':
+        return "Storage tiering disabled"
+    
+    report = run_tiering()
+    if 'skipped' in report:
+        return f"Skipped: {report['skipped']}"
+    
+    return (
+        f"Disk {report['disk_used_percent']}% used, demoted: {report['demoted']} "
+        f"({report['demoted_bytes']} bytes), promoted: {report['promoted']}, errors: {report['errors']}"
+    )
+
+
+@shared_task
+def expire_stale_direct_uploads():
+    """Abort direct uploads whose reservation has expired."""
+    
+    expired, errors = expire_direct_uploads()
+    return f"Expired: {expired}, Errors: {errors}"
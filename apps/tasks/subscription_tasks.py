@@ -3,9 +3,11 @@ Periodic tasks for subscription management.
 """
 
 from celery import shared_task
+from apps.core.push import publish
 from apps.subscriptions.models import Subscription
 from apps.plans.models import Plan
 from django.utils import timezone
+from datetime import timedelta
 
 
 @shared_task
@@ -21,6 +23,10 @@ def check_expired_subscriptions():
             if subscription.is_in_grace_period():
                 subscription.status = 'IN_GRACE_PERIOD'
                 subscription.save()
+                publish(subscription.user_id, 'subscription.grace_period', {
+                    'end_date': subscription.end_date,
+                    'grace_ends_at': subscription.end_date + timedelta(days=subscription.grace_period_days),
+                })
                 expired_count += 1
             elif subscription.should_downgrade():
                 # Downgrade to Free plan
@@ -29,6 +35,7 @@ def check_expired_subscriptions():
                 subscription.user.save()
                 subscription.status = 'EXPIRED'
                 subscription.save()
+                publish(subscription.user_id, 'subscription.expired', {'plan': free_plan.name})
                 downgraded_count += 1
     
     return f"Expired: {expired_count}, Downgraded: {downgraded_count}"
\ No newline at end of file
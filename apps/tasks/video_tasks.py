@@ -3,34 +3,160 @@ Celery tasks for video processing.
 """
 
 from celery import shared_task
+from django.db import transaction
+from apps.core.push import publish
+from apps.tasks.models import TaskDeadLetter
+from apps.videos.changefeed import record_changes
 from apps.videos.models import Video
+from apps.videos.outbox import enqueue_file_deletion
+from apps.videos.processing import (
+    TRANSIENT_ERRORS, acquire, content_version, idempotency_key, processing_options, release, retry_countdown,
+)
+from apps.videos.progress import ProgressCallback, set_progress
+from apps.videos.storage import VideoStorage, transfer_options
 from apps.videos.validators import extract_video_metadata
+import logging
 import os
 
+logger = logging.getLogger(__name__)
 
-@shared_task
-def process_video_metadata(video_id):
-    """Extract and save video metadata."""
+
+@shared_task(bind=True, acks_late=True)
+def process_video_metadata(self, video_id):
+    """Extract and save video metadata, once per version of the video's file."""
+    
+    options = processing_options()
+    retries = self.request.retries
+    
+    video = Video.objects.filter(id=video_id).first()
+    if video is None:
+        # The row may not be committed yet; keep trying for a little while
+        if retries < options['NOT_FOUND_RETRIES'] and not self.request.is_eager:
+            raise self.retry(countdown=retry_countdown(retries, options['NOT_FOUND_BACKOFF_SECONDS']))
+        return f"Video {video_id} not found"
+    
+    version = content_version(video)
+    key = idempotency_key(self.name, video_id, version)
+    if not acquire(key):
+        # Another run holds the lock, or held it when its worker died (this may
+        # be that run redelivered); come back once it has finished or expired
+        if retries < options['MAX_RETRIES'] and not self.request.is_eager:
+            raise self.retry(countdown=retry_countdown(retries))
+        logger.warning(f"Gave up waiting for the processing lock of video {video_id}")
+        return f"Video {video_id} is already being processed"
     
     try:
-        video = Video.objects.get(id=video_id)
+        # Re-read under the lock: a run that just finished released it
+        video.refresh_from_db(fields=['processing_status', 'processed_version'])
+        if video.processing_status == 'DONE' and video.processed_version == version:
+            return f"Video {video_id} already processed"
+        
+        Video.objects.filter(id=video_id).update(processing_status='PROCESSING')
         
-        # Get file path
         if video.storage_type == 'LOCAL':
-            file_path = os.path.join('media', 'videos', video.file_path)
-            
-            # Extract metadata
-            metadata = extract_video_metadata(file_path)
-            
-            # Update video
+            metadata = extract_video_metadata(os.path.join('media', 'videos', video.file_path))
             video.duration = metadata.get('duration', 0)
-            video.save()
-            
-            return f"Processed video {video_id}"
         
+        video.processing_status = 'DONE'
+        video.processed_version = version
+        video.save(update_fields=['duration', 'processing_status', 'processed_version', 'updated_at'])
+        if video.storage_type == 'LOCAL':
+            publish(video.owner_id, 'video.metadata_ready', {'video_id': video.id, 'duration': video.duration})
+            return f"Processed video {video_id}"
         return f"Skipped cloud video {video_id}"
     
+    except Exception as e:
+        error = e
+    finally:
+        release(key)
+    
+    # An eager run (development) happens inside the upload request and can't wait out a backoff
+    if isinstance(error, TRANSIENT_ERRORS) and retries < options['MAX_RETRIES'] and not self.request.is_eager:
+        logger.warning(f"Processing video {video_id} failed, retrying: {error}")
+        Video.objects.filter(id=video_id).update(processing_status='PENDING')
+        raise self.retry(exc=error, countdown=retry_countdown(retries), max_retries=options['MAX_RETRIES'])
+    return _give_up(self, video, key, error)
+
+
+def _give_up(task, video, key, error):
+    """Mark the video's processing FAILED and dead-letter the run."""
+    logger.error(f"Processing video {video.id} failed permanently: {error}")
+    with transaction.atomic():
+        Video.objects.filter(id=video.id).update(processing_status='FAILED')
+        record_changes([video.id])
+        TaskDeadLetter.objects.create(
+            task_name=task.name,
+            task_id=task.request.id or '',
+            idempotency_key=key,
+            args=[str(video.id)],
+            error=str(error)[:2000],
+            attempts=task.request.retries + 1,
+        )
+        publish(video.owner_id, 'video.processing_failed', {'video_id': video.id})
+    return f"Failed to process video {video.id}"
+
+
+@shared_task(bind=True)
+def upload_spooled_video(self, video_id, filename):
+    """Transfer a spooled cloud upload to S3 and mark the video ready."""
+    
+    path = VideoStorage.spool_path(filename)
+    
+    try:
+        video = Video.objects.get(id=video_id, upload_status='PENDING')
     except Video.DoesNotExist:
-        return f"Video {video_id} not found"
+        if os.path.exists(path):
+            os.unlink(path)
+        return f"Video {video_id} no longer awaiting upload"
+    
+    try:
+        total = os.path.getsize(path)
+    except FileNotFoundError as e:
+        # Lost with the spool volume, or already cleaned up; nothing to retry
+        return _fail_upload(video, path, 0, e)
+    set_progress(video_id, 'uploading', 0, total)
+    
+    try:
+        cloud_url = VideoStorage.upload_file(path, filename, callback=ProgressCallback(video_id, total))
     except Exception as e:
-        return f"Error processing {video_id}: {str(e)}"
\ No newline at end of file
+        max_retries = transfer_options()['MAX_RETRIES']
+        if self.request.retries < max_retries:
+            set_progress(video_id, 'retrying', 0, total, str(e))
+            raise self.retry(exc=e, countdown=30 * 2 ** self.request.retries, max_retries=max_retries)
+        
+        return _fail_upload(video, path, total, e)
+    
+    with transaction.atomic():
+        updated = Video.objects.filter(id=video_id, upload_status='PENDING').update(
+            cloud_url=cloud_url, upload_status='READY'
+        )
+        if updated:
+            record_changes([video_id])
+            publish(video.owner_id, 'video.upload_ready', {'video_id': video_id})
+            transaction.on_commit(lambda: process_video_metadata.delay(video_id))
+    if not updated:
+        # Deleted while uploading; the new object has no row to own it
+        video.cloud_url = cloud_url
+        enqueue_file_deletion('CLOUD', video.storage_key, video_id)
+    
+    os.unlink(path)
+    set_progress(video_id, 'done', total, total)
+    return f"Uploaded video {video_id}"
+
+
+def _fail_upload(video, path, total, error):
+    """
+    Mark a spooled upload FAILED and drop its spool file.
+    
+    The row is deactivated too, so it stops counting towards the owner's
+    quota; it never had a file anywhere but the spool.
+    """
+    logger.error(f"Cloud upload of video {video.id} failed: {error}")
+    with transaction.atomic():
+        Video.objects.filter(id=video.id, upload_status='PENDING').update(upload_status='FAILED', is_active=False)
+        record_changes([video.id])
+        publish(video.owner_id, 'video.upload_failed', {'video_id': video.id})
+    set_progress(video.id, 'failed', 0, total, str(error))
+    if os.path.exists(path):
+        os.unlink(path)
+    return f"Failed to upload video {video.id}"
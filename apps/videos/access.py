@@ -0,0 +1,94 @@
+"""
+Batched video access tracking.
+
+Playback hits are counted in a per-process buffer and written with a single
+UPDATE once the buffer is large or old enough, so opening a video never
+costs a write of its own. A crash loses at most one unflushed batch, which
+is acceptable for tiering heuristics.
+
+A play can be seen several times (the player page or API read, then the
+player's START event); one viewer's accesses to a video within
+ACCESS_DEDUP_SECONDS count once.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from .models import Video
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = Counter()
+_last_flush = time.monotonic()
+
+
+def _options():
+    """Return the flush thresholds from STORAGE_TIERING."""
+    options = getattr(settings, 'STORAGE_TIERING', {})
+    return (
+        options.get('ACCESS_FLUSH_SIZE', 500),
+        options.get('ACCESS_FLUSH_SECONDS', 30),
+        options.get('ACCESS_DEDUP_SECONDS', 300),
+    )
+
+
+def record_access(video_id, viewer=None):
+    """Count one access to a video by ``viewer``, flushing the buffer when due."""
+    global _last_flush
+    flush_size, flush_seconds, dedup_seconds = _options()
+    
+    if viewer is not None and dedup_seconds:
+        if not cache.add(f'video-access:{video_id}:{viewer}', 1, dedup_seconds):
+            return
+    
+    with _lock:
+        _pending[str(video_id)] += 1
+        due = (
+            len(_pending) >= flush_size
+            or time.monotonic() - _last_flush >= flush_seconds
+        )
+        if not due:
+            return
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    
+    _write(batch)
+
+
+def flush_access_counts():
+    """Write any buffered access counts now."""
+    global _last_flush
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    _write(batch)
+
+
+def _write(batch):
+    if not batch:
+        return
+    
+    try:
+        Video.objects.filter(id__in=list(batch)).update(
+            access_count=F('access_count') + Case(
+                *[When(id=video_id, then=Value(count)) for video_id, count in batch.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            last_accessed_at=timezone.now(),
+        )
+    except Exception as e:
+        # Losing a batch only skews tiering decisions; never fail the request
+        logger.warning(f"Failed to flush {len(batch)} video access counts: {e}")
+
+
+atexit.register(flush_access_counts)
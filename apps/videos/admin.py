@@ -1,13 +1,13 @@
 from django.contrib import admin
-from .models import Video
+from .models import Video, StorageDeletion, DirectUpload
 from .deletion_requests import VideoDeletionRequest
 
 @admin.register(Video)
 class VideoAdmin(admin.ModelAdmin):
     list_display = ['title', 'owner', 'storage_type', 'file_size_mb', 'duration_minutes', 'is_active', 'uploaded_by_admin', 'created_at']
-    list_filter = ['storage_type', 'is_active', 'format', 'uploaded_by_admin']
+    list_filter = ['storage_type', 'is_active', 'format', 'uploaded_by_admin', 'is_tiered', 'processing_status']
     search_fields = ['title', 'owner__email']
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'created_at', 'updated_at', 'last_accessed_at', 'access_count', 'processed_version', 'deleted_at']
 
 @admin.register(VideoDeletionRequest)
 class VideoDeletionRequestAdmin(admin.ModelAdmin):
@@ -15,3 +15,17 @@ class VideoDeletionRequestAdmin(admin.ModelAdmin):
     list_filter = ['status', 'requested_at']
     search_fields = ['video__title', 'requested_by__email']
     readonly_fields = ['id', 'requested_at', 'resolved_at']
+
+@admin.register(StorageDeletion)
+class StorageDeletionAdmin(admin.ModelAdmin):
+    list_display = ['key', 'storage_type', 'status', 'attempts', 'next_attempt_at', 'completed_at']
+    list_filter = ['status', 'storage_type']
+    search_fields = ['key', 'video_id']
+    readonly_fields = ['created_at', 'completed_at']
+
+@admin.register(DirectUpload)
+class DirectUploadAdmin(admin.ModelAdmin):
+    list_display = ['title', 'owner', 'file_size', 'status', 'expires_at', 'created_at']
+    list_filter = ['status', 'format']
+    search_fields = ['title', 'owner__email', 'key']
+    readonly_fields = ['id', 'created_at', 'completed_at', 's3_upload_id']
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class VideosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.videos'
\ No newline at end of file
+    name = 'apps.videos'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,247 @@
+"""
+Async video endpoints for ASGI deployments.
+
+Served by uvicorn (config.asgi), these views hold no worker while a slow
+client uploads or downloads: the event loop waits on the socket, file
+reads run on a thread only for the duration of each chunk, and blocking
+ORM/storage work is handed to ``sync_to_async`` in short steps.
+"""
+
+import asyncio
+import mimetypes
+import os
+import re
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django_ratelimit.core import is_ratelimited
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from apps.accounts.authentication import CachedJWTAuthentication
+from apps.playback.resume import resume_positions
+from .access import record_access
+from .models import Video
+from .serializers import VideoSerializer, VideoUploadSerializer
+from .storage import VideoStorage
+from .uploads import create_uploaded_video
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _jwt_user(request):
+    try:
+        result = CachedJWTAuthentication().authenticate(request)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def _session_user(request):
+    return request.user if request.user.is_authenticated else None
+
+
+async def get_request_user(request, allow_session=True):
+    """
+    Resolve the caller from a JWT ``Authorization`` header, or the session.
+    
+    Views accepting unsafe methods pass ``allow_session=False``: they are
+    CSRF-exempt for API clients, so they must not honour session cookies.
+    """
+    if request.headers.get('Authorization'):
+        return await sync_to_async(_jwt_user)(request)
+    if allow_session:
+        return await sync_to_async(_session_user)(request)
+    return None
+
+
+def _unauthorized():
+    return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single-range ``Range`` header, or None if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match or size == 0:
+        return None
+    
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+async def _aiter_file(path, start, length):
+    """Read a byte range off the event loop, one chunk per thread hop."""
+    f = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(f.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(f.read, min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+def _iter_file(path, start, length):
+    """Synchronous counterpart used when running under WSGI."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _cloud_url(video):
+    """Fresh presigned URL for a cloud video (stored URLs expire)."""
+    return VideoStorage.s3_storage().url(video.storage_key)
+
+
+async def stream_video(request, video_id):
+    """
+    Stream a video with HTTP Range support.
+    
+    Local files are streamed in chunks; cloud videos redirect to a fresh
+    presigned URL so the bytes never pass through the app server.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    
+    user = await get_request_user(request)
+    if user is None:
+        return _unauthorized()
+    
+    video = await Video.objects.visible_to(user).filter(id=video_id, upload_status='READY').afirst()
+    if video is None:
+        return JsonResponse({'error': 'Video not found'}, status=404)
+    
+    await sync_to_async(record_access)(video.id, viewer=user.id)
+    
+    if video.storage_type == 'CLOUD':
+        return HttpResponseRedirect(await sync_to_async(_cloud_url)(video))
+    
+    path = VideoStorage.local_storage().path(video.file_path)
+    try:
+        size = (await asyncio.to_thread(os.stat, path)).st_size
+    except FileNotFoundError:
+        return JsonResponse({'error': 'Video file not found'}, status=404)
+    
+    start, end, status = 0, size - 1, 200
+    range_header = request.headers.get('Range')
+    if range_header:
+        byte_range = parse_range(range_header, size)
+        if byte_range is None:
+            response = JsonResponse({'error': 'Requested range not satisfiable'}, status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        (start, end), status = byte_range, 206
+    
+    length = end - start + 1
+    if isinstance(request, ASGIRequest):
+        content = _aiter_file(path, start, length)
+    else:
+        content = _iter_file(path, start, length)
+    
+    response = StreamingHttpResponse(
+        content,
+        status=status,
+        content_type=mimetypes.guess_type(path)[0] or 'application/octet-stream',
+    )
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def _parse_upload(request):
+    # Parsing reads the spooled body from disk
+    return VideoUploadSerializer(data={**request.POST.dict(), **request.FILES.dict()})
+
+
+async def upload_video(request):
+    """Async counterpart of ``POST /api/v1/videos/upload/`` (JWT only)."""
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    
+    user = await get_request_user(request, allow_session=False)
+    if user is None:
+        return _unauthorized()
+    
+    limited = await sync_to_async(is_ratelimited)(
+        request, group='video-upload', key=lambda group, request: str(user.pk),
+        rate='100/h', method='POST', increment=True,
+    )
+    if limited:
+        return JsonResponse({'error': 'Upload rate limit exceeded'}, status=429)
+    
+    # The upload progress handler records uploads against request.user
+    request.user = user
+    serializer = await sync_to_async(_parse_upload)(request)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    
+    video_file = serializer.validated_data['video_file']
+    storage_type = serializer.validated_data['storage_type']
+    
+    plan = await sync_to_async(lambda: user.plan)()
+    if storage_type == 'CLOUD' and plan and not plan.cloud_upload_allowed:
+        return JsonResponse({'error': 'Cloud upload not allowed for your plan'}, status=403)
+    
+    try:
+        video = await sync_to_async(create_uploaded_video)(
+            user, serializer.validated_data['title'], video_file, storage_type,
+        )
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    return JsonResponse(
+        VideoSerializer(video).data,
+        status=202 if video.upload_status == 'PENDING' else 201,
+    )
+
+
+# Django 4.2's csrf_exempt decorator hides coroutine functions
+upload_video.csrf_exempt = True
+
+
+async def playlist(request):
+    """Async counterpart of ``GET /api/v1/videos/playlist/``."""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    
+    user = await get_request_user(request)
+    if user is None:
+        return _unauthorized()
+    
+    videos = [
+        video async for video in Video.objects.visible_to(user)
+        .playable()
+        .select_related('owner')
+        .order_by('-created_at')
+    ]
+    plan = await sync_to_async(lambda: user.plan)()
+    resume = await sync_to_async(resume_positions)(user, [video.id for video in videos])
+    
+    return JsonResponse({
+        'videos': VideoSerializer(videos, many=True, context={'resume_positions': resume}).data,
+        'loop_enabled': plan.playlist_loop_allowed if plan else False,
+    })
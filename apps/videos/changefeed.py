@@ -0,0 +1,241 @@
+"""
+Delta sync of video lists.
+
+Every change to a video is recorded in the changefeed stream of its owner
+and, while it is (or just stopped being) global, in the global stream.
+Each stream hands out its own increasing sequence numbers and keeps one
+row per video at the sequence of its latest change, so the log never
+grows past the number of videos it describes.
+
+A client's cursor (``u<seq>.g<seq>``) is the last sequence it has seen in
+its own stream and in the global one. The delta is every video changed
+after it: those the user can still see are returned in full, the others
+as tombstones. Rows older than the retention window are purged; a cursor
+from before the purge, or one the server doesn't recognise, gets a resync
+signal and the current cursor to start from after a full reload.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from .models import ChangeStream, Video, VideoChange
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_STREAM = 'global'
+
+CURSOR_PATTERN = re.compile(r'^u(\d+)\.g(\d+)$')
+
+
+class ChangefeedError(Exception):
+    """Raised for a malformed cursor."""
+
+
+def _options():
+    """Return the VIDEO_CHANGEFEED settings merged with defaults."""
+    options = {
+        'PAGE_SIZE': 500,
+        'MAX_PAGE_SIZE': 2000,
+        'RETENTION_DAYS': 30,
+    }
+    options.update(getattr(settings, 'VIDEO_CHANGEFEED', {}))
+    return options
+
+
+def format_cursor(user_seq, global_seq):
+    return f'u{user_seq}.g{global_seq}'
+
+
+def parse_cursor(cursor):
+    """Return ``(user_seq, global_seq)`` from a cursor string."""
+    match = CURSOR_PATTERN.match(cursor or '')
+    if match is None:
+        raise ChangefeedError('Invalid cursor')
+    return int(match.group(1)), int(match.group(2))
+
+
+def _streams(video):
+    streams = [str(video.owner_id)]
+    if video.is_global or getattr(video, '_loaded_is_global', False):
+        streams.append(GLOBAL_STREAM)
+    return streams
+
+
+def _reserve(stream, count):
+    """
+    Reserve ``count`` sequence numbers in ``stream``; return the first.
+    
+    The counter row stays locked until the caller's transaction commits,
+    so a stream's changes become visible in sequence order.
+    """
+    if not ChangeStream.objects.filter(id=stream).update(head=models.F('head') + count):
+        try:
+            with transaction.atomic():
+                ChangeStream.objects.create(id=stream, head=count)
+            return 1
+        except IntegrityError:
+            # Created concurrently
+            ChangeStream.objects.filter(id=stream).update(head=models.F('head') + count)
+    
+    head = ChangeStream.objects.values_list('head', flat=True).get(id=stream)
+    return head - count + 1
+
+
+def _record(entries):
+    """Record changes from ``(video_id, streams)`` pairs."""
+    by_stream = defaultdict(dict)
+    for video_id, streams in entries:
+        for stream in streams:
+            by_stream[stream][str(video_id)] = None
+    if not by_stream:
+        return
+    
+    now = timezone.now()
+    changes = []
+    with transaction.atomic():
+        # Streams are always locked in the same order so writers can't deadlock
+        for stream in sorted(by_stream):
+            video_ids = list(by_stream[stream])
+            first = _reserve(stream, len(video_ids))
+            changes.extend(
+                VideoChange(stream=stream, video_id=video_id, seq=first + offset, changed_at=now)
+                for offset, video_id in enumerate(video_ids)
+            )
+        
+        VideoChange.objects.bulk_create(
+            changes,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['stream', 'video_id'],
+            update_fields=['seq', 'changed_at'],
+        )
+
+
+def record_video_changes(videos):
+    """Record a change to each of ``videos`` (saved or deleted instances)."""
+    _record((video.id, _streams(video)) for video in videos)
+
+
+def record_changes(video_ids):
+    """
+    Record a change to the videos with ``video_ids``.
+    
+    For queryset updates, which bypass ``post_save``; call it in the same
+    transaction as the update.
+    """
+    rows = Video.objects.filter(id__in=list(video_ids)).values_list('id', 'owner_id', 'is_global')
+    _record(
+        (video_id, [str(owner_id), GLOBAL_STREAM] if is_global else [str(owner_id)])
+        for video_id, owner_id, is_global in rows
+    )
+
+
+def _heads(streams):
+    """Return ``{stream: (head, purged_through)}``, zeros for unused streams."""
+    found = {
+        stream: (head, purged)
+        for stream, head, purged in ChangeStream.objects
+        .filter(id__in=streams)
+        .values_list('id', 'head', 'purged_through')
+    }
+    return {stream: found.get(stream, (0, 0)) for stream in streams}
+
+
+def changes_since(user, cursor=None, limit=None):
+    """
+    Return the delta of ``user``'s video list since ``cursor``.
+    
+    A dict with ``resync`` (True when the client must reload the full list
+    first), the next ``cursor``, ``has_more``, the changed ``videos`` the
+    user can see and the ``deleted`` ids of those they no longer can.
+    Raises ChangefeedError for a malformed cursor.
+    """
+    options = _options()
+    limit = max(1, min(limit or options['PAGE_SIZE'], options['MAX_PAGE_SIZE']))
+    streams = (str(user.id), GLOBAL_STREAM)
+    heads = _heads(streams)
+    
+    resync = cursor is None
+    if not resync:
+        positions = parse_cursor(cursor)
+        # Behind the purge, or ahead of the stream (e.g. after a restore)
+        resync = any(
+            not heads[stream][1] <= position <= heads[stream][0]
+            for stream, position in zip(streams, positions)
+        )
+    
+    if resync:
+        return {
+            'resync': True,
+            'cursor': format_cursor(*(heads[stream][0] for stream in streams)),
+            'has_more': False,
+            'videos': [],
+            'deleted': [],
+        }
+    
+    changed = {}
+    next_positions = []
+    has_more = False
+    for stream, position in zip(streams, positions):
+        rows = list(
+            VideoChange.objects
+            .filter(stream=stream, seq__gt=position)
+            .order_by('seq')
+            .values_list('video_id', 'seq')[:limit + 1]
+        )
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+        changed.update((str(video_id), None) for video_id, _ in rows)
+        next_positions.append(rows[-1][1] if rows else position)
+    
+    videos = []
+    if changed:
+        videos = list(
+            Video.objects.visible_to(user)
+            .filter(upload_status='READY')
+            .filter(models.Q(owner=user) | models.Q(is_global=True), id__in=list(changed))
+            .select_related('owner')
+        )
+    visible = {str(video.id) for video in videos}
+    
+    return {
+        'resync': False,
+        'cursor': format_cursor(*next_positions),
+        'has_more': has_more,
+        'videos': videos,
+        'deleted': [video_id for video_id in changed if video_id not in visible],
+    }
+
+
+def purge_changes(retention_days=None, now=None):
+    """
+    Delete changes older than the retention window; return the number deleted.
+    
+    Each stream remembers the highest sequence purged, so cursors from
+    before it are told to resync.
+    """
+    retention_days = _options()['RETENTION_DAYS'] if retention_days is None else retention_days
+    cutoff = (now or timezone.now()) - timedelta(days=retention_days)
+    expired = VideoChange.objects.filter(changed_at__lt=cutoff)
+    
+    with transaction.atomic():
+        purged = dict(
+            expired.order_by().values('stream').annotate(seq=models.Max('seq')).values_list('stream', 'seq')
+        )
+        if not purged:
+            return 0
+        
+        streams = list(ChangeStream.objects.select_for_update().filter(id__in=list(purged)).order_by('id'))
+        for stream in streams:
+            stream.purged_through = max(stream.purged_through, purged[stream.id])
+        ChangeStream.objects.bulk_update(streams, ['purged_through'], batch_size=1000)
+        
+        deleted, _ = expired.delete()
+    
+    logger.info(f"Purged {deleted} video changes from {len(purged)} streams")
+    return deleted
@@ -0,0 +1,251 @@
+"""
+Presigned multipart uploads straight from the client to cloud storage.
+
+The API only reserves quota, hands out presigned ``UploadPart`` URLs and,
+once the client reports completion, verifies the assembled object with a
+HEAD request and a ranged GET of its first bytes. File data never passes
+through Django.
+"""
+
+import io
+import logging
+import math
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from apps.core.utils import validate_file_type
+from .models import DirectUpload, Video
+from .outbox import enqueue_file_deletion
+from .storage import VideoStorage, transfer_options
+from .uploads import start_processing
+from .validators import validate_upload_limits
+
+logger = logging.getLogger(__name__)
+
+# S3 multipart limits
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+S3_MAX_PARTS = 10000
+
+# Enough of the file for magic-number detection
+HEADER_BYTES = 2048
+
+
+class DirectUploadError(Exception):
+    """A direct upload could not be started or completed."""
+    pass
+
+
+def _options():
+    """Return the DIRECT_UPLOADS settings merged with defaults."""
+    options = {
+        'RESERVATION_SECONDS': 6 * 3600,
+    }
+    options.update(getattr(settings, 'DIRECT_UPLOADS', {}))
+    return options
+
+
+def _error_code(exc):
+    return getattr(exc, 'response', {}).get('Error', {}).get('Code')
+
+
+def part_size_for(file_size):
+    """Part size that respects S3's minimum part size and 10,000 part cap."""
+    return max(
+        transfer_options()['PART_SIZE'],
+        S3_MIN_PART_SIZE,
+        math.ceil(file_size / S3_MAX_PARTS),
+    )
+
+
+def part_count(upload):
+    return max(1, math.ceil(upload.file_size / upload.part_size))
+
+
+def reserve_upload(user, title, file_format, file_size):
+    """
+    Reserve quota for a direct upload and start the S3 multipart upload.
+    
+    Raises PlanLimitExceeded/FileValidationError if the plan does not allow
+    the file, or DirectUploadError if storage refuses the upload.
+    """
+    with transaction.atomic():
+        # Lock the owner so concurrent reservations can't oversubscribe the quota
+        get_user_model().objects.select_for_update().filter(pk=user.pk).first()
+        validate_upload_limits(user, file_size, file_format)
+        
+        upload = DirectUpload.objects.create(
+            owner=user,
+            title=title,
+            format=file_format,
+            file_size=file_size,
+            key=f"{uuid.uuid4()}.{file_format}",
+            part_size=part_size_for(file_size),
+            expires_at=timezone.now() + timedelta(seconds=_options()['RESERVATION_SECONDS']),
+        )
+    
+    storage = VideoStorage.s3_storage()
+    try:
+        response = storage.connection.meta.client.create_multipart_upload(
+            Bucket=storage.bucket_name,
+            Key=storage._normalize_name(upload.key),
+            **storage._get_write_parameters(upload.key),
+        )
+    except Exception as e:
+        DirectUpload.objects.filter(id=upload.id).update(status='FAILED', error=str(e))
+        logger.error(f"Could not start direct upload {upload.id}: {e}")
+        raise DirectUploadError("Cloud storage is unavailable, please try again later")
+    
+    upload.s3_upload_id = response['UploadId']
+    upload.save(update_fields=['s3_upload_id'])
+    return upload
+
+
+def presign_parts(upload):
+    """Presigned PUT URLs for every part, valid until the reservation expires."""
+    storage = VideoStorage.s3_storage()
+    client = storage.connection.meta.client
+    expires_in = max(60, int((upload.expires_at - timezone.now()).total_seconds()))
+    
+    return [
+        {
+            'part_number': number,
+            'url': client.generate_presigned_url(
+                'upload_part',
+                Params={
+                    'Bucket': storage.bucket_name,
+                    'Key': storage._normalize_name(upload.key),
+                    'UploadId': upload.s3_upload_id,
+                    'PartNumber': number,
+                },
+                ExpiresIn=expires_in,
+            ),
+        }
+        for number in range(1, part_count(upload) + 1)
+    ]
+
+
+def _reject(upload, message):
+    """Mark an upload as failed and queue its object for deletion."""
+    with transaction.atomic():
+        DirectUpload.objects.filter(id=upload.id).update(status='FAILED', error=message)
+        enqueue_file_deletion('CLOUD', upload.key)
+    raise DirectUploadError(message)
+
+
+def complete_upload(upload):
+    """
+    Assemble the uploaded parts, verify the object and create its Video.
+    
+    Missing parts leave the reservation open so the client can retry;
+    a size or content mismatch fails it and deletes the object.
+    """
+    if upload.status == 'COMPLETED':
+        return upload.video
+    if upload.status != 'RESERVED' or upload.expires_at <= timezone.now():
+        raise DirectUploadError("This upload is no longer active")
+    
+    storage = VideoStorage.s3_storage()
+    client = storage.connection.meta.client
+    bucket = storage.bucket_name
+    name = storage._normalize_name(upload.key)
+    
+    try:
+        parts = []
+        paginator = client.get_paginator('list_parts')
+        for page in paginator.paginate(Bucket=bucket, Key=name, UploadId=upload.s3_upload_id):
+            parts.extend(
+                {'PartNumber': part['PartNumber'], 'ETag': part['ETag']}
+                for part in page.get('Parts', [])
+            )
+        
+        expected = part_count(upload)
+        if len(parts) != expected:
+            raise DirectUploadError(f"Expected {expected} parts, found {len(parts)}")
+        
+        client.complete_multipart_upload(
+            Bucket=bucket, Key=name, UploadId=upload.s3_upload_id,
+            MultipartUpload={'Parts': parts},
+        )
+    except DirectUploadError:
+        raise
+    except Exception as e:
+        # A retry after a completed assembly finds no multipart upload;
+        # the object itself is checked below
+        if _error_code(e) != 'NoSuchUpload':
+            logger.error(f"Could not complete direct upload {upload.id}: {e}")
+            raise DirectUploadError("Could not complete the upload, please retry")
+    
+    try:
+        head = client.head_object(Bucket=bucket, Key=name)
+    except Exception:
+        raise DirectUploadError("Uploaded file not found")
+    
+    if head['ContentLength'] != upload.file_size:
+        _reject(upload, f"Uploaded {head['ContentLength']} bytes, expected {upload.file_size}")
+    
+    header = client.get_object(
+        Bucket=bucket, Key=name, Range=f'bytes=0-{HEADER_BYTES - 1}',
+    )['Body'].read()
+    if not validate_file_type(io.BytesIO(header), [upload.format]):
+        _reject(upload, f"File content is not a valid {upload.format} video")
+    
+    with transaction.atomic():
+        upload = DirectUpload.objects.select_for_update().get(id=upload.id)
+        if upload.status == 'COMPLETED':
+            return upload.video
+        
+        video = Video.objects.create(
+            owner=upload.owner,
+            title=upload.title,
+            storage_type='CLOUD',
+            cloud_url=storage.url(upload.key),
+            file_size=head['ContentLength'],
+            format=upload.format,
+        )
+        
+        upload.status = 'COMPLETED'
+        upload.video = video
+        upload.completed_at = timezone.now()
+        upload.save(update_fields=['status', 'video', 'completed_at'])
+        
+        start_processing(video, upload.key)
+    
+    return video
+
+
+def abort_upload(upload, status='ABORTED'):
+    """Abort an open upload, releasing its parts and its quota."""
+    if upload.status != 'RESERVED':
+        return
+    
+    if upload.s3_upload_id:
+        storage = VideoStorage.s3_storage()
+        try:
+            storage.connection.meta.client.abort_multipart_upload(
+                Bucket=storage.bucket_name,
+                Key=storage._normalize_name(upload.key),
+                UploadId=upload.s3_upload_id,
+            )
+        except Exception as e:
+            if _error_code(e) != 'NoSuchUpload':
+                raise
+    
+    DirectUpload.objects.filter(id=upload.id, status='RESERVED').update(status=status)
+
+
+def expire_direct_uploads(limit=500):
+    """Abort reservations past their expiry. Returns (expired, errors)."""
+    stale = DirectUpload.objects.filter(status='RESERVED', expires_at__lte=timezone.now())[:limit]
+    
+    expired = errors = 0
+    for upload in stale:
+        try:
+            abort_upload(upload, status='EXPIRED')
+            expired += 1
+        except Exception as e:
+            errors += 1
+            logger.warning(f"Could not abort expired direct upload {upload.id}: {e}")
+    return expired, errors
@@ -0,0 +1,191 @@
+"""
+Garbage collection of video files no longer referenced by any Video row.
+
+Failed uploads, hard-deleted rows and purged soft-deleted videos leave files
+behind. The collector streams the storage listing, tests every key against a
+Bloom filter built from the keys still referenced in the database, and
+deletes the misses in parallel batches. A Bloom filter false positive only
+means an orphan survives until the next run; it can never cause a
+referenced file to be deleted, and every batch is re-checked against the
+database right before deletion.
+"""
+
+import hashlib
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Video, storage_key_from_url
+from .storage import VideoStorage
+
+logger = logging.getLogger(__name__)
+
+STORAGE_TYPES = {
+    'local': 'LOCAL',
+    's3': 'CLOUD',
+}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing."""
+    
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, key):
+        digest = hashlib.sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+    
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+    
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def _options():
+    """Return the ORPHAN_GC settings merged with defaults."""
+    options = {
+        'DRY_RUN': True,
+        'MIN_AGE_HOURS': 24,
+        'BATCH_SIZE': 500,
+        'WORKERS': 4,
+        'SOFT_DELETED_RETENTION_DAYS': None,
+    }
+    options.update(getattr(settings, 'ORPHAN_GC', {}))
+    return options
+
+
+def _referenced_rows(storage_type, retention_days):
+    """Rows whose files must be kept for ``storage_type``."""
+    rows = Video.objects.filter(storage_type=STORAGE_TYPES[storage_type])
+    if retention_days is not None:
+        # Soft-deleted videos past retention no longer protect their files;
+        # videos an admin only disabled are never purged
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        rows = rows.exclude(deleted_at__lt=cutoff)
+    return rows
+
+
+def _iter_referenced_keys(rows, storage_type):
+    field = 'cloud_url' if storage_type == 's3' else 'file_path'
+    for value in rows.values_list(field, flat=True).iterator(chunk_size=5000):
+        key = storage_key_from_url(value) if storage_type == 's3' else value
+        if key:
+            yield key
+
+
+def _still_referenced(keys, rows, storage_type):
+    """Exact database check for a batch of candidate orphans."""
+    if storage_type == 's3':
+        referenced = set()
+        for start in range(0, len(keys), 100):
+            chunk = keys[start:start + 100]
+            query = Q()
+            for key in chunk:
+                query |= Q(cloud_url__contains=key)
+            for url in rows.filter(query).values_list('cloud_url', flat=True):
+                referenced.add(storage_key_from_url(url))
+        return referenced
+    return set(rows.filter(file_path__in=keys).values_list('file_path', flat=True))
+
+
+def collect_orphans(storage_type='local', dry_run=None, min_age_hours=None,
+                    batch_size=None, workers=None, sample_size=20):
+    """
+    Find and (unless dry-running) delete orphaned files in one storage.
+    
+    Files younger than ``min_age_hours`` are skipped because an upload
+    writes its file before the Video row is committed. Returns a report
+    dict with counts, bytes and a sample of orphaned keys.
+    """
+    options = _options()
+    dry_run = options['DRY_RUN'] if dry_run is None else dry_run
+    min_age_hours = options['MIN_AGE_HOURS'] if min_age_hours is None else min_age_hours
+    batch_size = batch_size or options['BATCH_SIZE']
+    workers = workers or options['WORKERS']
+    retention_days = options['SOFT_DELETED_RETENTION_DAYS']
+    
+    rows = _referenced_rows(storage_type, retention_days)
+    bloom = BloomFilter(capacity=rows.count())
+    for key in _iter_referenced_keys(rows, storage_type):
+        bloom.add(key)
+    
+    cutoff = timezone.now() - timedelta(hours=min_age_hours)
+    report = {
+        'storage': storage_type,
+        'dry_run': dry_run,
+        'scanned': 0,
+        'orphans': 0,
+        'orphan_bytes': 0,
+        'deleted': 0,
+        'errors': 0,
+        'sample': [],
+    }
+    
+    def delete_batch(batch):
+        try:
+            keep = _still_referenced(list(batch), rows, storage_type)
+        finally:
+            # Runs on a pool thread with its own connection
+            connection.close()
+        keys = [key for key in batch if key not in keep]
+        return VideoStorage.delete_many(keys, storage_type)
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='video-gc') as executor:
+        futures = []
+        batch = {}
+        
+        for key, size, modified in VideoStorage.iter_files(storage_type):
+            report['scanned'] += 1
+            if key in bloom or modified > cutoff:
+                continue
+            
+            report['orphans'] += 1
+            report['orphan_bytes'] += size
+            if len(report['sample']) < sample_size:
+                report['sample'].append(key)
+            
+            if dry_run:
+                continue
+            
+            batch[key] = size
+            if len(batch) >= batch_size:
+                futures.append(executor.submit(delete_batch, batch))
+                batch = {}
+        
+        if batch:
+            futures.append(executor.submit(delete_batch, batch))
+        
+        for future in futures:
+            deleted, errors = future.result()
+            report['deleted'] += len(deleted)
+            report['errors'] += len(errors)
+            for key, message in list(errors.items())[:5]:
+                logger.warning(f"Could not delete orphaned video file {key}: {message}")
+    
+    if not dry_run and retention_days is not None:
+        report['purged_rows'] = _purge_expired_soft_deleted(storage_type, retention_days)
+    
+    logger.info(f"Orphan GC report: {report}")
+    return report
+
+
+def _purge_expired_soft_deleted(storage_type, retention_days):
+    """Hard-delete soft-deleted rows past retention once their files are gone."""
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    _, per_model = Video.objects.filter(
+        storage_type=STORAGE_TYPES[storage_type], deleted_at__lt=cutoff,
+    ).delete()
+    return per_model.get(Video._meta.label, 0)
@@ -0,0 +1,96 @@
+"""
+Benchmark S3 multipart upload settings against an S3-compatible endpoint.
+
+Point it at a local MinIO (or any S3 stand-in) to compare part sizes and
+thread counts before tuning S3_TRANSFER:
+
+    docker run -p 9000:9000 minio/minio server /data
+    python manage.py benchmark_s3_upload --endpoint-url http://localhost:9000
+"""
+
+import os
+import tempfile
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from apps.core.benchmarks import Timer
+from apps.videos.storage import VideoStorage
+
+MB = 1024 * 1024
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Time S3 uploads across part sizes and concurrency levels'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint-url', default='http://localhost:9000')
+        parser.add_argument('--bucket', default='auralink-benchmark')
+        parser.add_argument('--access-key', default='minioadmin')
+        parser.add_argument('--secret-key', default='minioadmin')
+        parser.add_argument('--region', default='us-east-1')
+        parser.add_argument('--size-mb', type=int, default=500, help='Size of the test file')
+        parser.add_argument('--part-sizes', type=_int_list, default=[8, 16, 64],
+                            help='Comma-separated part sizes in MB')
+        parser.add_argument('--concurrency', type=_int_list, default=[1, 4, 8, 16],
+                            help='Comma-separated thread counts')
+        parser.add_argument('--repeat', type=int, default=1, help='Uploads per combination (best time wins)')
+    
+    def handle(self, *args, **options):
+        import boto3
+        from botocore.exceptions import BotoCoreError, ClientError
+        
+        client = boto3.client(
+            's3',
+            endpoint_url=options['endpoint_url'],
+            aws_access_key_id=options['access_key'],
+            aws_secret_access_key=options['secret_key'],
+            region_name=options['region'],
+        )
+        bucket = options['bucket']
+        
+        try:
+            client.head_bucket(Bucket=bucket)
+        except ClientError:
+            client.create_bucket(Bucket=bucket)
+        except BotoCoreError as e:
+            raise CommandError(f"Cannot reach {options['endpoint_url']}: {e}")
+        
+        size = options['size_mb'] * MB
+        with tempfile.NamedTemporaryFile(suffix='.mp4') as source:
+            for _ in range(options['size_mb']):
+                source.write(os.urandom(MB))
+            source.flush()
+            
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"Uploading {options['size_mb']} MB to {options['endpoint_url']}/{bucket}"
+            ))
+            self.stdout.write(f"{'part MB':>8} {'threads':>8} {'seconds':>9} {'MB/s':>8}")
+            
+            # Single PUT in one thread, as a floor
+            runs = [('single', 1, {'MULTIPART_THRESHOLD': size + 1, 'PART_SIZE': size, 'MAX_CONCURRENCY': 1})]
+            for part_mb in options['part_sizes']:
+                for threads in options['concurrency']:
+                    runs.append((part_mb, threads, {
+                        'MULTIPART_THRESHOLD': part_mb * MB,
+                        'PART_SIZE': part_mb * MB,
+                        'MAX_CONCURRENCY': threads,
+                    }))
+            
+            for part_label, threads, overrides in runs:
+                config = VideoStorage.transfer_config(**overrides)
+                best = None
+                
+                for _ in range(options['repeat']):
+                    key = f'benchmark/{uuid.uuid4()}.mp4'
+                    with Timer() as timer:
+                        client.upload_file(source.name, bucket, key, Config=config)
+                    client.delete_object(Bucket=bucket, Key=key)
+                    best = timer.ms if best is None else min(best, timer.ms)
+                
+                seconds = best / 1000
+                self.stdout.write(
+                    f"{part_label:>8} {threads:>8} {seconds:>9.2f} {options['size_mb'] / seconds:>8.1f}"
+                )
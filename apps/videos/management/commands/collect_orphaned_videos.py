@@ -0,0 +1,47 @@
+"""
+Management command to find and delete orphaned video files.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.videos.gc import collect_orphans
+
+
+class Command(BaseCommand):
+    help = 'Report (and with --delete, remove) video files no Video row references'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--storage', choices=['local', 's3', 'all'], default='all')
+        parser.add_argument('--delete', action='store_true', help='Delete orphans (default is a dry run)')
+        parser.add_argument('--min-age-hours', type=float, default=None,
+                            help='Skip files modified more recently than this')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--workers', type=int, default=None)
+    
+    def handle(self, *args, **options):
+        if options['storage'] == 'all':
+            storage_types = ['local', 's3'] if settings.STORAGE_TYPE == 's3' else ['local']
+        else:
+            storage_types = [options['storage']]
+        
+        for storage_type in storage_types:
+            report = collect_orphans(
+                storage_type,
+                dry_run=not options['delete'],
+                min_age_hours=options['min_age_hours'],
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+            )
+            
+            mode = 'DRY RUN' if report['dry_run'] else 'DELETE'
+            self.stdout.write(self.style.MIGRATE_HEADING(f'[{mode}] {storage_type} storage'))
+            self.stdout.write(f"  scanned files:  {report['scanned']}")
+            self.stdout.write(f"  orphans:        {report['orphans']} ({report['orphan_bytes'] / (1024 * 1024):.1f} MB)")
+            for key in report['sample']:
+                self.stdout.write(f'    {key}')
+            if not report['dry_run']:
+                self.stdout.write(self.style.SUCCESS(f"  deleted:        {report['deleted']}"))
+                if report['errors']:
+                    self.stdout.write(self.style.ERROR(f"  errors:         {report['errors']}"))
+                if 'purged_rows' in report:
+                    self.stdout.write(f"  purged rows:    {report['purged_rows']}")
@@ -0,0 +1,28 @@
+"""
+Management command to run one storage tiering pass.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.videos.tiering import run_tiering
+
+
+class Command(BaseCommand):
+    help = 'Move idle local videos to cloud storage (and hot tiered videos back)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would move without moving it')
+    
+    def handle(self, *args, **options):
+        report = run_tiering(dry_run=options['dry_run'])
+        
+        mode = 'DRY RUN' if report['dry_run'] else 'TIERING'
+        self.stdout.write(self.style.MIGRATE_HEADING(f'[{mode}] local disk {report["disk_used_percent"]}% used'))
+        if report['pressure']:
+            self.stdout.write(self.style.WARNING('  above high-water mark'))
+        if 'skipped' in report:
+            self.stdout.write(self.style.WARNING(f"  skipped: {report['skipped']}"))
+            return
+        self.stdout.write(f"  demoted:  {report['demoted']} ({report['demoted_bytes'] / (1024 * 1024):.1f} MB)")
+        self.stdout.write(f"  promoted: {report['promoted']}")
+        if report['errors']:
+            self.stdout.write(self.style.ERROR(f"  errors:   {report['errors']}"))
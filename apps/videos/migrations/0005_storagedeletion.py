@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:28
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0004_videodeletionrequest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StorageDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('storage_type', models.CharField(choices=[('LOCAL', 'Local Filesystem'), ('CLOUD', 'Cloud Storage')], max_length=10)),
+                ('key', models.CharField(max_length=1000)),
+                ('video_id', models.UUIDField(blank=True, help_text='Video the file belonged to', null=True)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'storage_deletions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='storage_del_status_2843b4_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0005_storagedeletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='access_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='is_tiered',
+            field=models.BooleanField(default=False, help_text='Moved from local disk to cloud storage by tiering'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='last_accessed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='video',
+            index=models.Index(fields=['storage_type', 'last_accessed_at'], name='videos_storage_e904cf_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0006_video_access_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='upload_status',
+            field=models.CharField(choices=[('READY', 'Ready'), ('PENDING', 'Transferring to cloud storage'), ('FAILED', 'Transfer failed')], default='READY', max_length=10),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('videos', '0007_video_upload_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('format', models.CharField(choices=[('mp4', 'MP4'), ('mkv', 'MKV'), ('webm', 'WebM')], max_length=10)),
+                ('file_size', models.BigIntegerField(help_text='Declared size in bytes')),
+                ('key', models.CharField(max_length=1000)),
+                ('s3_upload_id', models.CharField(blank=True, max_length=1024)),
+                ('part_size', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('RESERVED', 'Reserved'), ('COMPLETED', 'Completed'), ('ABORTED', 'Aborted'), ('FAILED', 'Failed verification'), ('EXPIRED', 'Expired')], default='RESERVED', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('expires_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='direct_uploads', to=settings.AUTH_USER_MODEL)),
+                ('video', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='direct_upload', to='videos.video')),
+            ],
+            options={
+                'db_table': 'direct_uploads',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['owner', 'status'], name='direct_uplo_owner_i_ae7507_idx'), models.Index(fields=['status', 'expires_at'], name='direct_uplo_status_47b239_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0008_directupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeStream',
+            fields=[
+                ('id', models.CharField(max_length=36, primary_key=True, serialize=False)),
+                ('head', models.BigIntegerField(default=0)),
+                ('purged_through', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'video_change_streams',
+            },
+        ),
+        migrations.CreateModel(
+            name='VideoChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('stream', models.CharField(max_length=36)),
+                ('video_id', models.UUIDField()),
+                ('seq', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'video_changes',
+                'indexes': [models.Index(fields=['stream', 'seq'], name='video_chang_stream_8e90a8_idx'), models.Index(fields=['changed_at'], name='video_chang_changed_9bf280_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='videochange',
+            constraint=models.UniqueConstraint(fields=('stream', 'video_id'), name='unique_stream_video_change'),
+        ),
+    ]
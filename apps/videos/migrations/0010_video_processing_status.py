@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('videos', '0009_changefeed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='processed_version',
+            field=models.CharField(blank=True, help_text='Content version last processed', max_length=40),
+        ),
+        # Existing videos went through processing before it was tracked
+        migrations.AddField(
+            model_name='video',
+            name='processing_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='DONE', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='processing_status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10),
+        ),
+    ]
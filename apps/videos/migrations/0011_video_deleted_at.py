@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:28
+
+from django.db import migrations, models
+
+
+def mark_approved_deletions(apps, schema_editor):
+    # Owner deletions made before this field can't be told apart from videos
+    # an admin disabled, so only approved deletion requests are backfilled
+    Video = apps.get_model('videos', 'Video')
+    VideoDeletionRequest = apps.get_model('videos', 'VideoDeletionRequest')
+    approved = VideoDeletionRequest.objects.filter(status='APPROVED', video__is_active=False)
+    for video_id, resolved_at in approved.values_list('video_id', 'resolved_at').iterator():
+        Video.objects.filter(id=video_id, deleted_at__isnull=True).update(deleted_at=resolved_at)
+
+
+class Migration(migrations.Migration):
+    
+    dependencies = [
+        ('videos', '0010_video_processing_status'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, help_text='Soft-deleted by its owner or an approved deletion request (not set when an admin disables it)', null=True),
+        ),
+        migrations.RunPython(mark_approved_deletions, migrations.RunPython.noop),
+    ]
@@ -3,8 +3,24 @@ Video model with validation and storage management.
 """
 
 import uuid
+from urllib.parse import unquote, urlparse
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+
+class VideoQuerySet(models.QuerySet):
+    """Query helpers for videos."""
+    
+    def visible_to(self, user):
+        """Videos ``user`` may watch: everything for admins, else own and global."""
+        if user.is_admin:
+            return self
+        return self.filter(models.Q(owner=user) | models.Q(is_global=True), is_active=True)
+    
+    def playable(self):
+        """Active videos whose file is in place (not still transferring, or failed)."""
+        return self.filter(is_active=True, upload_status='READY')
 
 
 class Video(models.Model):
@@ -15,6 +31,19 @@ class Video(models.Model):
         ('CLOUD', 'Cloud Storage'),
     )
     
+    UPLOAD_STATUS_CHOICES = (
+        ('READY', 'Ready'),
+        ('PENDING', 'Transferring to cloud storage'),
+        ('FAILED', 'Transfer failed'),
+    )
+    
+    PROCESSING_STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('PROCESSING', 'Processing'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+    
     FORMAT_CHOICES = (
         ('mp4', 'MP4'),
         ('mkv', 'MKV'),
@@ -32,6 +61,7 @@ class Video(models.Model):
     storage_type = models.CharField(max_length=10, choices=STORAGE_CHOICES, default='LOCAL')
     file_path = models.CharField(max_length=500, blank=True)
     cloud_url = models.URLField(max_length=1000, blank=True)
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default='READY')
     
     # File metadata
     file_size = models.BigIntegerField(default=0, help_text='Size in bytes')
@@ -39,26 +69,49 @@ class Video(models.Model):
     format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='mp4')
     thumbnail_url = models.URLField(max_length=1000, blank=True)
     
+    # Metadata processing (see apps.videos.processing)
+    processing_status = models.CharField(max_length=10, choices=PROCESSING_STATUS_CHOICES, default='PENDING')
+    processed_version = models.CharField(max_length=40, blank=True, help_text="Content version last processed")
+    
     # Status
     is_active = models.BooleanField(default=True)
     is_global = models.BooleanField(default=False, help_text="Visible to all users")
     uploaded_by_admin = models.BooleanField(default=False, help_text="Uploaded by admin, requires approval to delete")
+    deleted_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Soft-deleted by its owner or an approved deletion request (not set when an admin disables it)"
+    )
+    
+    # Access tracking (flushed in batches, see apps.videos.access)
+    last_accessed_at = models.DateTimeField(null=True, blank=True)
+    access_count = models.PositiveIntegerField(default=0)
+    is_tiered = models.BooleanField(default=False, help_text="Moved from local disk to cloud storage by tiering")
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = VideoQuerySet.as_manager()
+    
     class Meta:
         db_table = 'videos'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['owner', '-created_at']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['storage_type', 'last_accessed_at']),
         ]
     
     def __str__(self):
         return f"{self.title} ({self.owner.email})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the changefeed tell the global stream when a video stops being global
+        instance._loaded_is_global = 'is_global' in field_names and instance.is_global
+        return instance
+    
     @property
     def file_size_mb(self):
         """Get file size in MB."""
@@ -68,7 +121,7 @@ class Video(models.Model):
     def duration_minutes(self):
         """Get duration in minutes."""
         return round(self.duration / 60, 2)
-
+    
     @property
     def get_file_url(self):
         """Get video file URL."""
@@ -76,6 +129,13 @@ class Video(models.Model):
             return self.cloud_url
         return f"{settings.MEDIA_URL}videos/{self.file_path}"
     
+    @property
+    def storage_key(self):
+        """Key of the video's file within its storage backend."""
+        if self.storage_type == 'CLOUD':
+            return storage_key_from_url(self.cloud_url)
+        return self.file_path
+    
     def can_be_deleted_by_user(self, user):
         """Check if a user can delete this video."""
         # Admins can delete any video
@@ -88,4 +148,160 @@ class Video(models.Model):
     
     def requires_deletion_approval(self):
         """Check if this video requires admin approval for deletion."""
-        return self.uploaded_by_admin or self.is_global
\ No newline at end of file
+        return self.uploaded_by_admin or self.is_global
+
+
+
+
+class DirectUpload(models.Model):
+    """
+    A presigned multipart upload straight to cloud storage.
+    
+    While RESERVED the row holds the declared size and one video slot
+    against the owner's quota; completing it creates the Video.
+    """
+    
+    STATUS_CHOICES = (
+        ('RESERVED', 'Reserved'),
+        ('COMPLETED', 'Completed'),
+        ('ABORTED', 'Aborted'),
+        ('FAILED', 'Failed verification'),
+        ('EXPIRED', 'Expired'),
+    )
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='direct_uploads'
+    )
+    
+    title = models.CharField(max_length=255)
+    format = models.CharField(max_length=10, choices=Video.FORMAT_CHOICES)
+    file_size = models.BigIntegerField(help_text='Declared size in bytes')
+    key = models.CharField(max_length=1000)
+    s3_upload_id = models.CharField(max_length=1024, blank=True)
+    part_size = models.BigIntegerField(default=0)
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='RESERVED')
+    error = models.TextField(blank=True)
+    video = models.OneToOneField(
+        Video,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='direct_upload'
+    )
+    
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'direct_uploads'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['owner', 'status']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} ({self.status})"
+
+class StorageDeletion(models.Model):
+    """
+    Outbox row for a file that must be removed from storage.
+    
+    Rows are written in the same transaction that drops the file's last
+    reference and are drained asynchronously by a Celery worker.
+    """
+    
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+    
+    storage_type = models.CharField(max_length=10, choices=Video.STORAGE_CHOICES)
+    key = models.CharField(max_length=1000)
+    video_id = models.UUIDField(null=True, blank=True, help_text="Video the file belonged to")
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'storage_deletions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.storage_type}:{self.key} ({self.status})"
+
+
+class ChangeStream(models.Model):
+    """
+    Sequence counter of one changefeed stream (see ``apps.videos.changefeed``).
+    
+    There is a stream per owner, named by the owner's id, and one for
+    global videos.
+    """
+    
+    id = models.CharField(primary_key=True, max_length=36)
+    head = models.BigIntegerField(default=0)  # last sequence number handed out
+    purged_through = models.BigIntegerField(default=0)  # changes up to here may have been purged
+    
+    class Meta:
+        db_table = 'video_change_streams'
+    
+    def __str__(self):
+        return f"{self.id} @ {self.head}"
+
+
+class VideoChange(models.Model):
+    """
+    Latest change to a video within a changefeed stream.
+    
+    Each change moves the row to a new sequence number instead of adding
+    one, so a stream holds at most one row per video. ``video_id`` is a
+    plain id so tombstones outlive the video.
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    stream = models.CharField(max_length=36)
+    video_id = models.UUIDField()
+    seq = models.BigIntegerField()
+    changed_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'video_changes'
+        constraints = [
+            models.UniqueConstraint(fields=['stream', 'video_id'], name='unique_stream_video_change'),
+        ]
+        indexes = [
+            models.Index(fields=['stream', 'seq']),
+            models.Index(fields=['changed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stream}#{self.seq}: {self.video_id}"
+
+
+def storage_key_from_url(url):
+    """Extract the object key from a stored S3 URL (virtual-host or path style)."""
+    if not url:
+        return ''
+    key = unquote(urlparse(url).path).lstrip('/')
+    bucket = getattr(settings, 'AWS_STORAGE_BUCKET_NAME', '')
+    if bucket and key.startswith(f'{bucket}/'):
+        key = key[len(bucket) + 1:]
+    location = getattr(settings, 'AWS_LOCATION', '').strip('/')
+    if location and key.startswith(f'{location}/'):
+        key = key[len(location) + 1:]
+    return key
@@ -0,0 +1,40 @@
+"""
+Transactional outbox for storage file deletions.
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import StorageDeletion
+
+
+def enqueue_file_deletion(storage_type, key, video_id=None, delay=0):
+    """
+    Record that a stored file must be deleted.
+    
+    Call inside the transaction that removes the file's last reference: the
+    outbox row commits or rolls back together with it, and the worker is
+    only nudged once the transaction has committed. ``delay`` (seconds)
+    keeps the file around for clients still holding its URL.
+    """
+    if not key:
+        return None
+    
+    deletion = StorageDeletion.objects.create(
+        storage_type=storage_type,
+        key=key,
+        video_id=video_id,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+    
+    def notify():
+        from apps.tasks.storage_tasks import process_storage_deletions
+        process_storage_deletions.delay()
+    
+    transaction.on_commit(notify)
+    return deletion
+
+
+def enqueue_video_file_deletion(video):
+    """Queue deletion of a video's file (LOCAL or CLOUD)."""
+    return enqueue_file_deletion(video.storage_type, video.storage_key, video.id)
@@ -0,0 +1,62 @@
+"""
+Deduplicated processing of uploaded videos.
+
+A run of a media task is identified by the task, the video and the version
+of the video's content (where its file is stored, and its size). A video
+records the version it was last processed at, so a redelivered or repeated
+request for work already done is skipped, and a lock on the key in the
+cache (Redis in production) keeps two workers from probing the same file
+at once.
+
+Transient errors are retried with exponential backoff. Permanent ones, and
+transient ones that outlast the retries, mark the video FAILED and leave a
+TaskDeadLetter for an operator to inspect or replay.
+"""
+
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError
+
+# Worth another try: the file's volume, ffprobe or the database may be back
+TRANSIENT_ERRORS = (OSError, OperationalError, InterfaceError)
+
+
+def processing_options():
+    """Return the VIDEO_PROCESSING settings merged with defaults."""
+    options = {
+        'LOCK_SECONDS': 600,
+        'MAX_RETRIES': 5,
+        'RETRY_BACKOFF_SECONDS': 30,
+        'MAX_BACKOFF_SECONDS': 3600,
+        'NOT_FOUND_RETRIES': 3,
+        'NOT_FOUND_BACKOFF_SECONDS': 5,
+    }
+    options.update(getattr(settings, 'VIDEO_PROCESSING', {}))
+    return options
+
+
+def content_version(video):
+    """Identify the current content of ``video``'s file."""
+    source = f'{video.storage_type}:{video.storage_key}:{video.file_size}'
+    return hashlib.sha1(source.encode()).hexdigest()
+
+
+def idempotency_key(task_name, video_id, version):
+    return f'media-task:{task_name}:{video_id}:{version}'
+
+
+def acquire(key):
+    """Take the lock on ``key``; False if another run holds it."""
+    return cache.add(f'{key}:lock', 1, processing_options()['LOCK_SECONDS'])
+
+
+def release(key):
+    cache.delete(f'{key}:lock')
+
+
+def retry_countdown(retries, base=None):
+    """Seconds before retry number ``retries + 1``."""
+    options = processing_options()
+    base = options['RETRY_BACKOFF_SECONDS'] if base is None else base
+    return min(base * 2 ** retries, options['MAX_BACKOFF_SECONDS'])
@@ -0,0 +1,64 @@
+"""
+Upload progress store.
+
+Progress is kept in the cache under the video's id so any web process can
+answer a client's poll while a worker performs the transfer.
+"""
+
+import threading
+import time
+from django.core.cache import cache
+
+PROGRESS_TTL = 24 * 3600
+
+
+def progress_key(video_id):
+    return f'upload-progress:{video_id}'
+
+
+def set_progress(video_id, status, transferred=0, total=0, error=''):
+    """Store the current progress of an upload."""
+    cache.set(progress_key(video_id), {
+        'status': status,
+        'bytes_transferred': transferred,
+        'total_bytes': total,
+        'percent': round(transferred * 100 / total, 1) if total else 0,
+        'error': error,
+        'updated_at': time.time(),
+    }, PROGRESS_TTL)
+
+
+def get_progress(video_id):
+    """Return the stored progress dict for an upload, or None."""
+    return cache.get(progress_key(video_id))
+
+
+class ProgressCallback:
+    """
+    boto3 transfer callback that records progress.
+    
+    boto3 calls it from every part thread with the bytes just sent; writes
+    to the cache are throttled to one per percent or per second.
+    """
+    
+    def __init__(self, video_id, total, min_interval=1.0):
+        self.video_id = video_id
+        self.total = total
+        self.min_interval = min_interval
+        self.transferred = 0
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._last_percent = -1
+    
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self.transferred += bytes_amount
+            percent = int(self.transferred * 100 / self.total) if self.total else 100
+            now = time.monotonic()
+            if percent == self._last_percent and now - self._last_write < self.min_interval:
+                return
+            self._last_percent = percent
+            self._last_write = now
+            transferred = self.transferred
+        
+        set_progress(self.video_id, 'uploading', transferred, self.total)
@@ -3,7 +3,7 @@ Video serializers.
 """
 
 from rest_framework import serializers
-from .models import Video
+from .models import Video, DirectUpload
 
 
 class VideoSerializer(serializers.ModelSerializer):
@@ -12,14 +12,19 @@ class VideoSerializer(serializers.ModelSerializer):
     owner_email = serializers.EmailField(source='owner.email', read_only=True)
     file_size_mb = serializers.FloatField(read_only=True)
     duration_minutes = serializers.FloatField(read_only=True)
+    resume_at = serializers.SerializerMethodField()
     
     class Meta:
         model = Video
-        fields = ['id', 'title', 'storage_type', 'file_path', 'cloud_url',
+        fields = ['id', 'title', 'storage_type', 'file_path', 'cloud_url', 'upload_status', 'processing_status',
                   'file_size', 'file_size_mb', 'duration', 'duration_minutes',
-                  'format', 'thumbnail_url', 'is_active', 'owner_email', 'created_at']
-        read_only_fields = ['id', 'file_path', 'cloud_url', 'thumbnail_url',
+                  'format', 'thumbnail_url', 'is_active', 'owner_email', 'created_at', 'resume_at']
+        read_only_fields = ['id', 'file_path', 'cloud_url', 'upload_status', 'processing_status', 'thumbnail_url',
                             'file_size', 'duration', 'created_at', 'is_active']
+    
+    def get_resume_at(self, obj):
+        """Seconds to resume from, looked up in bulk by the view (``resume_positions`` context)."""
+        return self.context.get('resume_positions', {}).get(str(obj.id))
 
 
 class VideoUploadSerializer(serializers.Serializer):
@@ -27,4 +32,21 @@ class VideoUploadSerializer(serializers.Serializer):
     
     title = serializers.CharField(max_length=255)
     video_file = serializers.FileField()
-    storage_type = serializers.ChoiceField(choices=['LOCAL', 'CLOUD'], default='LOCAL')
\ No newline at end of file
+    storage_type = serializers.ChoiceField(choices=['LOCAL', 'CLOUD'], default='LOCAL')
+
+
+class DirectUploadSerializer(serializers.ModelSerializer):
+    """Serializer for DirectUpload model."""
+    
+    class Meta:
+        model = DirectUpload
+        fields = ['id', 'title', 'format', 'file_size', 'part_size', 'status', 'expires_at', 'created_at']
+        read_only_fields = fields
+
+
+class DirectUploadInitSerializer(serializers.Serializer):
+    """Serializer for starting a direct upload."""
+    
+    title = serializers.CharField(max_length=255)
+    filename = serializers.CharField(max_length=255)
+    file_size = serializers.IntegerField(min_value=1)
@@ -0,0 +1,21 @@
+"""
+Signal handlers recording video changes in the changefeed.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .changefeed import record_video_changes
+from .models import Video
+
+
+@receiver(post_save, sender=Video)
+def record_video_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        record_video_changes([instance])
+        # The next save is compared with what was just written
+        instance._loaded_is_global = instance.is_global
+
+
+@receiver(post_delete, sender=Video)
+def record_video_delete(sender, instance, **kwargs):
+    record_video_changes([instance])
@@ -3,9 +3,27 @@ Storage abstraction for local and cloud uploads.
 """
 
 import os
+from datetime import datetime, timezone
 from django.conf import settings
+from django.core.files.move import file_move_safe
 from django.core.files.storage import FileSystemStorage
-from storages.backends.s3boto3 import S3Boto3Storage
+
+# S3 DeleteObjects accepts at most 1000 keys per call
+S3_DELETE_BATCH = 1000
+
+
+def transfer_options():
+    """Return the S3_TRANSFER settings merged with defaults."""
+    options = {
+        'MULTIPART_THRESHOLD': 16 * 1024 * 1024,
+        'PART_SIZE': 16 * 1024 * 1024,
+        'MAX_CONCURRENCY': 8,
+        'ASYNC_UPLOADS': False,
+        'SPOOL_DIR': os.path.join(settings.BASE_DIR, 'spool'),
+        'MAX_RETRIES': 5,
+    }
+    options.update(getattr(settings, 'S3_TRANSFER', {}))
+    return options
 
 
 class VideoStorage:
@@ -16,9 +34,82 @@ class VideoStorage:
         """Get storage backend based on type."""
         
         if storage_type == 's3' or settings.STORAGE_TYPE == 's3':
-            return S3Boto3Storage()
+            return VideoStorage.s3_storage()
         else:
-            return FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'videos'))
+            return VideoStorage.local_storage()
+    
+    @staticmethod
+    def local_storage():
+        """Filesystem storage for LOCAL videos."""
+        return FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'videos'))
+    
+    @staticmethod
+    def s3_storage():
+        """S3 storage for CLOUD videos."""
+        # boto3/botocore are only loaded when S3 is actually used
+        from storages.backends.s3boto3 import S3Boto3Storage
+        return S3Boto3Storage(transfer_config=VideoStorage.transfer_config())
+    
+    @staticmethod
+    def transfer_config(**overrides):
+        """
+        Multipart transfer settings for S3 uploads and downloads.
+        
+        Files above MULTIPART_THRESHOLD are split into PART_SIZE parts that
+        are sent by up to MAX_CONCURRENCY threads. Keyword arguments
+        override the S3_TRANSFER values.
+        """
+        from boto3.s3.transfer import TransferConfig
+        
+        options = transfer_options()
+        options.update(overrides)
+        return TransferConfig(
+            multipart_threshold=options['MULTIPART_THRESHOLD'],
+            multipart_chunksize=options['PART_SIZE'],
+            max_concurrency=options['MAX_CONCURRENCY'],
+            use_threads=options['MAX_CONCURRENCY'] > 1,
+        )
+    
+    @staticmethod
+    def upload_file(path, filename, callback=None):
+        """
+        Upload a file from local disk to S3 and return its URL.
+        
+        ``callback`` receives the number of bytes sent by each part thread,
+        as with boto3's ``upload_file``.
+        """
+        storage = VideoStorage.s3_storage()
+        key = storage.get_available_name(filename)
+        
+        storage.connection.meta.client.upload_file(
+            path,
+            storage.bucket_name,
+            storage._normalize_name(key),
+            ExtraArgs=storage._get_write_parameters(key),
+            Config=storage.transfer_config,
+            Callback=callback,
+        )
+        return storage.url(key)
+    
+    @staticmethod
+    def spool_path(filename):
+        """Local path a cloud upload is spooled to before transfer."""
+        return os.path.join(transfer_options()['SPOOL_DIR'], filename)
+    
+    @staticmethod
+    def spool_video(file, filename):
+        """Write an uploaded file to the spool directory and return its path."""
+        path = VideoStorage.spool_path(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        if hasattr(file, 'temporary_file_path'):
+            # Large uploads are already on disk; move instead of copying
+            file_move_safe(file.temporary_file_path(), path)
+        else:
+            with open(path, 'wb') as out:
+                for chunk in file.chunks():
+                    out.write(chunk)
+        return path
     
     @staticmethod
     def save_video(file, filename, storage_type='local'):
@@ -41,4 +132,84 @@ class VideoStorage:
             storage.delete(file_path)
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def iter_files(storage_type='local'):
+        """
+        Stream every stored video file as (key, size, last_modified).
+        
+        Local storage is walked with ``os.scandir``; S3 is listed page by
+        page with ``list_objects_v2`` so the full listing is never held in
+        memory.
+        """
+        if storage_type == 's3':
+            storage = VideoStorage.s3_storage()
+            paginator = storage.connection.meta.client.get_paginator('list_objects_v2')
+            prefix = storage.location.rstrip('/') + '/' if storage.location else ''
+            
+            for page in paginator.paginate(Bucket=storage.bucket_name, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    yield obj['Key'][len(prefix):], obj['Size'], obj['LastModified']
+        else:
+            root = VideoStorage.local_storage().location
+            if not os.path.isdir(root):
+                return
+            
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+                        yield entry.name, stat.st_size, modified
+    
+    @staticmethod
+    def delete_many(keys, storage_type='local'):
+        """
+        Delete several files in as few round-trips as possible.
+        
+        Returns (deleted_keys, errors) where errors maps key to message.
+        Files that are already gone count as deleted.
+        """
+        deleted, errors = [], {}
+        
+        if storage_type == 's3':
+            storage = VideoStorage.s3_storage()
+            client = storage.connection.meta.client
+            
+            for start in range(0, len(keys), S3_DELETE_BATCH):
+                chunk = keys[start:start + S3_DELETE_BATCH]
+                try:
+                    response = client.delete_objects(
+                        Bucket=storage.bucket_name,
+                        Delete={
+                            'Objects': [{'Key': storage._normalize_name(key)} for key in chunk],
+                            'Quiet': True,
+                        },
+                    )
+                except Exception as e:
+                    errors.update({key: str(e) for key in chunk})
+                    continue
+                
+                failed = {
+                    error['Key']: error.get('Message', error.get('Code', 'unknown'))
+                    for error in response.get('Errors', [])
+                }
+                for key in chunk:
+                    name = storage._normalize_name(key)
+                    if name in failed:
+                        errors[key] = failed[name]
+                    else:
+                        deleted.append(key)
+        else:
+            storage = VideoStorage.local_storage()
+            for key in keys:
+                try:
+                    os.unlink(storage.path(key))
+                    deleted.append(key)
+                except FileNotFoundError:
+                    deleted.append(key)
+                except Exception as e:
+                    errors[key] = str(e)
+        
+        return deleted, errors
@@ -0,0 +1,269 @@
+"""
+Storage tiering: move cold LOCAL videos to cloud storage and back.
+
+Demotion uploads the local file to S3 with a SHA-256 checksum, confirms the
+stored size, then flips ``file_path``/``cloud_url`` in one conditional
+UPDATE. The local copy is removed later through the storage deletion outbox
+so players that already loaded the old URL keep working for a while.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import shutil
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .changefeed import record_changes
+from .models import Video
+from .outbox import enqueue_file_deletion
+from .storage import VideoStorage
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = 'storage-tiering:lock'
+
+# Single PUT limit; larger files go through a multipart upload
+S3_MAX_PUT_BYTES = 5 * 1024 ** 3
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class TieringError(Exception):
+    """A video could not be moved between tiers."""
+
+
+def _options():
+    """Return the STORAGE_TIERING settings merged with defaults."""
+    options = {
+        'ENABLED': False,
+        'COLD_AFTER_DAYS': 90,
+        'PRESSURE_COLD_AFTER_DAYS': 7,
+        'HIGH_WATER_PERCENT': 85,
+        'LOW_WATER_PERCENT': 70,
+        'MAX_BYTES_PER_RUN': 20 * 1024 ** 3,
+        'MAX_VIDEOS_PER_RUN': 200,
+        'LOCAL_DELETE_DELAY_SECONDS': 3600,
+        'PROMOTE_HOT': False,
+        'PROMOTE_MIN_ACCESSES': 50,
+        'PROMOTE_WINDOW_DAYS': 7,
+        'LOCK_TIMEOUT': 6 * 3600,
+    }
+    options.update(getattr(settings, 'STORAGE_TIERING', {}))
+    return options
+
+
+def disk_usage():
+    """Return (used_bytes, total_bytes) for the local video volume."""
+    location = VideoStorage.local_storage().location
+    os.makedirs(location, exist_ok=True)
+    usage = shutil.disk_usage(location)
+    return usage.used, usage.total
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode()
+
+
+def cold_candidates(cold_after_days):
+    """LOCAL videos idle for at least ``cold_after_days``, coldest first."""
+    cutoff = timezone.now() - timedelta(days=cold_after_days)
+    return (
+        Video.objects.filter(storage_type='LOCAL', is_active=True)
+        .exclude(file_path='')
+        .annotate(last_used=Coalesce('last_accessed_at', 'created_at'))
+        .filter(last_used__lt=cutoff)
+        .order_by('last_used')
+    )
+
+
+def hot_candidates(min_accesses, window_days):
+    """Tiered videos that have been played often and recently since moving."""
+    since = timezone.now() - timedelta(days=window_days)
+    return (
+        Video.objects.filter(
+            storage_type='CLOUD',
+            is_tiered=True,
+            access_count__gte=min_accesses,
+            last_accessed_at__gte=since,
+        )
+        .order_by(F('access_count').desc())
+    )
+
+
+def demote_video(video, local_delete_delay=0):
+    """
+    Move one LOCAL video to cloud storage.
+    
+    Returns True if the row was flipped, False if the video changed while
+    uploading (the uploaded copy is then queued for deletion).
+    """
+    local = VideoStorage.local_storage()
+    s3 = VideoStorage.s3_storage()
+    client = s3.connection.meta.client
+    
+    path = local.path(video.file_path)
+    size = os.path.getsize(path)
+    checksum = _sha256(path)
+    
+    key = s3.get_available_name(video.file_path)
+    name = s3._normalize_name(key)
+    
+    if size <= S3_MAX_PUT_BYTES:
+        # S3 recomputes the checksum and rejects the PUT on mismatch
+        with open(path, 'rb') as f:
+            client.put_object(
+                Bucket=s3.bucket_name, Key=name, Body=f,
+                ContentLength=size, ChecksumSHA256=checksum,
+            )
+    else:
+        # Every part is checksummed and verified by S3
+        client.upload_file(
+            path, s3.bucket_name, name,
+            ExtraArgs={'ChecksumAlgorithm': 'SHA256'},
+        )
+    
+    head = client.head_object(Bucket=s3.bucket_name, Key=name)
+    if head['ContentLength'] != size:
+        enqueue_file_deletion('CLOUD', key, video.id)
+        raise TieringError(f"Size mismatch after upload ({head['ContentLength']} != {size})")
+    
+    with transaction.atomic():
+        flipped = Video.objects.filter(
+            id=video.id, storage_type='LOCAL', file_path=video.file_path,
+        ).update(
+            storage_type='CLOUD',
+            cloud_url=s3.url(key),
+            file_path='',
+            is_tiered=True,
+            access_count=0,
+        )
+        
+        if flipped:
+            record_changes([video.id])
+            enqueue_file_deletion('LOCAL', video.file_path, video.id, delay=local_delete_delay)
+        else:
+            enqueue_file_deletion('CLOUD', key, video.id)
+    
+    return bool(flipped)
+
+
+def promote_video(video):
+    """Move one tiered video back to local disk."""
+    local = VideoStorage.local_storage()
+    s3 = VideoStorage.s3_storage()
+    client = s3.connection.meta.client
+    
+    key = video.storage_key
+    name = s3._normalize_name(key)
+    head = client.head_object(Bucket=s3.bucket_name, Key=name, ChecksumMode='ENABLED')
+    
+    file_path = local.get_available_name(os.path.basename(key))
+    path = local.path(file_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    client.download_file(s3.bucket_name, name, path)
+    
+    expected = head.get('ChecksumSHA256', '')
+    # Multipart objects carry a composite checksum; fall back to size only
+    if os.path.getsize(path) != head['ContentLength'] or (
+        expected and '-' not in expected and _sha256(path) != expected
+    ):
+        os.unlink(path)
+        raise TieringError(f"Downloaded copy of {key} failed verification")
+    
+    with transaction.atomic():
+        flipped = Video.objects.filter(
+            id=video.id, storage_type='CLOUD', cloud_url=video.cloud_url,
+        ).update(
+            storage_type='LOCAL',
+            file_path=file_path,
+            cloud_url='',
+            is_tiered=False,
+        )
+        
+        if flipped:
+            record_changes([video.id])
+            enqueue_file_deletion('CLOUD', key, video.id)
+        else:
+            enqueue_file_deletion('LOCAL', file_path, video.id)
+    
+    return bool(flipped)
+
+
+def run_tiering(dry_run=False):
+    """
+    Run one tiering pass and return a report dict.
+    
+    Videos idle past COLD_AFTER_DAYS are demoted up to the per-run byte and
+    video budgets. When disk usage is above HIGH_WATER_PERCENT the idle
+    threshold drops to PRESSURE_COLD_AFTER_DAYS and demotion continues
+    until usage is projected to fall below LOW_WATER_PERCENT.
+    """
+    options = _options()
+    used, total = disk_usage()
+    pressure = used * 100 >= total * options['HIGH_WATER_PERCENT']
+    low_water = total * options['LOW_WATER_PERCENT'] / 100
+    
+    report = {
+        'dry_run': dry_run,
+        'disk_used_percent': round(used * 100 / total, 1) if total else 0,
+        'pressure': pressure,
+        'demoted': 0,
+        'demoted_bytes': 0,
+        'promoted': 0,
+        'errors': 0,
+    }
+    
+    if not cache.add(LOCK_KEY, 1, options['LOCK_TIMEOUT']):
+        report['skipped'] = 'another tiering run is in progress'
+        return report
+    
+    try:
+        cold_after = options['PRESSURE_COLD_AFTER_DAYS'] if pressure else options['COLD_AFTER_DAYS']
+        candidates = cold_candidates(cold_after)[:options['MAX_VIDEOS_PER_RUN']]
+        
+        for video in candidates:
+            if report['demoted_bytes'] + video.file_size > options['MAX_BYTES_PER_RUN']:
+                break
+            if pressure and used - report['demoted_bytes'] <= low_water:
+                break
+            
+            if dry_run:
+                report['demoted'] += 1
+                report['demoted_bytes'] += video.file_size
+                continue
+            
+            try:
+                if demote_video(video, options['LOCAL_DELETE_DELAY_SECONDS']):
+                    report['demoted'] += 1
+                    report['demoted_bytes'] += video.file_size
+            except Exception as e:
+                report['errors'] += 1
+                logger.error(f"Failed to move video {video.id} to cloud storage: {e}")
+        
+        # Never pull videos back onto a disk that is already filling up
+        if options['PROMOTE_HOT'] and used * 100 < total * options['LOW_WATER_PERCENT']:
+            hot = hot_candidates(options['PROMOTE_MIN_ACCESSES'], options['PROMOTE_WINDOW_DAYS'])
+            for video in hot[:options['MAX_VIDEOS_PER_RUN']]:
+                if dry_run:
+                    report['promoted'] += 1
+                    continue
+                try:
+                    if promote_video(video):
+                        report['promoted'] += 1
+                except Exception as e:
+                    report['errors'] += 1
+                    logger.error(f"Failed to move video {video.id} back to local storage: {e}")
+    finally:
+        cache.delete(LOCK_KEY)
+    
+    logger.info(f"Storage tiering report: {report}")
+    return report
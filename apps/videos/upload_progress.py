@@ -0,0 +1,291 @@
+"""
+Progress of uploads while the request body is still arriving.
+
+A client tags an upload with an ``X-Upload-ID`` header (or ``?upload_id=``).
+``ProgressUploadHandler``, first in ``FILE_UPLOAD_HANDLERS``, counts the
+file bytes as Django reads them and records bytes received, throughput and
+ETA at most once per ``UPDATE_SECONDS``. Records live in Redis, with an
+index of in-flight uploads shared by every node, so the owner can poll any
+process and admins can spot uploads that stopped moving.
+
+Without Redis the records and the index are kept in the Django cache.
+Transfers to cloud storage after the upload are tracked separately, per
+video, in ``apps.videos.progress``.
+"""
+
+import logging
+import re
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadhandler import FileUploadHandler
+from apps.core.utils import redis_cache_enabled
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+
+def _options():
+    """Return the UPLOAD_PROGRESS settings merged with defaults."""
+    options = {
+        'STORE': 'auto',
+        'KEY_PREFIX': 'upload',
+        'UPDATE_SECONDS': 1.0,
+        'MIN_SIZE': 1024 * 1024,
+        'STALL_SECONDS': 30,
+        'TTL_SECONDS': 6 * 3600,
+        'FINISHED_TTL_SECONDS': 600,
+    }
+    options.update(getattr(settings, 'UPLOAD_PROGRESS', {}))
+    return options
+
+
+def _member(user_id, upload_id):
+    return f'{user_id}:{upload_id}'
+
+
+def _parse(record):
+    """Convert a stored record's values back to numbers."""
+    if not record:
+        return None
+    record = {
+        (name.decode() if isinstance(name, bytes) else name): (value.decode() if isinstance(value, bytes) else value)
+        for name, value in record.items()
+    }
+    for name in ('bytes_received', 'total_bytes'):
+        record[name] = int(record[name])
+    for name in ('rate', 'started_at', 'updated_at'):
+        record[name] = float(record[name])
+    return record
+
+
+class RedisUploadStore:
+    """A hash per upload plus a sorted set of in-flight uploads scored by last update."""
+    
+    kind = 'redis'
+    
+    def __init__(self, options):
+        from django_redis import get_redis_connection
+        self.redis = get_redis_connection('default')
+        self.prefix = options['KEY_PREFIX']
+        self.ttl = options['TTL_SECONDS']
+        self.finished_ttl = options['FINISHED_TTL_SECONDS']
+        self.index_key = f'{self.prefix}:inflight'
+    
+    def _key(self, member):
+        return f'{self.prefix}:{member}'
+    
+    def save(self, member, record):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(self._key(member), mapping=record)
+        pipe.expire(self._key(member), self.ttl)
+        pipe.zadd(self.index_key, {member: record['updated_at']})
+        pipe.execute()
+    
+    def finish(self, member, record):
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(self._key(member), mapping=record)
+        pipe.expire(self._key(member), self.finished_ttl)
+        pipe.zrem(self.index_key, member)
+        pipe.execute()
+    
+    def get(self, member):
+        return _parse(self.redis.hgetall(self._key(member)))
+    
+    def in_flight(self):
+        # Uploads whose process died without finishing them drop out after TTL_SECONDS
+        self.redis.zremrangebyscore(self.index_key, '-inf', time.time() - self.ttl)
+        members = [
+            member.decode() if isinstance(member, bytes) else member
+            for member in self.redis.zrevrange(self.index_key, 0, -1)
+        ]
+        pipe = self.redis.pipeline(transaction=False)
+        for member in members:
+            pipe.hgetall(self._key(member))
+        return [(member, _parse(record)) for member, record in zip(members, pipe.execute()) if record]
+
+
+class CacheUploadStore:
+    """Fallback for deployments without Redis; the index is a dict in the cache."""
+    
+    kind = 'cache'
+    
+    def __init__(self, options):
+        self.prefix = options['KEY_PREFIX']
+        self.ttl = options['TTL_SECONDS']
+        self.finished_ttl = options['FINISHED_TTL_SECONDS']
+        self.index_key = f'{self.prefix}:inflight'
+        self._lock = threading.Lock()
+    
+    def _key(self, member):
+        return f'{self.prefix}:{member}'
+    
+    def _index(self, member, updated_at):
+        with self._lock:
+            index = cache.get(self.index_key) or {}
+            if updated_at is None:
+                index.pop(member, None)
+            else:
+                index[member] = updated_at
+            cache.set(self.index_key, index, self.ttl)
+    
+    def save(self, member, record):
+        cache.set(self._key(member), record, self.ttl)
+        self._index(member, record['updated_at'])
+    
+    def finish(self, member, record):
+        cache.set(self._key(member), record, self.finished_ttl)
+        self._index(member, None)
+    
+    def get(self, member):
+        return cache.get(self._key(member))
+    
+    def in_flight(self):
+        cutoff = time.time() - self.ttl
+        index = cache.get(self.index_key) or {}
+        members = sorted((m for m, updated in index.items() if updated >= cutoff), key=index.get, reverse=True)
+        records = cache.get_many([self._key(member) for member in members])
+        return [
+            (member, records[self._key(member)])
+            for member in members if self._key(member) in records
+        ]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return this process's upload progress store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                options = _options()
+                kind = options['STORE']
+                if kind == 'auto':
+                    kind = 'redis' if redis_cache_enabled() else 'cache'
+                _store = (RedisUploadStore if kind == 'redis' else CacheUploadStore)(options)
+    return _store
+
+
+def describe(upload_id, record, now=None):
+    """Public view of a record, with percent, ETA and whether it has stalled."""
+    now = now or time.time()
+    received, total, rate = record['bytes_received'], record['total_bytes'], record['rate']
+    receiving = record['status'] == 'receiving'
+    return {
+        'upload_id': upload_id,
+        'user_id': record['user_id'],
+        'filename': record['filename'],
+        'status': record['status'],
+        'bytes_received': received,
+        'total_bytes': total,
+        'percent': round(min(received * 100 / total, 100), 1) if total else 0,
+        'bytes_per_second': round(rate),
+        'eta_seconds': round(max(total - received, 0) / rate) if receiving and rate else None,
+        'started_at': record['started_at'],
+        'updated_at': record['updated_at'],
+        'stalled': receiving and now - record['updated_at'] > _options()['STALL_SECONDS'],
+    }
+
+
+def get_upload(user_id, upload_id):
+    """Return the described upload ``upload_id`` of ``user_id``, or None."""
+    record = get_store().get(_member(user_id, upload_id))
+    return describe(upload_id, record) if record else None
+
+
+def in_flight_uploads(user_id=None):
+    """Return the described uploads still receiving, newest activity first."""
+    now = time.time()
+    uploads = []
+    for member, record in get_store().in_flight():
+        owner, upload_id = member.split(':', 1)
+        if user_id is None or owner == str(user_id):
+            uploads.append(describe(upload_id, record, now))
+    return uploads
+
+
+class ProgressUploadHandler(FileUploadHandler):
+    """
+    Record the progress of uploads tagged with an upload id.
+    
+    Every chunk is passed on unchanged to the next handler, which stores
+    the file; untagged and small uploads are not tracked.
+    """
+    
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.member = None
+    
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        options = _options()
+        upload_id = META.get('HTTP_X_UPLOAD_ID') or self.request.GET.get('upload_id')
+        user = getattr(self.request, 'user', None)
+        if (
+            not upload_id or not UPLOAD_ID_PATTERN.match(upload_id)
+            or user is None or not user.is_authenticated
+            or content_length < options['MIN_SIZE']
+        ):
+            return None
+        
+        now = time.time()
+        self.member = _member(user.id, upload_id)
+        self.update_seconds = options['UPDATE_SECONDS']
+        self.record = {
+            'user_id': str(user.id),
+            'filename': '',
+            'status': 'receiving',
+            'bytes_received': 0,
+            'total_bytes': content_length,
+            'rate': 0.0,
+            'started_at': now,
+            'updated_at': now,
+        }
+        self.received = 0
+        self._last_write = (time.monotonic(), 0)
+        self._save(get_store().save)
+        return None
+    
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if self.member and not self.record['filename']:
+            self.record['filename'] = file_name
+    
+    def receive_data_chunk(self, raw_data, start):
+        if self.member:
+            self.received += len(raw_data)
+            written_at, written_bytes = self._last_write
+            elapsed = time.monotonic() - written_at
+            if elapsed >= self.update_seconds:
+                self.record['rate'] = (self.received - written_bytes) / elapsed
+                self._last_write = (time.monotonic(), self.received)
+                self._save(get_store().save)
+        return raw_data
+    
+    def file_complete(self, file_size):
+        # The next handler builds the UploadedFile
+        return None
+    
+    def upload_interrupted(self):
+        # Followed by upload_complete(), which records it
+        if self.member:
+            self.record['status'] = 'interrupted'
+    
+    def upload_complete(self):
+        if self.member:
+            if self.record['status'] == 'receiving':
+                self.record['status'] = 'received'
+            self._save(get_store().finish)
+    
+    def _save(self, write):
+        self.record['bytes_received'] = self.received
+        self.record['updated_at'] = time.time()
+        try:
+            write(self.member, self.record)
+        except Exception as e:
+            # Progress is informational; never fail the upload over it
+            logger.warning(f"Failed to record progress of upload {self.member}: {e}")
@@ -0,0 +1,83 @@
+"""
+Storing uploaded video files for new Video rows.
+"""
+
+import os
+import uuid
+from django.conf import settings
+from django.db import transaction
+from .models import Video
+from .storage import VideoStorage, transfer_options
+from .validators import validate_video_upload
+
+
+def save_uploaded_video(video_file, filename, storage_type):
+    """
+    Store an uploaded file and return the Video fields that point at it.
+    
+    With S3_TRANSFER['ASYNC_UPLOADS'] enabled, cloud uploads are only
+    spooled to local disk here and marked PENDING; ``start_processing``
+    then hands the transfer to a worker so the request returns at once.
+    """
+    if storage_type == 'CLOUD':
+        if transfer_options()['ASYNC_UPLOADS']:
+            VideoStorage.spool_video(video_file, filename)
+            return {'file_path': '', 'cloud_url': '', 'upload_status': 'PENDING'}
+        return {'file_path': '', 'cloud_url': VideoStorage.save_video(video_file, filename, 's3')}
+    
+    return {'file_path': VideoStorage.save_video(video_file, filename, 'local'), 'cloud_url': ''}
+
+
+def task_priority(user):
+    """Broker priority of ``user``'s upload processing, from their plan."""
+    plan_name = user.plan.name.upper() if user.plan else ''
+    return settings.VIDEO_CONSTRAINTS.get(plan_name, {}).get('task_priority', settings.CELERY_TASK_DEFAULT_PRIORITY)
+
+
+def start_processing(video, filename):
+    """Queue the background work for a newly created Video, premium plans first."""
+    from apps.tasks.video_tasks import process_video_metadata, upload_spooled_video
+    
+    priority = task_priority(video.owner)
+    # The worker must not look for the row (or the spooled file) before it is committed
+    if video.upload_status == 'PENDING':
+        transaction.on_commit(
+            lambda: upload_spooled_video.apply_async((str(video.id), filename), priority=priority)
+        )
+    else:
+        # The video is usable without its metadata, so a broker error is only
+        # logged; the video is left with processing_status PENDING
+        transaction.on_commit(
+            lambda: process_video_metadata.apply_async((str(video.id),), priority=priority),
+            robust=True,
+        )
+
+
+def create_uploaded_video(owner, title, video_file, storage_type):
+    """
+    Validate, store and record a video uploaded through the API.
+    
+    Raises PlanLimitExceeded/FileValidationError when the plan doesn't
+    allow the file; nothing is kept if any step fails.
+    """
+    file_ext = os.path.splitext(video_file.name)[1][1:].lower()
+    
+    with transaction.atomic():
+        validate_video_upload(owner, video_file, file_ext)
+        
+        filename = f"{uuid.uuid4()}.{file_ext}"
+        stored = save_uploaded_video(video_file, filename, storage_type)
+        
+        video = Video.objects.create(
+            owner=owner,
+            title=title,
+            storage_type=storage_type,
+            **stored,
+            file_size=video_file.size,
+            format=file_ext
+        )
+        
+        # Queue metadata extraction (or the cloud transfer) once the row is committed
+        start_processing(video, filename)
+    
+    return video
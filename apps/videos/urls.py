@@ -1,8 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import VideoViewSet
+from .views import VideoViewSet, DirectUploadViewSet, UploadProgressViewSet
+from . import async_views
 
 router = DefaultRouter()
+# Registered first so the video detail route doesn't swallow the prefix
+router.register(r'direct-uploads', DirectUploadViewSet, basename='direct-upload')
+router.register(r'uploads', UploadProgressViewSet, basename='upload')
 router.register(r'', VideoViewSet, basename='video')
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = [
+    # Async endpoints, intended to be served through config.asgi
+    path('async/upload/', async_views.upload_video, name='video-upload-async'),
+    path('async/playlist/', async_views.playlist, name='video-playlist-async'),
+    path('<uuid:video_id>/stream/', async_views.stream_video, name='video-stream'),
+] + router.urls
\ No newline at end of file
@@ -4,11 +4,15 @@ Video file validators.
 
 from django.conf import settings
 from apps.core.exceptions import FileValidationError, PlanLimitExceeded
-import ffmpeg
 
 
 def validate_video_upload(user, file, format):
     """Validate video upload against plan limits."""
+    return validate_upload_limits(user, file.size, format)
+
+
+def validate_upload_limits(user, file_size, format):
+    """Validate a video of ``file_size`` bytes against plan limits."""
     
     if not user.plan:
         raise PlanLimitExceeded("No active plan")
@@ -18,9 +22,9 @@ def validate_video_upload(user, file, format):
     
     # Check file size
     max_size = constraints.get('max_file_size', 0)
-    if file.size > max_size:
+    if file_size > max_size:
         raise FileValidationError(
-            f"File size {file.size // (1024*1024)}MB exceeds limit of {max_size // (1024*1024)}MB"
+            f"File size {file_size // (1024*1024)}MB exceeds limit of {max_size // (1024*1024)}MB"
         )
     
     # Check format
@@ -31,33 +35,48 @@ def validate_video_upload(user, file, format):
         )
     
     # Check video count
-    can_upload, message = user.can_upload_video(file.size)
+    can_upload, message = user.can_upload_video(file_size)
     if not can_upload:
         raise PlanLimitExceeded(message)
     
     return True
 
 
+class MetadataError(Exception):
+    """Raised when FFmpeg can't read a file; retrying won't help."""
+
+
 def extract_video_metadata(file_path):
-    """Extract video metadata using FFmpeg."""
+    """
+    Extract video metadata using FFmpeg.
+    
+    Raises MetadataError for a file FFmpeg rejects; OSError (e.g. ffprobe
+    or the file's volume unavailable) is left to the caller to retry.
+    """
+    
+    # Imported on first use to keep worker startup light
+    import ffmpeg
     
     try:
         probe = ffmpeg.probe(file_path)
-        video_stream = next(
-            (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
-            None
-        )
-        
-        if video_stream:
-            duration = float(probe['format']['duration'])
-            return {
-                'duration': int(duration),
-                'width': video_stream.get('width'),
-                'height': video_stream.get('height'),
-                'codec': video_stream.get('codec_name'),
-            }
-    except Exception as e:
-        # Fallback if FFmpeg fails
-        return {'duration': 0}
-    
-    return {'duration': 0}
\ No newline at end of file
+    except ffmpeg.Error as e:
+        raise MetadataError(e.stderr.decode(errors='replace').strip()[-500:] if e.stderr else str(e))
+    
+    video_stream = next(
+        (stream for stream in probe['streams'] if stream['codec_type'] == 'video'),
+        None
+    )
+    if video_stream is None:
+        raise MetadataError('No video stream found')
+    
+    try:
+        duration = float(probe['format']['duration'])
+    except (KeyError, ValueError):
+        raise MetadataError('Duration missing from probe')
+    
+    return {
+        'duration': int(duration),
+        'width': video_stream.get('width'),
+        'height': video_stream.get('height'),
+        'codec': video_stream.get('codec_name'),
+    }
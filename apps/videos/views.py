@@ -6,20 +6,27 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db import transaction
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
-from django.db import models
+from django.conf import settings
 
-from .models import Video
-from .serializers import VideoSerializer, VideoUploadSerializer
-from .validators import validate_video_upload, extract_video_metadata
-from .storage import VideoStorage
+from .models import Video, DirectUpload
+from .serializers import (
+    VideoSerializer, VideoUploadSerializer, DirectUploadSerializer, DirectUploadInitSerializer
+)
+from .direct_uploads import (
+    DirectUploadError, reserve_upload, presign_parts, complete_upload, abort_upload
+)
+from .access import record_access
+from .changefeed import ChangefeedError, changes_since
+from .progress import get_progress
+from .upload_progress import get_upload, in_flight_uploads
+from .uploads import create_uploaded_video
+from apps.playback.resume import resume_positions
 from apps.accounts.permissions import IsActiveUser, CanAccessVideo, CanUploadVideo
-from apps.tasks.video_tasks import process_video_metadata
+from apps.core.exceptions import PlanLimitExceeded, FileValidationError
 
 import os
-import uuid
 
 
 class VideoViewSet(viewsets.ModelViewSet):
@@ -31,9 +38,26 @@ class VideoViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return videos based on user role."""
-        if self.request.user.is_admin:
+        if self.action == 'upload_progress':
+            # Followed through to READY or FAILED, and failed uploads are deactivated
             return Video.objects.all()
-        return Video.objects.filter(models.Q(owner=self.request.user) | models.Q(is_global=True), is_active=True)
+        return Video.objects.visible_to(self.request.user).filter(upload_status='READY').select_related('owner')
+    
+    def get_serializer(self, *args, **kwargs):
+        """Add resume positions for the videos being read, fetched in one call."""
+        if args and self.request.method == 'GET':
+            videos = args[0] if kwargs.get('many') else [args[0]]
+            kwargs['context'] = {
+                **self.get_serializer_context(),
+                'resume_positions': resume_positions(self.request.user, [video.id for video in videos]),
+            }
+        return super().get_serializer(*args, **kwargs)
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Get a video; TV and mobile clients play it from the URL returned."""
+        response = super().retrieve(request, *args, **kwargs)
+        record_access(kwargs['pk'], viewer=request.user.id)
+        return response
     
     @method_decorator(ratelimit(key='user', rate='100/h', method='POST'))
     @action(detail=False, methods=['post'], permission_classes=[CanUploadVideo])
@@ -47,51 +71,19 @@ class VideoViewSet(viewsets.ModelViewSet):
         title = serializer.validated_data['title']
         storage_type = serializer.validated_data['storage_type']
         
-        # Detect format
-        file_ext = os.path.splitext(video_file.name)[1][1:].lower()
+        # Check cloud upload permission
+        if storage_type == 'CLOUD' and request.user.plan and not request.user.plan.cloud_upload_allowed:
+            return Response({
+                'error': 'Cloud upload not allowed for your plan'
+            }, status=status.HTTP_403_FORBIDDEN)
         
         try:
-            with transaction.atomic():
-                # Validate upload
-                validate_video_upload(request.user, video_file, file_ext)
-                
-                # Check cloud upload permission
-                if storage_type == 'CLOUD' and not request.user.plan.cloud_upload_allowed:
-                    return Response({
-                        'error': 'Cloud upload not allowed for your plan'
-                    }, status=status.HTTP_403_FORBIDDEN)
-                
-                # Generate unique filename
-                filename = f"{uuid.uuid4()}.{file_ext}"
-                
-                # Save file
-                if storage_type == 'CLOUD':
-                    file_url = VideoStorage.save_video(video_file, filename, 's3')
-                    cloud_url = file_url
-                    file_path = ''
-                else:
-                    file_path = VideoStorage.save_video(video_file, filename, 'local')
-                    cloud_url = ''
-                
-                # Create video record
-                video = Video.objects.create(
-                    owner=request.user,
-                    title=title,
-                    storage_type=storage_type,
-                    file_path=file_path,
-                    cloud_url=cloud_url,
-                    file_size=video_file.size,
-                    format=file_ext
-                )
-                
-                # Trigger background task for metadata extraction
-                # If this fails (e.g. broker down), transaction rolls back
-                process_video_metadata.delay(str(video.id))
-                
-                return Response(
-                    VideoSerializer(video).data,
-                    status=status.HTTP_201_CREATED
-                )
+            video = create_uploaded_video(request.user, title, video_file, storage_type)
+            
+            return Response(
+                VideoSerializer(video).data,
+                status=status.HTTP_202_ACCEPTED if video.upload_status == 'PENDING' else status.HTTP_201_CREATED
+            )
         
         except Exception as e:
             # Delete file if we saved it locally or on cloud but DB failed
@@ -100,13 +92,150 @@ class VideoViewSet(viewsets.ModelViewSet):
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=True, methods=['get'], url_path='upload-progress')
+    def upload_progress(self, request, pk=None):
+        """Get the progress of a video's transfer to cloud storage."""
+        video = self.get_object()
+        progress = get_progress(video.id)
+        
+        if progress is None:
+            # Synchronous uploads and expired entries have nothing stored
+            done = video.upload_status == 'READY'
+            progress = {
+                'status': 'done' if done else video.upload_status.lower(),
+                'bytes_transferred': video.file_size if done else 0,
+                'total_bytes': video.file_size,
+                'percent': 100 if done else 0,
+                'error': '',
+            }
+        
+        return Response({'video_id': str(video.id), 'upload_status': video.upload_status, **progress})
+    
     @action(detail=False, methods=['get'])
     def playlist(self, request):
         """Get user's playlist."""
-        videos = self.get_queryset().filter(is_active=True)
+        videos = self.get_queryset().playable().order_by('-created_at')
         serializer = self.get_serializer(videos, many=True)
         
         return Response({
             'videos': serializer.data,
             'loop_enabled': request.user.plan.playlist_loop_allowed if request.user.plan else False
-        })
\ No newline at end of file
+        })
+    
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Get what changed in the user's videos since ``?cursor=``.
+        
+        Without a cursor, or with one that's too old, the response only
+        carries ``resync`` and the cursor to continue from after reloading
+        the full list.
+        """
+        try:
+            limit = int(request.query_params.get('limit') or 0)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            delta = changes_since(request.user, request.query_params.get('cursor'), limit)
+        except ChangefeedError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'resync': delta['resync'],
+            'cursor': delta['cursor'],
+            'has_more': delta['has_more'],
+            'videos': self.get_serializer(delta['videos'], many=True).data,
+            'deleted': delta['deleted'],
+        })
+
+
+class DirectUploadViewSet(viewsets.GenericViewSet):
+    """
+    Presigned multipart uploads straight to cloud storage.
+    
+    The client PUTs each part to its presigned URL, then calls ``complete``;
+    the file itself never passes through this server.
+    """
+    
+    serializer_class = DirectUploadSerializer
+    permission_classes = [IsActiveUser, CanUploadVideo]
+    
+    def get_queryset(self):
+        return DirectUpload.objects.filter(owner=self.request.user)
+    
+    @method_decorator(ratelimit(key='user', rate='100/h', method='POST'))
+    def create(self, request):
+        """Reserve quota and return presigned part URLs."""
+        
+        serializer = DirectUploadInitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        if settings.STORAGE_TYPE != 's3':
+            return Response({
+                'error': 'Cloud storage is not configured'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not request.user.plan or not request.user.plan.cloud_upload_allowed:
+            return Response({
+                'error': 'Cloud upload not allowed for your plan'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        file_ext = os.path.splitext(serializer.validated_data['filename'])[1][1:].lower()
+        
+        try:
+            upload = reserve_upload(
+                request.user,
+                serializer.validated_data['title'],
+                file_ext,
+                serializer.validated_data['file_size'],
+            )
+        except (PlanLimitExceeded, FileValidationError) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response({
+            **DirectUploadSerializer(upload).data,
+            'parts': presign_parts(upload),
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        """Verify the uploaded object and create its video."""
+        upload = self.get_object()
+        
+        try:
+            video = complete_upload(upload)
+        except DirectUploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(VideoSerializer(video).data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'])
+    def abort(self, request, pk=None):
+        """Cancel an upload and release its quota."""
+        abort_upload(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadProgressViewSet(viewsets.ViewSet):
+    """
+    Progress of uploads tagged with an ``X-Upload-ID`` header while they arrive.
+    
+    Users see their own uploads; the list shows admins every in-flight
+    upload across all nodes.
+    """
+    
+    permission_classes = [IsActiveUser]
+    
+    def list(self, request):
+        user_id = None if request.user.is_admin else request.user.id
+        return Response({'uploads': in_flight_uploads(user_id)})
+    
+    def retrieve(self, request, pk=None):
+        upload = get_upload(request.user.id, pk)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(upload)
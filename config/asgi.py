@@ -2,12 +2,15 @@
 ASGI config for Aura Link project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with uvicorn, e.g.::
+
+    gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
 import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 application = get_asgi_application()
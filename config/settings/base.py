@@ -5,6 +5,7 @@ Django base settings for Aura Link project.
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from kombu import Queue
 import os
 
 # Build paths inside the project
@@ -39,6 +40,7 @@ INSTALLED_APPS = [
     'apps.billing',
     'apps.tasks',
     'apps.core',
+    'apps.playback',
 ]
 
 MIDDLEWARE = [
@@ -50,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.middleware.PerformanceMiddleware',
     'apps.accounts.middleware.PlanEnforcementMiddleware',
 ]
 
@@ -93,9 +96,11 @@ DATABASES = {
 AUTH_USER_MODEL = 'accounts.User'
 
 # Authentication Backends
+# EmailOrUsernameBackend extends ModelBackend and already covers email
+# logins; a ModelBackend fallback would hash every failed login a second
+# time outside the bounded hashing executor.
 AUTHENTICATION_BACKENDS = [
     'apps.accounts.backends.EmailOrUsernameBackend',  # Email or username login
-    'django.contrib.auth.backends.ModelBackend',  # Fallback to default
 ]
 
 # Password validation
@@ -117,6 +122,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: PBKDF2 by default, opt in to a faster memory-hard hasher.
+# Existing hashes are upgraded transparently on the next successful login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')  # pbkdf2, scrypt or argon2
+_PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',  # requires argon2-cffi
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Bounded executor for login password hashing
+LOGIN_HASHING = {
+    'MAX_WORKERS': config('LOGIN_HASH_WORKERS', default=4, cast=int),
+    'QUEUE_SIZE': config('LOGIN_HASH_QUEUE_SIZE', default=16, cast=int),  # reject beyond workers + queue
+    'TIMEOUT': 10,  # seconds to wait for a queued hash
+    'PER_IP_LIMIT': 4,  # concurrent hashes per client IP
+    'PER_ACCOUNT_LIMIT': 2,  # concurrent hashes per login identifier
+    'SLOT_TTL': 30,  # seconds before a leaked concurrency slot expires
+}
+
 # Login/Logout Redirects
 LOGIN_REDIRECT_URL = 'landing'
 LOGOUT_REDIRECT_URL = 'login'
@@ -143,7 +170,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -157,6 +184,7 @@ REST_FRAMEWORK = {
         'user': '1000/hour',
         'anon': '100/hour',
         'upload': '100/hour',
+        'playback': '3600/hour',  # players batch events; about one post per second
     },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -176,6 +204,13 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# Cached user lookups for JWT-authenticated API requests
+AUTH_USER_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': config('AUTH_USER_CACHE_TIMEOUT', default=60, cast=int),  # seconds
+    'EAGER_PLAN': config('AUTH_USER_CACHE_EAGER_PLAN', default=True, cast=bool),  # bundle plan into entry
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -183,6 +218,46 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Task modules aren't named tasks.py, so autodiscovery doesn't find them
+CELERY_IMPORTS = [
+    'apps.tasks.video_tasks',
+    'apps.tasks.subscription_tasks',
+    'apps.tasks.cleanup_tasks',
+    'apps.tasks.storage_tasks',
+    'apps.tasks.moderation_tasks',
+    'apps.tasks.playback_tasks',
+    'apps.tasks.benchmark_tasks',
+]
+
+# Queues: media jobs users wait on, long media transfers and admin bulk jobs,
+# and periodic maintenance. Each queue gets its own workers (see README), so
+# a long beat job or transfer never holds up the metadata of a new upload.
+CELERY_TASK_QUEUES = [Queue('media_interactive'), Queue('media_bulk'), Queue('maintenance')]
+CELERY_TASK_DEFAULT_QUEUE = 'maintenance'
+CELERY_TASK_ROUTES = {
+    'apps.tasks.video_tasks.process_video_metadata': {'queue': 'media_interactive'},
+    'apps.tasks.video_tasks.upload_spooled_video': {'queue': 'media_bulk'},
+    'apps.tasks.moderation_tasks.*': {'queue': 'media_bulk'},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # a worker reserves one job per process, so a queued job isn't stuck behind a long one
+# On Redis, priority 0 is served first; plans set their own (VIDEO_CONSTRAINTS 'task_priority')
+CELERY_TASK_DEFAULT_PRIORITY = 6
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    # An unacknowledged job is redelivered after this long, so it must exceed the longest job
+    'visibility_timeout': config('CELERY_VISIBILITY_TIMEOUT', default=4 * 3600, cast=int),  # seconds
+}
+# Long jobs are acknowledged only when they finish, so one lost with its worker is
+# redelivered; the time limit stops a run before the broker would hand it out again
+CELERY_TASK_ANNOTATIONS = {
+    task: {'acks_late': True, 'time_limit': CELERY_BROKER_TRANSPORT_OPTIONS['visibility_timeout'] - 600}
+    for task in (
+        'apps.tasks.video_tasks.upload_spooled_video',
+        'apps.tasks.moderation_tasks.run_bulk_action',
+        'apps.tasks.cleanup_tasks.collect_orphaned_video_files',
+        'apps.tasks.storage_tasks.run_storage_tiering',
+    )
+}
+
 CELERY_BEAT_SCHEDULE = {
     'check-expired-subscriptions': {
         'task': 'apps.tasks.subscription_tasks.check_expired_subscriptions',
@@ -192,6 +267,38 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.tasks.cleanup_tasks.cleanup_audit_logs',
         'schedule': timedelta(days=7),
     },
+    'process-storage-deletions': {
+        'task': 'apps.tasks.storage_tasks.process_storage_deletions',
+        'schedule': timedelta(minutes=1),
+    },
+    'run-storage-tiering': {
+        'task': 'apps.tasks.storage_tasks.run_storage_tiering',
+        'schedule': timedelta(hours=1),
+    },
+    'expire-stale-direct-uploads': {
+        'task': 'apps.tasks.storage_tasks.expire_stale_direct_uploads',
+        'schedule': timedelta(minutes=15),
+    },
+    'collect-orphaned-video-files': {
+        'task': 'apps.tasks.cleanup_tasks.collect_orphaned_video_files',
+        'schedule': timedelta(days=1),
+    },
+    'purge-video-changes': {
+        'task': 'apps.tasks.cleanup_tasks.purge_video_changes',
+        'schedule': timedelta(days=1),
+    },
+    'drain-playback-events': {
+        'task': 'apps.tasks.playback_tasks.drain_playback_events',
+        'schedule': timedelta(seconds=10),
+    },
+    'flush-resume-positions': {
+        'task': 'apps.tasks.playback_tasks.flush_resume_positions',
+        'schedule': timedelta(minutes=1),
+    },
+    'maintain-playback-partitions': {
+        'task': 'apps.tasks.playback_tasks.maintain_playback_partitions',
+        'schedule': timedelta(days=1),
+    },
 }
 
 # Redis Cache
@@ -223,6 +330,11 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+FILE_UPLOAD_HANDLERS = [
+    'apps.videos.upload_progress.ProgressUploadHandler',  # passes chunks on; must come first
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
 # Video Constraints by Plan
@@ -235,6 +347,7 @@ VIDEO_CONSTRAINTS = {
         'total_storage': 500 * 1024 * 1024,  # 500MB
         'cloud_upload': False,
         'playlist_loop': False,
+        'task_priority': 6,  # broker priority of upload processing, 0 runs first
     },
     'PREMIUM': {
         'max_file_size': 500 * 1024 * 1024,  # 500MB
@@ -244,6 +357,7 @@ VIDEO_CONSTRAINTS = {
         'total_storage': 50 * 1024 * 1024 * 1024,  # 50GB
         'cloud_upload': True,
         'playlist_loop': True,
+        'task_priority': 0,
     }
 }
 
@@ -261,6 +375,25 @@ if STORAGE_TYPE == 's3':
     AWS_DEFAULT_ACL = 'private'
     AWS_QUERYSTRING_EXPIRE = 3600  # 1 hour
 
+# S3 multipart transfer tuning for cloud uploads
+S3_TRANSFER = {
+    'MULTIPART_THRESHOLD': config('S3_MULTIPART_THRESHOLD', default=16 * 1024 * 1024, cast=int),
+    'PART_SIZE': config('S3_PART_SIZE', default=16 * 1024 * 1024, cast=int),
+    'MAX_CONCURRENCY': config('S3_MAX_CONCURRENCY', default=8, cast=int),
+    # Spool cloud uploads to disk and transfer them from a Celery worker.
+    # SPOOL_DIR must be shared between web and worker hosts.
+    'ASYNC_UPLOADS': config('ASYNC_CLOUD_UPLOADS', default=False, cast=bool),
+    'SPOOL_DIR': config('UPLOAD_SPOOL_DIR', default=str(BASE_DIR / 'spool')),
+    'MAX_RETRIES': 5,
+}
+
+# Presigned direct-to-S3 uploads. The bucket's CORS policy must allow PUT
+# from the web origin; an AbortIncompleteMultipartUpload lifecycle rule is
+# a useful backstop for parts the expiry task never sees.
+DIRECT_UPLOADS = {
+    'RESERVATION_SECONDS': 6 * 3600,  # quota hold and presigned URL lifetime
+}
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -311,8 +444,169 @@ os.makedirs(BASE_DIR / 'logs', exist_ok=True)
 RATELIMIT_ENABLE = True
 RATELIMIT_USE_CACHE = 'default'
 
+# Reverse proxies in front of the app (nginx); X-Forwarded-For entries they
+# append are trusted, anything further left came from the client
+TRUSTED_PROXIES = [ip.strip() for ip in config('TRUSTED_PROXIES', default='127.0.0.1,::1').split(',') if ip.strip()]
+
+# Request performance instrumentation
+PERFORMANCE_MONITORING = {
+    'ENABLED': config('PERF_MONITORING_ENABLED', default=True, cast=bool),
+    'SAMPLE_RATE': config('PERF_SAMPLE_RATE', default=1.0, cast=float),  # fraction of requests measured
+    'SERVER_TIMING': config('PERF_SERVER_TIMING', default=False, cast=bool),  # timings sent to every client
+    'SLOW_REQUEST_MS': config('PERF_SLOW_REQUEST_MS', default=1000, cast=int),
+    'SLOW_REQUEST_TOP_SQL': 5,  # slowest statements included in the slow-request log
+}
+
+# Health probes
+HEALTH_CHECK = {
+    'CACHE_TTL': config('HEALTH_CHECK_CACHE_TTL', default=5, cast=int),  # seconds results are reused
+    'PROBE_TIMEOUT': 2,  # seconds per probe run
+    'MIN_FREE_DISK_MB': config('HEALTH_MIN_FREE_DISK_MB', default=1024, cast=int),
+    'READINESS_PROBES': ['database', 'redis'],  # must pass for /health/ready/
+}
+
+# Import ffmpeg/libmagic/boto3 and the URLconf at startup instead of first use.
+# Enable together with gunicorn --preload so forked workers share them.
+PREFORK_WARMUP = config('PREFORK_WARMUP', default=False, cast=bool)
+
+# Startup import budget enforced by `manage.py check_import_time`
+IMPORT_TIME_BUDGET_MS = config('IMPORT_TIME_BUDGET_MS', default=2000, cast=int)
+
+# Client addresses allowed to scrape /metrics (resolved through TRUSTED_PROXIES),
+# unless a bearer token is set, which is then required instead
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',')
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # Subscription Grace Period
 SUBSCRIPTION_GRACE_PERIOD_DAYS = 7
 
 # Audit Log Retention
 AUDIT_LOG_RETENTION_DAYS = 90
+
+# Progress of uploads tagged with an X-Upload-ID header (GET /api/v1/videos/uploads/)
+UPLOAD_PROGRESS = {
+    'STORE': config('UPLOAD_PROGRESS_STORE', default='auto'),  # redis, cache, or auto (redis if the cache is)
+    'UPDATE_SECONDS': 1.0,  # at most one write per upload this often
+    'MIN_SIZE': 1024 * 1024,  # smaller request bodies aren't tracked
+    'STALL_SECONDS': 30,  # no data for this long marks an upload as stalled
+    'TTL_SECONDS': 6 * 3600,  # in-flight entries whose process died are dropped after this
+    'FINISHED_TTL_SECONDS': 600,  # finished uploads stay readable this long
+}
+
+# Deduplicated metadata processing of uploaded videos (see apps.videos.processing)
+VIDEO_PROCESSING = {
+    'LOCK_SECONDS': 600,  # a run holding the lock longer is assumed dead
+    'MAX_RETRIES': 5,  # for transient errors (then dead-lettered) and while another run holds the lock
+    'RETRY_BACKOFF_SECONDS': 30,  # doubled on every retry
+    'MAX_BACKOFF_SECONDS': 3600,
+    'NOT_FOUND_RETRIES': 3,  # a task can arrive before the upload's row is committed
+    'NOT_FOUND_BACKOFF_SECONDS': 5,
+}
+
+# Server-sent push events (GET /api/v1/events/)
+PUSH_EVENTS = {
+    'CHANNEL': config('PUSH_EVENTS_CHANNEL', default='auto'),  # redis, cache, or auto (redis if the cache is)
+    'MAX_EVENTS': 100,  # kept per user for clients reconnecting with Last-Event-ID
+    'TTL_SECONDS': 24 * 3600,  # an idle user's stream expires
+    'HEARTBEAT_SECONDS': 15,  # comment sent when nothing happened for this long
+    'MAX_CONNECTION_SECONDS': 3600,  # then the client reconnects
+    'RETRY_MS': 3000,  # reconnect delay suggested to EventSource
+}
+
+# Video changefeed (GET /api/v1/videos/changes/?cursor=)
+VIDEO_CHANGEFEED = {
+    'PAGE_SIZE': 500,  # changes per stream per response
+    'MAX_PAGE_SIZE': 2000,  # upper bound for ?limit=
+    'RETENTION_DAYS': 30,  # older cursors are told to resync
+}
+
+# Bulk moderation in the admin portal
+BULK_MODERATION = {
+    'CHUNK_SIZE': 1000,  # rows locked, updated and audited per transaction
+    'SYNC_LIMIT': 1000,  # larger selections run as a background job
+    'TASK_SECONDS': 60,  # a job task re-queues itself after this long
+}
+
+# Bulk user import (manage.py import_users and the admin portal)
+USER_IMPORT = {
+    'BATCH_SIZE': 1000,  # rows per bulk_create
+    'WORKERS': config('USER_IMPORT_WORKERS', default=0, cast=int),  # hashing processes (threads in Celery); 0 = CPU count
+    'DEFAULT_PLAN': 'Free',
+    'SUBSCRIPTION_DAYS': 30,
+    'MAX_ERRORS': 1000,  # row errors kept in the job report
+    'SPOOL_DIR': config('USER_IMPORT_SPOOL_DIR', default=str(BASE_DIR / 'spool' / 'imports')),  # shared with workers
+}
+
+# Playback event ingestion (POST /api/v1/playback/events/)
+PLAYBACK_EVENTS = {
+    'BUFFER': config('PLAYBACK_EVENTS_BUFFER', default='auto'),  # redis, memory, or auto (redis if the cache is)
+    'STREAM_KEY': 'playback:events',
+    'STREAM_MAX_LENGTH': 200000,  # posted batches kept in the stream before the oldest are trimmed
+    'MEMORY_MAX_BATCHES': 20000,  # per-process ring buffer when Redis isn't used
+    'FLUSH_BATCHES': 200,  # a memory buffer is written once this many batches wait...
+    'FLUSH_SECONDS': 10,  # ...or this long after the last write
+    'MAX_EVENTS_PER_REQUEST': 200,
+    'MAX_EVENT_AGE_SECONDS': 7 * 24 * 3600,  # older client timestamps are rejected (offline players)
+    'MAX_CLOCK_SKEW_SECONDS': 300,
+    'DRAIN_BATCH': 500,  # batches per COPY/bulk_create
+    'DRAIN_SECONDS': 50,  # a drain run stops after this long
+    'CLAIM_IDLE_SECONDS': 300,  # stream entries of a dead drainer are retried after this
+    'RETENTION_DAYS': 180,
+    'PARTITION_MONTHS_AHEAD': 2,  # PostgreSQL monthly partitions created in advance
+}
+
+# Resume positions: hot store updated by player heartbeats, saved write-behind
+WATCH_PROGRESS = {
+    'STORE': config('WATCH_PROGRESS_STORE', default='auto'),  # redis, cache, or auto (redis if the cache is)
+    'TTL_SECONDS': 30 * 24 * 3600,  # idle users' hashes expire; they're refilled from the table
+    'LOAD_LIMIT': 2000,  # most recent positions loaded when refilling a user's hash
+    'FLUSH_BATCH': 2000,  # positions per upsert
+    'FLUSH_SIZE': 500,  # without Redis, a process flushes once this many positions changed...
+    'FLUSH_SECONDS': 30,  # ...or this long after its last flush
+}
+
+# Playlists (GET /api/v1/playback/playlists/<id>/window/)
+PLAYLISTS = {
+    'MAX_ITEMS': 5000,
+    'WINDOW_BEFORE': 5,  # default items returned before the current one...
+    'WINDOW_AFTER': 20,  # ...and after it
+    'MAX_WINDOW': 100,
+    'CACHE_TIMEOUT': 24 * 3600,  # cached order, keyed by playlist version
+}
+
+# Storage deletion outbox worker
+STORAGE_DELETION = {
+    'BATCH_SIZE': 5000,  # rows claimed per run; S3 keys are deleted 1000 per request
+    'MAX_ATTEMPTS': 8,
+    'BACKOFF_SECONDS': 30,  # doubled after every failed attempt
+    'MAX_BACKOFF_SECONDS': 6 * 3600,
+    'LEASE_SECONDS': 600,  # claimed rows are retried after this if a worker dies
+    'RETENTION_DAYS': 30,  # completed rows are kept this long
+}
+
+# Storage tiering: move idle LOCAL videos to S3 (requires STORAGE_TYPE=s3)
+STORAGE_TIERING = {
+    'ENABLED': config('STORAGE_TIERING_ENABLED', default=False, cast=bool),
+    'COLD_AFTER_DAYS': 90,  # idle time before a video is moved to S3
+    'PRESSURE_COLD_AFTER_DAYS': 7,  # idle threshold while above the high-water mark
+    'HIGH_WATER_PERCENT': 85,  # disk usage that triggers pressure mode
+    'LOW_WATER_PERCENT': 70,  # pressure mode stops here; promotion only runs below it
+    'MAX_BYTES_PER_RUN': 20 * 1024 ** 3,
+    'MAX_VIDEOS_PER_RUN': 200,
+    'LOCAL_DELETE_DELAY_SECONDS': 3600,  # keep the local copy for players holding its URL
+    'PROMOTE_HOT': False,  # move frequently played tiered videos back to disk
+    'PROMOTE_MIN_ACCESSES': 50,
+    'PROMOTE_WINDOW_DAYS': 7,
+    'ACCESS_FLUSH_SIZE': 500,  # buffered access counts are written in one UPDATE
+    'ACCESS_FLUSH_SECONDS': 30,
+    'ACCESS_DEDUP_SECONDS': 300,  # repeat accesses by one viewer within this count once
+}
+
+# Orphaned video file garbage collection
+ORPHAN_GC = {
+    'DRY_RUN': config('ORPHAN_GC_DRY_RUN', default=True, cast=bool),  # report only until switched off
+    'MIN_AGE_HOURS': 24,  # never touch files younger than this (uploads in flight)
+    'BATCH_SIZE': 500,
+    'WORKERS': 4,
+    'SOFT_DELETED_RETENTION_DAYS': None,  # days after deleted_at before deleted videos are purged; None keeps them
+}
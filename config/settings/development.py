@@ -10,6 +10,9 @@ INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'django_ratelimit']
 # Debug mode
 DEBUG = True
 
+# Per-request timings in the browser's network panel
+PERFORMANCE_MONITORING = {**PERFORMANCE_MONITORING, 'SERVER_TIMING': True}
+
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', '*']
 
 # Use SQLite for testing (instead of PostgreSQL)
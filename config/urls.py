@@ -6,7 +6,8 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from apps.core.views import health_check
+from apps.accounts.forms import AdminLoginForm
+from apps.core.views import health_check, liveness_check, readiness_check, metrics_view, event_stream
 
 urlpatterns = [
     # Admin
@@ -14,6 +15,11 @@ urlpatterns = [
     
     # Health check
     path('health/', health_check, name='health_check'),
+    path('health/live/', liveness_check, name='liveness_check'),
+    path('health/ready/', readiness_check, name='readiness_check'),
+    
+    # Prometheus metrics (internal)
+    path('metrics', metrics_view, name='metrics'),
     
     # Web Authentication (Session-based)
     path('auth/web/', include('apps.accounts.urls.web_auth')),
@@ -28,6 +34,10 @@ urlpatterns = [
         path('plans/', include('apps.plans.urls')),
         path('videos/', include('apps.videos.urls')),
         path('subscriptions/', include('apps.subscriptions.urls')),
+        path('playback/', include('apps.playback.urls')),
+        
+        # Server-sent events (serve through config.asgi)
+        path('events/', event_stream, name='event-stream'),
     ])),
     
     # Dashboard (Web views)
@@ -51,3 +61,4 @@ handler500 = 'apps.core.views.custom_500'
 admin.site.site_header = 'Aura Link Administration'
 admin.site.site_title = 'Aura Link Admin'
 admin.site.index_title = 'Video Management System'
+admin.site.login_form = AdminLoginForm
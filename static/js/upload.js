@@ -21,6 +21,8 @@ document.addEventListener('DOMContentLoaded', () => {
             const xhr = new XMLHttpRequest();
             xhr.open('POST', '/api/v1/videos/upload/', true);
             xhr.setRequestHeader('X-CSRFToken', formData.get('csrfmiddlewaretoken'));
+            // Lets the server report this upload's progress while it arrives
+            xhr.setRequestHeader('X-Upload-ID', Date.now().toString(36) + Math.random().toString(36).slice(2, 10));
 
             // Upload progress
             xhr.upload.onprogress = function (e) {